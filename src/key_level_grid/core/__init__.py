@@ -14,6 +14,8 @@ from .models import (
     Timeframe,
     KeyLevelGridState,
     TimeframeTrend,
+    GatePositionView,
+    LevelView,
 )
 from .types import (
     LevelStatus,
@@ -40,6 +42,7 @@ from .state import (
     GridOrder,
     GridState,
     ActiveFill,
+    LevelArrays,
     STATE_VERSION,
 )
 # V3.0 新增
@@ -72,6 +75,8 @@ __all__ = [
     "Timeframe",
     "KeyLevelGridState",
     "TimeframeTrend",
+    "GatePositionView",
+    "LevelView",
     # Types
     "LevelStatus",
     "LevelLifecycleStatus",
@@ -95,6 +100,7 @@ __all__ = [
     "GridOrder",
     "GridState",
     "ActiveFill",
+    "LevelArrays",
     "STATE_VERSION",
     # V3.0 Scoring
     "LevelScore",
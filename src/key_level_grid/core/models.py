@@ -6,7 +6,7 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional
 
 
 class Timeframe(Enum):
@@ -271,6 +271,27 @@ class KeyLevelGridState:
             "volume_ratio": self.volume_ratio,
             "tunnel_direction": self.tunnel_direction,
         }
+    
+    def price_dict(self) -> dict:
+        """价格字段（展示用）"""
+        return {
+            "current": self.close,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+        }
+    
+    def indicators_dict(self) -> dict:
+        """技术指标字段（展示用）"""
+        return {
+            "macd": self.macd,
+            "macd_signal": self.macd_signal,
+            "macd_histogram": self.macd_histogram,
+            "rsi": self.rsi,
+            "atr": self.atr,
+            "adx": self.adx,
+            "volume_ratio": self.volume_ratio,
+        }
 
 
 @dataclass
@@ -297,3 +318,65 @@ class TimeframeTrend:
             "price_position": self.price_position,
             "confidence": self.confidence,
         }
+
+
+@dataclass
+class GatePositionView:
+    """
+    交易所持仓的类型化视图
+
+    由 ExchangeSyncManager 在同步持仓时一次性完成数值转换，
+    下游的止损/止盈/对账逻辑直接读取字段，无需重复 float(... or 0)
+    """
+    symbol: str = ""
+    contracts: float = 0.0        # 持仓数量（币）
+    raw_contracts: int = 0        # 持仓张数
+    notional: float = 0.0         # 持仓价值 (USDT)
+    entry_price: float = 0.0      # 持仓均价
+    mark_price: float = 0.0       # 标记价格
+    unrealized_pnl: float = 0.0   # 未实现盈亏
+    contract_size: float = 0.0    # 合约大小
+
+    @property
+    def is_open(self) -> bool:
+        """是否有持仓"""
+        return self.raw_contracts > 0
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "GatePositionView":
+        """从持仓字典构建（兼容字符串数值与 None）"""
+        if not data:
+            return cls()
+        return cls(
+            symbol=data.get("symbol", ""),
+            contracts=float(data.get("contracts") or 0),
+            raw_contracts=int(float(data.get("raw_contracts") or 0)),
+            notional=float(data.get("notional") or 0),
+            entry_price=float(data.get("entry_price") or 0),
+            mark_price=float(data.get("mark_price") or 0),
+            unrealized_pnl=float(data.get("unrealized_pnl") or 0),
+            contract_size=float(data.get("contract_size") or 0),
+        )
+
+
+class LevelView(NamedTuple):
+    """
+    展示用水位行（只读）
+
+    比 dict 更省内存、构建更快；提供 get() 以兼容按 dict 读取的展示/通知代码
+    """
+    price: float
+    type: str
+    strength: float = 0
+    timeframe: str = "4h"
+    source: str = ""
+    description: str = ""
+    fill_counter: int = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """按字段名读取（与 dict.get 语义一致）"""
+        return getattr(self, key, default) if key in self._fields else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return self._asdict()
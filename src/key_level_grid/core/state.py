@@ -9,7 +9,10 @@ V3.0 新增:
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, TYPE_CHECKING
+from operator import attrgetter
+from typing import Dict, List, NamedTuple, Optional, TYPE_CHECKING
+
+import numpy as np
 
 from key_level_grid.core.types import LevelStatus, LevelLifecycleStatus
 
@@ -23,7 +26,19 @@ if TYPE_CHECKING:
 STATE_VERSION = 3  # V3.0: 新增评分和重构日志字段
 
 
-@dataclass
+class LevelArrays(NamedTuple):
+    """水位字段的列式视图（与水位列表同序，第 i 个元素对应 levels[i]）"""
+    levels: List["GridLevelState"]
+    prices: np.ndarray
+    fill_counters: np.ndarray
+    target_qtys: np.ndarray
+
+    def level(self, i: int) -> "GridLevelState":
+        """返回第 i 个水位对象"""
+        return self.levels[i]
+
+
+@dataclass(slots=True)
 class GridLevelState:
     """
     网格水位状态 (LEVEL_GENERATION.md v3.1.0)
@@ -164,7 +179,7 @@ class GridLevelState:
                 self.qty_multiplier = 0.0  # 不开仓
 
 
-@dataclass
+@dataclass(slots=True)
 class GridOrder:
     """网格订单"""
     grid_id: int                      # 网格编号
@@ -314,6 +329,68 @@ class GridState:
     last_rebuild_ts: int = 0           # 上次重构时间戳 (秒)
     last_score_refresh_ts: int = 0     # 上次评分刷新时间戳 (秒)
     
+    # 卖单按价格升序的只读视图（不持久化，sell_orders 或 is_filled 变更后需调用 refresh_sell_order_index）
+    # 价格与成交标记以数组形式并列存放，供止盈规划向量化筛选
+    sell_orders_sorted: List[GridOrder] = field(default_factory=list, init=False, repr=False, compare=False)
+    sell_prices_sorted: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    sell_filled_sorted: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.refresh_sell_order_index()
+    
+    def refresh_sell_order_index(self) -> None:
+        """重建卖单价格升序视图及其价格/成交标记数组"""
+        self.sell_orders_sorted = sorted(self.sell_orders, key=attrgetter("price"))
+        n = len(self.sell_orders_sorted)
+        self.sell_prices_sorted = np.fromiter(
+            (o.price for o in self.sell_orders_sorted), dtype=np.float64, count=n
+        )
+        self.sell_filled_sorted = np.fromiter(
+            (o.is_filled for o in self.sell_orders_sorted), dtype=np.bool_, count=n
+        )
+    
+    def level_arrays(self, side: Optional[str] = None) -> LevelArrays:
+        """
+        将水位状态转为列式数组（不持久化，每次调用按当前状态重建）
+
+        Args:
+            side: "support" / "resistance"，None 表示支撑在前、阻力在后合并
+        """
+        if side == "support":
+            levels = list(self.support_levels_state)
+        elif side == "resistance":
+            levels = list(self.resistance_levels_state)
+        else:
+            levels = list(self.support_levels_state) + list(self.resistance_levels_state)
+        n = len(levels)
+        return LevelArrays(
+            levels,
+            np.fromiter((lvl.price for lvl in levels), dtype=np.float64, count=n),
+            np.fromiter((lvl.fill_counter for lvl in levels), dtype=np.int64, count=n),
+            np.fromiter((lvl.target_qty for lvl in levels), dtype=np.float64, count=n),
+        )
+    
+    def support_floor(self) -> float:
+        """展示用网格底线：support_levels 中最低正价格 × 0.995，无有效支撑时为 0"""
+        levels = self.support_levels
+        if not levels:
+            return 0
+        # 列表内水位形式一致，按首个元素一次性选择取价方式
+        if isinstance(levels[0], dict):
+            it = (lvl.get("price", 0) for lvl in levels)
+        else:
+            it = (lvl.price for lvl in levels)
+        prices = np.fromiter(it, dtype=np.float64, count=len(levels))
+        prices = prices[prices > 0]
+        if prices.size == 0:
+            return 0
+        return float(prices.min()) * 0.995
+    
+    def valid_sell_indices(self, min_price: float) -> np.ndarray:
+        """返回价格高于 min_price 且未成交的卖单下标（对应 sell_orders_sorted，价格升序）"""
+        mask = ~self.sell_filled_sorted & (self.sell_prices_sorted > min_price)
+        return np.flatnonzero(mask)
+    
     @property
     def position_usdt(self) -> float:
         """兼容: 返回 total_position_usdt"""
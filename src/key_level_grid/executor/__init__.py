@@ -11,6 +11,7 @@ from key_level_grid.executor.base import (
     ExecutorBase,
 )
 from key_level_grid.executor.gate_executor import GateExecutor
+from key_level_grid.executor.order_pool import OrderPool
 from key_level_grid.utils.config import SafetyConfig
 
 __all__ = [
@@ -21,5 +22,6 @@ __all__ = [
     "PricingMode",
     "ExecutorBase",
     "GateExecutor",
+    "OrderPool",
     "SafetyConfig",
 ]
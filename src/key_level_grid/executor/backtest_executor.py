@@ -52,7 +52,7 @@ class BacktestExecutor:
     async def submit_order(self, order: Order) -> bool:
         qty = float(order.quantity or 0)
         price = float(order.price or 0)
-        is_trigger = order.metadata.get("order_mode") == "trigger"
+        is_trigger = (order.order_mode or order.metadata.get("order_mode")) == "trigger"
         trigger_price = float(order.metadata.get("triggerPrice", 0) or 0)
         if qty <= 0 or (price <= 0 and not is_trigger):
             order.status = OrderStatus.REJECTED
@@ -94,8 +94,20 @@ class BacktestExecutor:
         )
         return True
 
+    async def submit_orders_batch(self, orders: List[Order], max_concurrency: int = 8) -> List[bool]:
+        return [await self.submit_order(o) for o in orders]
+
     async def cancel_order(self, order: Order) -> bool:
         order_id = getattr(order, "exchange_order_id", "") or ""
+        return await self.cancel_order_by_id(order_id, order.symbol)
+
+    async def cancel_order_by_id(
+        self,
+        exchange_order_id: str,
+        symbol: str,
+        metadata: Optional[Dict] = None,
+    ) -> bool:
+        order_id = exchange_order_id or ""
         if not order_id:
             return False
         for idx, o in enumerate(self._open_orders):
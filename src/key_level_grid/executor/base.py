@@ -4,13 +4,18 @@
 定义交易所接口和订单数据结构。
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from uuid import uuid4
 
+from key_level_grid.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 
 class OrderSide(Enum):
     """订单方向"""
@@ -42,7 +47,7 @@ class PricingMode(Enum):
     USDT = "usdt"          # 按USDT金额
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """
     订单对象
@@ -75,6 +80,9 @@ class Order:
     # 外部ID（交易所返回）
     exchange_order_id: Optional[str] = None
     
+    # 自定义订单ID（Gate text），首次构建下单请求时生成，重试沿用同一值
+    client_order_id: Optional[str] = None
+    
     # 拒绝/失败原因
     reject_reason: Optional[str] = None
     
@@ -108,7 +116,18 @@ class Order:
     # === reduceOnly保护（仅减仓） ===
     reduce_only: bool = False  # 是否仅减仓（平仓订单应设置为True）
     
-    # 元数据
+    # 提交失败是否可重试
+    is_retryable: bool = True
+    
+    # === 网格挂单属性（原 metadata 常用键）===
+    order_mode: Optional[str] = None          # 下单模式: limit / market / ioc_limit / trigger
+    grid_id: Optional[int] = None             # 网格编号
+    source: str = ""                          # 水位来源
+    is_take_profit: bool = False              # 是否止盈单
+    target_contracts: Optional[float] = None  # 目标张数
+    contract_size: Optional[float] = None     # 合约大小
+    
+    # 元数据（交易所特定扩展参数）
     metadata: Dict = field(default_factory=dict)
     
     def __post_init__(self):
@@ -137,6 +156,31 @@ class Order:
             **kwargs
         )
     
+    def reset(
+        self,
+        symbol: str,
+        side: OrderSide,
+        quantity: float,
+        order_type: OrderType = OrderType.LIMIT,
+        price: Optional[float] = None,
+        **kwargs
+    ) -> "Order":
+        """原地重置为新订单（供 OrderPool 复用实例，复用 metadata 字典）"""
+        for f in _ORDER_DEFAULT_FIELDS:
+            setattr(self, f.name, f.default)
+        self.metadata.clear()
+        self.order_id = str(uuid4())
+        self.symbol = symbol
+        self.side = side
+        self.order_type = order_type
+        self.quantity = quantity
+        self.price = price
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+        self.created_at = 0
+        self.__post_init__()
+        return self
+    
     @property
     def is_filled(self) -> bool:
         """是否完全成交"""
@@ -188,6 +232,10 @@ class Order:
         }
 
 
+# 带普通默认值的字段（reset 时逐一恢复）
+_ORDER_DEFAULT_FIELDS = tuple(f for f in fields(Order) if f.default is not MISSING)
+
+
 class ExecutorBase(ABC):
     """
     交易所执行器基类
@@ -221,6 +269,75 @@ class ExecutorBase(ABC):
         """
         pass
     
+    async def submit_orders_batch(
+        self,
+        orders: List[Order],
+        max_concurrency: int = 8,
+    ) -> List[bool]:
+        """
+        批量提交订单
+        
+        默认实现逐单并发提交（信号量限制同时在途的请求数，避免触发限频），
+        支持批量接口的子类可覆盖。
+        
+        Args:
+            orders: 订单列表
+            max_concurrency: 最大并发提交数
+            
+        Returns:
+            与 orders 一一对应的提交结果
+        """
+        sem = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def _submit(order: Order) -> bool:
+            async with sem:
+                return await self.submit_order(order)
+        
+        results = await asyncio.gather(
+            *(_submit(o) for o in orders),
+            return_exceptions=True,
+        )
+        for order, result in zip(orders, results):
+            if isinstance(result, BaseException):
+                order.reject_reason = str(result)[:200]
+                logger.error(
+                    f"❌ 订单提交异常 {order.side.value} {order.quantity} @ {order.price}: {order.reject_reason}",
+                    exc_info=result,
+                )
+        return [r is True for r in results]
+    
+    async def cancel_order_by_id(
+        self,
+        exchange_order_id: str,
+        symbol: str,
+        metadata: Optional[Dict] = None,
+    ) -> bool:
+        """
+        按交易所订单 ID 取消订单
+        
+        默认实现构造一个占位 Order 并委托给 cancel_order，
+        子类可覆盖以跳过完整的 Order 构造。
+        
+        Args:
+            exchange_order_id: 交易所订单 ID
+            symbol: 交易对
+            metadata: 附加信息 (如 side/price/reason，用于通知)
+            
+        Returns:
+            True 如果取消成功
+        """
+        metadata = metadata or {}
+        order = Order.create(
+            symbol=symbol,
+            side=OrderSide.SELL if metadata.get("side") == "sell" else OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            quantity=0.0,
+            price=0.0,
+        )
+        order.exchange_order_id = exchange_order_id
+        order.metadata.update(metadata)
+        return await self.cancel_order(order)
+    
     @abstractmethod
     async def get_order_status(self, order: Order) -> OrderStatus:
         """
@@ -6,10 +6,17 @@ Gate.io 订单执行器
 
 import asyncio
 import time
-from typing import Dict, Optional
+from itertools import chain, islice
+from typing import Dict, List, Optional
 
 from key_level_grid.executor.base import ExecutorBase, Order, OrderStatus, OrderType
 from key_level_grid.executor.exchange_executor import ExchangeExecutor
+from key_level_grid.executor.gate_ws_order_client import (
+    GateWsNotSentError,
+    GateWsOrderClient,
+    GateWsOrderError,
+    GateWsOrderUnknownError,
+)
 from key_level_grid.utils.config import SafetyConfig
 from key_level_grid.executor.usdt_pricing import compute_usdt_quantity
 
@@ -21,6 +28,9 @@ class GateExecutor(ExchangeExecutor):
     支持真实交易和纸交易模式。
     """
     
+    # Gate batch_orders 单次请求的订单上限
+    BATCH_ORDER_LIMIT = 10
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -30,6 +40,7 @@ class GateExecutor(ExchangeExecutor):
         max_retries: int = 3,
         retry_delay_ms: int = 100,
         ioc_timeout_sec: float = 2.0,
+        use_ws_orders: bool = False,
     ):
         """
         初始化 Gate 执行器
@@ -42,6 +53,7 @@ class GateExecutor(ExchangeExecutor):
             max_retries: 最大重试次数
             retry_delay_ms: 重试延迟（毫秒）
             ioc_timeout_sec: IOC 订单超时时间（秒）
+            use_ws_orders: 实盘限价单优先走 WebSocket 下单通道（默认关闭；仅在订单确定未送达时回退 REST）
         """
         super().__init__(
             api_key=api_key,
@@ -57,9 +69,12 @@ class GateExecutor(ExchangeExecutor):
 
         # === Phase 5.1: 真实交易所连接（T072）===
         self._exchange = None           # ccxt 交易所实例
+        self._ws_orders: Optional[GateWsOrderClient] = None  # WebSocket 下单通道
         
         if not paper_trading:
             self._init_live_exchange()
+            if use_ws_orders and api_key and api_secret:
+                self._ws_orders = GateWsOrderClient(api_key, api_secret)
     
     async def _pre_trade_safety_check(self, order: Order) -> tuple[bool, str]:
         """
@@ -380,7 +395,7 @@ class GateExecutor(ExchangeExecutor):
         
         try:
             import ccxt
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             
             # 调用 ccxt 的 fetch_ohlcv
             # 注意: Gate.io 的 timeframe 格式通常是标准的 (1m, 1h, 1d)
@@ -470,9 +485,11 @@ class GateExecutor(ExchangeExecutor):
                 else:
                     # ✅ 检查是否为不可重试错误（余额不足、参数错误等）
                     reject_reason = getattr(order, 'reject_reason', '') or ''
-                    is_non_retryable = any(keyword in reject_reason.lower() for keyword in [
-                        'insufficient', 'balance', 'margin', 'invalid', 'permission', 'whitelist'
-                    ])
+                    is_non_retryable = not order.is_retryable or any(
+                        keyword in reject_reason.lower() for keyword in [
+                            'insufficient', 'balance', 'margin', 'invalid', 'permission', 'whitelist'
+                        ]
+                    )
                     
                     if is_non_retryable:
                         # 不可重试错误，直接返回
@@ -580,6 +597,27 @@ class GateExecutor(ExchangeExecutor):
         except Exception as e:
             self.logger.error(f"发送挂单同步提醒失败: {e}")
     
+    async def _notify_cancel_sync(self, symbol: str, metadata: Dict) -> None:
+        """撤单同步提醒（按 ID 撤单路径，无 Order 对象）"""
+        notifier = getattr(self, "_notifier", None)
+        if not notifier:
+            return
+        try:
+            side = metadata.get("side", "buy")
+            order_type = metadata.get("order_type")
+            if not order_type:
+                order_type = "支撑位买单" if side == "buy" else "阻力位卖单"
+            await notifier.notify_order_sync(
+                symbol=symbol,
+                order_type=order_type,
+                status="撤销",
+                price=float(metadata.get("price", 0) or 0),
+                new_qty=float(metadata.get("qty_btc", 0) or 0),
+                reason=metadata.get("reason", "executor"),
+            )
+        except Exception as e:
+            self.logger.error(f"发送挂单同步提醒失败: {e}")
+    
     async def _prepare_order_params(
         self,
         order: Order,
@@ -614,8 +652,8 @@ class GateExecutor(ExchangeExecutor):
         if order.order_type == OrderType.LIMIT and order.price:
             return 'limit', order.price, params
         
-        # 2. 从订单元数据或全局配置获取订单模式
-        order_mode = order.metadata.get('order_mode', 'ioc_limit')  # 默认IOC限价单
+        # 2. 从订单属性或元数据获取订单模式
+        order_mode = order.order_mode or order.metadata.get('order_mode', 'ioc_limit')  # 默认IOC限价单
         
         # 3. 根据订单模式准备参数
         if order_mode == 'market':
@@ -749,7 +787,7 @@ class GateExecutor(ExchangeExecutor):
 
         for retry in range(max_retries):
             try:
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 ticker = await loop.run_in_executor(
                     None,
                     lambda: self._exchange.fetch_ticker(symbol)
@@ -864,7 +902,7 @@ class GateExecutor(ExchangeExecutor):
         if contract_size is None or contract_size <= 0:
             contract_size = 1.0
             
-        order.metadata['contract_size'] = contract_size
+        order.contract_size = contract_size
         
         # 调用通用工具计算数量
         quantity, raw_qty = compute_usdt_quantity(
@@ -901,6 +939,279 @@ class GateExecutor(ExchangeExecutor):
         )
         return quantity
 
+    async def _build_real_order_request(self, order: Order) -> tuple:
+        """
+        构建真实下单请求参数
+        
+        Args:
+            order: 订单对象
+            
+        Returns:
+            (order_type, amount, price, params)
+        """
+        symbol = order.symbol
+        side = order.side.value
+        
+        # === Phase 6.1: USDT计价支持 ===
+        if order.pricing_mode == 'usdt' and order.target_value_usd:
+            amount = await self._apply_usdt_pricing(order, side)
+        else:
+            amount = order.quantity
+        
+        # ✅ 改进：支持可配置的订单类型和价格策略
+        order_type, price, params = await self._prepare_order_params(
+            order, symbol, side, amount
+        )
+        
+        # ✅ 添加 clientOrderId 防止重试导致重复下单
+        # CCXT Gate 实现会将 clientOrderId 映射到 text 字段 (gate v4)
+        # Gate 限制 clientOrderId/text 长度为 28 字符
+        # 同一订单只生成一次并保存在订单上，重试时沿用，避免生成新 text 导致重复下单
+        if not order.client_order_id and order.order_id:
+            cid = order.order_id
+            if len(cid) > 28:
+                # 如果太长，截取前 28 位，或者使用更短的格式
+                # uuid4 是 36 位，所以必须截取或重新生成
+                cid = f"t-{int(time.time())}-{cid[:8]}"
+                if len(cid) > 28:
+                    cid = cid[:28]
+            order.client_order_id = cid
+        if order.client_order_id:
+            params['clientOrderId'] = order.client_order_id
+        
+        # === reduceOnly保护：仅减仓模式 ===
+        # 防止平仓订单意外变成开仓订单
+        if order.reduce_only:
+            params['reduceOnly'] = True
+            self.logger.info(
+                f"🛡️ 启用仅减仓保护: {symbol}",
+                extra={'reduce_only': True}
+            )
+        
+        return order_type, amount, price, params
+    
+    async def submit_orders_batch(
+        self,
+        orders: List[Order],
+        max_concurrency: int = 8,
+    ) -> List[bool]:
+        """
+        批量提交订单（Gate batch_orders 接口）
+        
+        纸交易或交易所不支持批量下单时退化为逐单并发提交；
+        仅普通限价单走批量接口，其余订单（触发单、reduceOnly 止盈单等）仍逐单提交，
+        以保留逐单路径的 reduceOnly 回退。
+        
+        批量请求整体失败时，仅在交易所明确拒绝（请求已被处理但未下单）时回退逐单；
+        被限频（429）时本批及剩余批次直接记为失败，由下个周期补挂；
+        超时/断线等结果未知的情况按 clientOrderId 查询确认，绝不重复下单。
+        
+        Args:
+            orders: 订单列表
+            max_concurrency: 逐单提交时的最大并发数
+            
+        Returns:
+            与 orders 一一对应的提交结果
+        """
+        if (
+            self.paper_trading
+            or not self._exchange
+            or not self._exchange.has.get("createOrders")
+        ):
+            return await super().submit_orders_batch(orders, max_concurrency)
+        
+        import ccxt
+        
+        results: List[bool] = [False] * len(orders)
+        batch: List[tuple] = []  # [(下标, 订单, 请求)]
+        singles: List[int] = []
+        # 本批已放行的订单数：安全检查只看到已提交的 daily_trades，需计入尚未提交的
+        accepted = 0
+        
+        for idx, order in enumerate(orders):
+            order.is_paper_trade = False
+            passed, reason = await self._pre_trade_safety_check(order)
+            if passed and self.daily_trades + accepted >= self.safety.max_daily_trades:
+                passed = False
+                reason = (
+                    f"每日交易次数上限 {self.daily_trades + accepted}/{self.safety.max_daily_trades}"
+                )
+            if not passed:
+                self.logger.error(f"❌ 订单未通过安全检查，已拒绝: {reason}")
+                order.status = OrderStatus.REJECTED
+                order.reject_reason = f"安全检查失败: {reason}"
+                continue
+            if order.reduce_only:
+                singles.append(idx)
+                accepted += 1
+                continue
+            try:
+                order_type, amount, price, params = await self._build_real_order_request(order)
+            except Exception as e:
+                order.reject_reason = str(e)[:200]
+                self.logger.error(f"❌ 构建订单参数失败: {order.reject_reason}")
+                continue
+            accepted += 1
+            if order_type != "limit":
+                singles.append(idx)
+                continue
+            batch.append((idx, order, {
+                "symbol": order.symbol,
+                "type": order_type,
+                "side": order.side.value,
+                "amount": amount,
+                "price": price,
+                "params": params,
+            }))
+        
+        loop = asyncio.get_running_loop()
+        it = iter(batch)
+        while True:
+            chunk = list(islice(it, self.BATCH_ORDER_LIMIT))
+            if not chunk:
+                break
+            requests = [req for _, _, req in chunk]
+            try:
+                responses = await loop.run_in_executor(
+                    None, lambda: self._exchange.create_orders(requests)
+                )
+            except ccxt.DDoSProtection as e:
+                # 已被限频：不再展开为逐单请求加重限频，本批及剩余批次记为失败，由下个周期补挂
+                self.logger.warning(f"⚠️ 批量下单被限频，剩余批次留待下个周期: {str(e)[:200]}")
+                for _, order, _ in chain(chunk, it):
+                    order.status = OrderStatus.FAILED
+                    order.reject_reason = f"rate limited: {str(e)[:180]}"
+                    self._stats["orders_failed"] += 1
+                break
+            except ccxt.ExchangeError as e:
+                # 交易所已处理并拒绝整个请求（未下任何单）→ 该批次回退为逐单提交
+                self.logger.warning(f"⚠️ 批量下单被拒，回退逐单提交: {str(e)[:200]}")
+                singles.extend(idx for idx, _, _ in chunk)
+                continue
+            except Exception as e:
+                # 超时/断线：请求可能已被受理，按 clientOrderId 逐个确认，不重复下单
+                self.logger.warning(f"⚠️ 批量下单结果未知，按 clientOrderId 确认: {str(e)[:200]}")
+                responses = []
+                for _, order, req in chunk:
+                    text = self._gate_order_text(req["params"])
+                    try:
+                        response = await self._fetch_order_by_text(order.symbol, text) if text else None
+                    except Exception as lookup_error:
+                        self.logger.error(f"❌ 查询订单 {text} 失败: {str(lookup_error)[:200]}")
+                        response = None
+                    responses.append(response or {"info": {"message": f"批量下单结果未知: {str(e)[:100]}"}})
+            
+            for (idx, order, _), response in zip(chunk, responses or []):
+                if response and response.get("id"):
+                    order.exchange_order_id = response.get("id")
+                    order.exchange_response = response
+                    order.status = OrderStatus.SUBMITTED
+                    order.submitted_at = int(time.time() * 1000)
+                    self._stats["orders_submitted"] += 1
+                    self.daily_trades += 1
+                    await self._notify_order_sync(order, "新增")
+                    results[idx] = True
+                else:
+                    info = (response or {}).get("info") or {}
+                    order.status = OrderStatus.FAILED
+                    order.reject_reason = str(info.get("label") or info.get("message") or "batch order rejected")[:200]
+                    self._stats["orders_failed"] += 1
+                    self.logger.error(f"❌ 批量订单失败: {order.reject_reason}")
+        
+        if singles:
+            single_results = await super().submit_orders_batch(
+                [orders[idx] for idx in singles], max_concurrency
+            )
+            for idx, ok in zip(singles, single_results):
+                results[idx] = ok
+        
+        return results
+    
+    async def close(self) -> None:
+        """释放常驻连接（WebSocket 下单通道）"""
+        if self._ws_orders is not None:
+            await self._ws_orders.close()
+    
+    async def _submit_ws_order(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: float,
+        params: dict,
+    ) -> Optional[dict]:
+        """
+        通过 WebSocket 通道提交限价单
+        
+        Returns:
+            ccxt 风格的订单响应；订单确定未被交易所受理（连接/登录/发送失败或被拒）时
+            返回 None，由调用方回退 REST
+        
+        Raises:
+            GateWsOrderUnknownError: 请求已发出但结果未知（超时/断线）且按 text 查不到订单，
+                绝不回退 REST 重下
+        """
+        text = self._gate_order_text(params)
+        size = int(amount)
+        try:
+            result = await self._ws_orders.place_order(
+                contract=self._exchange.market(symbol)["id"],
+                size=size if side == "buy" else -size,
+                price=self._exchange.price_to_precision(symbol, price),
+                text=text,
+                reduce_only=bool(params.get("reduceOnly") or params.get("reduce_only")),
+            )
+        except (GateWsNotSentError, GateWsOrderError) as e:
+            self.logger.warning("⚠️ WS 下单未被受理，回退 REST: %s", str(e)[:200])
+            return None
+        except Exception as e:
+            self.logger.warning("⚠️ WS 下单结果未知，按 text 查询确认: %s", str(e)[:200])
+            return await self._fetch_unconfirmed_ws_order(symbol, text, e)
+        
+        total = abs(int(result.get("size", size) or 0))
+        left = abs(int(result.get("left", total) or 0))
+        return {
+            "id": str(result.get("id", "")),
+            "status": "open" if result.get("status") == "open" else "closed",
+            "filled": total - left,
+            "average": float(result.get("fill_price", 0) or 0) or None,
+            "info": result,
+        }
+    
+    @staticmethod
+    def _gate_order_text(params: dict) -> Optional[str]:
+        """订单自定义 ID（Gate text 字段）：与 ccxt 一致，须以 "t-" 开头"""
+        text = params.get("clientOrderId")
+        if text and text[0] != "t":
+            text = f"t-{text}"
+        return text
+    
+    async def _fetch_order_by_text(self, symbol: str, text: str) -> Optional[dict]:
+        """按自定义 ID 查询订单，交易所无此订单时返回 None"""
+        import ccxt
+        
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                None, lambda: self._exchange.fetch_order(text, symbol)
+            )
+        except ccxt.OrderNotFound:
+            return None
+    
+    async def _fetch_unconfirmed_ws_order(
+        self,
+        symbol: str,
+        text: Optional[str],
+        error: Exception,
+    ) -> dict:
+        """WS 请求已发出但未收到结果：按自定义 ID 向交易所查询订单是否已挂上"""
+        if not text:
+            raise GateWsOrderUnknownError(f"WS 下单结果未知且无 clientOrderId 可查询: {error}") from error
+        response = await self._fetch_order_by_text(symbol, text)
+        if response is None:
+            raise GateWsOrderUnknownError(f"WS 下单结果未知，交易所未查到订单 {text}: {error}") from error
+        return response
+    
     async def _submit_real_order(self, order: Order) -> bool:
         """
         提交真实订单到 Gate.io（T074）
@@ -917,39 +1228,7 @@ class GateExecutor(ExchangeExecutor):
             # 构建订单参数
             symbol = order.symbol
             side = order.side.value
-            
-            # === Phase 6.1: USDT计价支持 ===
-            if order.pricing_mode == 'usdt' and order.target_value_usd:
-                amount = await self._apply_usdt_pricing(order, side)
-            else:
-                amount = order.quantity
-            
-            # ✅ 改进：支持可配置的订单类型和价格策略
-            order_type, price, params = await self._prepare_order_params(
-                order, symbol, side, amount
-            )
-            
-            # ✅ 添加 clientOrderId 防止重试导致重复下单
-            # CCXT Gate 实现会将 clientOrderId 映射到 text 字段 (gate v4)
-            # Gate 限制 clientOrderId/text 长度为 28 字符
-            if order.order_id:
-                cid = order.order_id
-                if len(cid) > 28:
-                    # 如果太长，截取前 28 位，或者使用更短的格式
-                    # uuid4 是 36 位，所以必须截取或重新生成
-                    cid = f"t-{int(time.time())}-{cid[:8]}"
-                    if len(cid) > 28:
-                        cid = cid[:28]
-                params['clientOrderId'] = cid
-            
-            # === reduceOnly保护：仅减仓模式 ===
-            # 防止平仓订单意外变成开仓订单
-            if order.reduce_only:
-                params['reduceOnly'] = True
-                self.logger.info(
-                    f"🛡️ 启用仅减仓保护: {symbol}",
-                    extra={'reduce_only': True}
-                )
+            order_type, amount, price, params = await self._build_real_order_request(order)
             
             self.logger.info(
                 f"🔴 提交真实订单到 Gate.io: {symbol} {side} {amount} @ {price}",
@@ -963,107 +1242,109 @@ class GateExecutor(ExchangeExecutor):
                     'reduce_only': order.reduce_only # DEBUG
                 }
             )
-            print(f"🔴 [Executor] Submit Order: {side} {amount} @ {price}, reduce_only={order.reduce_only}")
             
             # 调用 ccxt 下单（同步方法，在 asyncio 中运行）
             # 添加重试逻辑处理网络错误
             import asyncio
             import ccxt
             
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             max_retries = 3
             retry_delay = 2  # 秒
             
             response = None
             last_error = None
             
-            # 如果使用了 reduce_only，使用带有 fallback 的提交逻辑
-            if order.reduce_only and order_type != 'trigger':
-                 print(f"⚠️ [Executor] 使用 Reduce-Only Fallback 逻辑")
-                 response = await self._submit_order_with_reduce_only_fallback(
-                    loop, symbol, order_type, side, amount, price, params
-                 )
-            elif order_type == 'trigger':
-                 # ✅ 处理 Gate Futures 触发订单 (Plan Order / Stop Loss)
-                 # 使用专门的 private_futures_post_settle_price_orders
-                 print(f"⚠️ [Executor] 提交 Trigger Order (Stop Loss/Take Profit)")
-                 
-                 # 构造 Trigger Order Payload
-                 # Initial: 触发后实际下的单
-                 initial_order = {
-                     'contract': symbol.replace('/', '_').replace(':USDT', ''),
-                     'size': int(amount) if side == 'buy' else int(-amount), # Gate API: 正买负卖
-                     'price': str(price) if price else "0", # 0 for market
-                     'tif': 'ioc' if (price is None or price == 0) else 'gtc',
-                     'reduce_only': True if order.reduce_only else False
-                 }
-                 if params.get('reduceOnly') or params.get('reduce_only'):
-                     initial_order['reduce_only'] = True
-                 
-                 # Trigger: 触发条件
-                 raw_trigger_price = float(params.get('triggerPrice', 0))
-                 # ✅ 修正: 必须使用 price_to_precision 格式化价格，否则报错 invalid argument
-                 formatted_trigger_price = self._exchange.price_to_precision(symbol, raw_trigger_price)
-                 
-                 trigger_cond = {
-                     'strategy_type': 0, # 0: price trigger
-                     'price_type': 1,    # 1: mark price (usually safer for SL)
-                     'price': formatted_trigger_price,
-                     'rule': int(params.get('rule', 1)), # 1: >=, 2: <=
-                     'expiration': 2592000 # ✅ 修正: 使用 30 天有效期 (86400 * 30)，必须是 86400 的整数倍
-                 }
-                 
-                 trigger_params = {
-                     'settle': 'usdt',
-                     'initial': initial_order,
-                     'trigger': trigger_cond
-                 }
-                 
-                 self.logger.info(f"Trigger Params: {trigger_params}")
-                 
-                 method_name = 'private_futures_post_settle_price_orders'
-                 if hasattr(self._exchange, method_name):
-                     func = getattr(self._exchange, method_name)
-                     response = await loop.run_in_executor(None, lambda: func(trigger_params))
-                 else:
-                     raise ValueError(f"CCXT method {method_name} not found")
+            # 启用 WebSocket 下单通道时普通限价单优先走 WS，仅订单确定未送达时回退 REST
+            if self._ws_orders is not None and order_type == 'limit' and price:
+                response = await self._submit_ws_order(symbol, side, amount, price, params)
+            
+            if response is None:
+                # 如果使用了 reduce_only，使用带有 fallback 的提交逻辑
+                if order.reduce_only and order_type != 'trigger':
+                    response = await self._submit_order_with_reduce_only_fallback(
+                        loop, symbol, order_type, side, amount, price, params
+                    )
+                elif order_type == 'trigger':
+                    # ✅ 处理 Gate Futures 触发订单 (Plan Order / Stop Loss)
+                    # 使用专门的 private_futures_post_settle_price_orders
 
-            else:
-                 # 普通提交
-                 for attempt in range(max_retries):
-                    try:
-                        # 使用 loop.run_in_executor 调用同步的 create_order
-                        response = await loop.run_in_executor(
-                            None,
-                            lambda: self._exchange.create_order(
-                                symbol, order_type, side, amount, price, params
-                            )
-                        )
-                        break  # 成功则退出重试循环
-                        
-                    except (ccxt.NetworkError, ccxt.RequestTimeout) as e:
-                        last_error = e
-                        error_msg = str(e)
-                        if attempt < max_retries - 1:
-                            self.logger.warning(
-                                f"⚠️ 网络错误（尝试 {attempt + 1}/{max_retries}）: {error_msg[:100]}，{retry_delay}秒后重试...",
-                                extra={
-                                    "attempt": attempt + 1,
-                                    "max_retries": max_retries,
-                                    "error": error_msg[:100]
-                                }
+                    # 构造 Trigger Order Payload
+                    # Initial: 触发后实际下的单
+                    initial_order = {
+                        'contract': symbol.replace('/', '_').replace(':USDT', ''),
+                        'size': int(amount) if side == 'buy' else int(-amount), # Gate API: 正买负卖
+                        'price': str(price) if price else "0", # 0 for market
+                        'tif': 'ioc' if (price is None or price == 0) else 'gtc',
+                        'reduce_only': True if order.reduce_only else False
+                    }
+                    if params.get('reduceOnly') or params.get('reduce_only'):
+                        initial_order['reduce_only'] = True
+
+                    # Trigger: 触发条件
+                    raw_trigger_price = float(params.get('triggerPrice', 0))
+                    # ✅ 修正: 必须使用 price_to_precision 格式化价格，否则报错 invalid argument
+                    formatted_trigger_price = self._exchange.price_to_precision(symbol, raw_trigger_price)
+
+                    trigger_cond = {
+                        'strategy_type': 0, # 0: price trigger
+                        'price_type': 1,    # 1: mark price (usually safer for SL)
+                        'price': formatted_trigger_price,
+                        'rule': int(params.get('rule', 1)), # 1: >=, 2: <=
+                        'expiration': 2592000 # ✅ 修正: 使用 30 天有效期 (86400 * 30)，必须是 86400 的整数倍
+                    }
+
+                    trigger_params = {
+                        'settle': 'usdt',
+                        'initial': initial_order,
+                        'trigger': trigger_cond
+                    }
+
+                    self.logger.info(f"Trigger Params: {trigger_params}")
+
+                    method_name = 'private_futures_post_settle_price_orders'
+                    if hasattr(self._exchange, method_name):
+                        func = getattr(self._exchange, method_name)
+                        response = await loop.run_in_executor(None, lambda: func(trigger_params))
+                    else:
+                        raise ValueError(f"CCXT method {method_name} not found")
+
+                else:
+                    # 普通提交
+                    for attempt in range(max_retries):
+                        try:
+                            # 使用 loop.run_in_executor 调用同步的 create_order
+                            response = await loop.run_in_executor(
+                                None,
+                                lambda: self._exchange.create_order(
+                                    symbol, order_type, side, amount, price, params
+                                )
                             )
-                            await asyncio.sleep(retry_delay)
-                            retry_delay *= 2  # 指数退避
-                        else:
-                            # 最后一次尝试失败 - 显示详细错误
-                            detailed_error = f"网络错误: {error_msg[:200]}"
-                            self.logger.error(f"❌ 订单提交失败（已重试{max_retries}次）: {detailed_error}")
-                            raise ccxt.NetworkError(f"Max retries exceeded - {detailed_error}")
-                    
-                    except Exception as e:
-                        # 其他类型的错误直接抛出，不重试
-                        raise
+                            break  # 成功则退出重试循环
+
+                        except (ccxt.NetworkError, ccxt.RequestTimeout) as e:
+                            last_error = e
+                            error_msg = str(e)
+                            if attempt < max_retries - 1:
+                                self.logger.warning(
+                                    f"⚠️ 网络错误（尝试 {attempt + 1}/{max_retries}）: {error_msg[:100]}，{retry_delay}秒后重试...",
+                                    extra={
+                                        "attempt": attempt + 1,
+                                        "max_retries": max_retries,
+                                        "error": error_msg[:100]
+                                    }
+                                )
+                                await asyncio.sleep(retry_delay)
+                                retry_delay *= 2  # 指数退避
+                            else:
+                                # 最后一次尝试失败 - 显示详细错误
+                                detailed_error = f"网络错误: {error_msg[:200]}"
+                                self.logger.error(f"❌ 订单提交失败（已重试{max_retries}次）: {detailed_error}")
+                                raise ccxt.NetworkError(f"Max retries exceeded - {detailed_error}")
+
+                        except Exception as e:
+                            # 其他类型的错误直接抛出，不重试
+                            raise
             
             # 检查response是否为None
             if response is None:
@@ -1118,9 +1399,12 @@ class GateExecutor(ExchangeExecutor):
             error_msg = str(e)
             
             # 判断是否为余额不足等不可重试错误
-            is_retryable = not any(keyword in error_msg.lower() for keyword in [
-                'insufficient', 'balance', 'margin', 'invalid', 'permission', 'whitelist'
-            ])
+            # WS 下单结果未知：订单可能已挂上，重试会重复下单
+            is_retryable = not isinstance(e, GateWsOrderUnknownError) and not any(
+                keyword in error_msg.lower() for keyword in [
+                    'insufficient', 'balance', 'margin', 'invalid', 'permission', 'whitelist'
+                ]
+            )
             
             # 保存错误信息到订单对象
             order.reject_reason = error_msg[:200]
@@ -1193,7 +1477,7 @@ class GateExecutor(ExchangeExecutor):
         while elapsed < timeout_sec:
             try:
                 # 查询订单状态
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 response = await loop.run_in_executor(
                     None,
                     lambda: self._exchange.fetch_order(
@@ -1274,7 +1558,7 @@ class GateExecutor(ExchangeExecutor):
                     self.logger.error("订单没有 exchange_order_id，无法取消")
                     return False
                 
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 response = await loop.run_in_executor(
                     None,
                     lambda: self._exchange.cancel_order(
@@ -1305,6 +1589,62 @@ class GateExecutor(ExchangeExecutor):
                 )
                 return False
     
+    async def cancel_order_by_id(
+        self,
+        exchange_order_id: str,
+        symbol: str,
+        metadata: Optional[Dict] = None,
+    ) -> bool:
+        """
+        按交易所订单 ID 取消订单（无需构造 Order 对象）
+        
+        Args:
+            exchange_order_id: 交易所订单 ID
+            symbol: 交易对
+            metadata: 附加信息 (side/price/reason/order_type，用于通知)
+            
+        Returns:
+            True 如果取消成功
+        """
+        if not exchange_order_id:
+            self.logger.error("缺少 exchange_order_id，无法取消")
+            return False
+        
+        self.logger.info(f"取消订单: {exchange_order_id}")
+        
+        if self.paper_trading:
+            await asyncio.sleep(0.05)
+            self._stats["orders_cancelled"] += 1
+            await self._notify_cancel_sync(symbol, metadata or {})
+            return True
+        
+        try:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None,
+                lambda: self._exchange.cancel_order(id=exchange_order_id, symbol=symbol)
+            )
+            
+            if response:
+                self._stats["orders_cancelled"] += 1
+                self.logger.info(
+                    f"✅ 订单已取消: {exchange_order_id}",
+                    extra={'response': response}
+                )
+                await self._notify_cancel_sync(symbol, metadata or {})
+                return True
+            else:
+                self.logger.error("取消订单返回空响应")
+                return False
+        
+        except Exception as e:
+            self.logger.error(
+                f"❌ 取消订单失败: {e}",
+                exc_info=True,
+                extra={'order_id': exchange_order_id}
+            )
+            return False
+    
     async def get_order_status(self, order: Order) -> OrderStatus:
         """
         查询订单状态
@@ -1346,7 +1686,7 @@ class GateExecutor(ExchangeExecutor):
         else:
             # ✅ 真实交易：查询 Gate.io 余额
             try:
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 balance_data = await loop.run_in_executor(
                     None,
                     lambda: self._exchange.fetch_balance()
@@ -1405,7 +1745,7 @@ class GateExecutor(ExchangeExecutor):
             return []
         
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             # CCXT fetch_positions expects a list of symbols or None
             # If a single string is passed, wrap it in a list to prevent it from being iterated as characters
             symbols_arg = [symbol] if symbol else None
@@ -1495,7 +1835,7 @@ class GateExecutor(ExchangeExecutor):
         if not hasattr(self._exchange, method_name):
             raise AttributeError(f"ccxt exchange has no method '{method_name}'")
         
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         func = getattr(self._exchange, method_name)
         return await loop.run_in_executor(None, lambda: func(params or {}))
     
@@ -1517,7 +1857,7 @@ class GateExecutor(ExchangeExecutor):
         try:
             self.logger.info(f"🔧 设置 {symbol} 杠杆为 {leverage}x")
             
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             await loop.run_in_executor(
                 None,
                 lambda: self._exchange.set_leverage(leverage, symbol)
@@ -1555,7 +1895,7 @@ class GateExecutor(ExchangeExecutor):
         try:
             self.logger.info(f"🔧 设置 {symbol} 保证金模式为 {margin_mode}")
             
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             
             # 调用 ccxt 的 set_margin_mode 方法
             # Gate.io 支持: 'cross' (全仓) 和 'isolated' (逐仓)
@@ -1615,7 +1955,7 @@ class GateExecutor(ExchangeExecutor):
             }
         
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             
             # 查询账户信息
             balance_data = await loop.run_in_executor(
@@ -1675,7 +2015,7 @@ class GateExecutor(ExchangeExecutor):
             return []
             
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             orders = await loop.run_in_executor(
                 None,
                 lambda: self._exchange.fetch_open_orders(symbol=symbol)
@@ -1699,7 +2039,7 @@ class GateExecutor(ExchangeExecutor):
             return []
             
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             orders = await loop.run_in_executor(
                 None,
                 lambda: self._exchange.fetch_open_orders(symbol=symbol)
@@ -1732,7 +2072,7 @@ class GateExecutor(ExchangeExecutor):
             return []
         
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             
             # 查询成交历史
             trades = await loop.run_in_executor(
@@ -1764,7 +2104,7 @@ class GateExecutor(ExchangeExecutor):
             return True
             
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             await loop.run_in_executor(
                 None,
                 lambda: self._exchange.cancel_all_orders(symbol)
@@ -1795,7 +2135,7 @@ class GateExecutor(ExchangeExecutor):
             
             method_name = 'private_futures_get_settle_price_orders'
             
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             
             if hasattr(self._exchange, method_name):
                 func = getattr(self._exchange, method_name)
@@ -1854,7 +2194,7 @@ class GateExecutor(ExchangeExecutor):
             settle = 'usdt'
             contract = symbol.replace('/', '_').replace(':USDT', '')
             
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             
             # 尝试正确的方法名
             # 路径: DELETE /futures/{settle}/price_orders/{order_id}
@@ -1903,7 +2243,7 @@ class GateExecutor(ExchangeExecutor):
             return []
         
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             
             # 查询订单历史
             orders = await loop.run_in_executor(
@@ -1962,7 +2302,7 @@ class GateExecutor(ExchangeExecutor):
             }
         
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             
             # 执行资金划转
             # Gate.io API: transfer(code, amount, from_account, to_account)
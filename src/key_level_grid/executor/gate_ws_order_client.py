@@ -0,0 +1,230 @@
+"""
+Gate.io 合约 WebSocket 下单客户端
+
+通过常驻的已鉴权 WebSocket 连接调用 futures.order_place，
+省去每笔 REST 请求的 TLS 握手与 HTTP 签名开销。
+API 文档: https://www.gate.io/docs/developers/futures/ws/zh_CN/#order-place
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from key_level_grid.utils.logger import get_logger
+
+
+class GateWsOrderError(Exception):
+    """WebSocket 下单失败（交易所返回错误）"""
+
+    def __init__(self, label: str, message: str = ""):
+        super().__init__(f"{label}: {message}" if message else label)
+        self.label = label
+        self.message = message
+
+
+class GateWsNotSentError(Exception):
+    """请求未发出（连接/登录/发送失败），交易所一定未收到该订单，可安全改走 REST"""
+
+
+class GateWsOrderUnknownError(Exception):
+    """请求已发出但结果未知（超时/断线）且暂未查到订单，不可重下"""
+
+
+class GateWsOrderClient:
+    """
+    Gate.io 合约 WebSocket 下单客户端
+
+    - 单连接复用：首次下单时建立连接并登录，断线后下次下单自动重连
+    - 请求/响应按 req_id 关联，多笔下单可在同一连接上并发
+    - 连接/登录失败抛出 GateWsNotSentError；请求发出后的超时或断线原样抛出，
+      此时订单状态未知，调用方需向交易所查询，不能直接重下
+    """
+
+    WS_URL = "wss://fx-ws.gateio.ws/v4/ws/usdt"
+    LOGIN_CHANNEL = "futures.login"
+    ORDER_PLACE_CHANNEL = "futures.order_place"
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        ws_url: Optional[str] = None,
+        timeout_sec: float = 5.0,
+    ):
+        """
+        初始化客户端
+
+        Args:
+            api_key: API 密钥
+            api_secret: API 密钥
+            ws_url: WebSocket 地址（默认 USDT 永续）
+            timeout_sec: 单次请求超时（秒）
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.ws_url = ws_url or self.WS_URL
+        self.timeout_sec = timeout_sec
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._connect_lock = asyncio.Lock()
+
+        self.logger = get_logger(__name__)
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    def _sign(self, channel: str, req_param: str, ts: int) -> str:
+        """Gate WS API 签名: HMAC-SHA512("api\\n{channel}\\n{req_param}\\n{ts}")"""
+        message = f"api\n{channel}\n{req_param}\n{ts}"
+        return hmac.new(
+            self.api_secret.encode(), message.encode(), hashlib.sha512
+        ).hexdigest()
+
+    async def _ensure_connected(self) -> None:
+        """确保连接已建立并登录（失败时关闭连接，下次下单重新建立）"""
+        if self.connected:
+            return
+        async with self._connect_lock:
+            if self.connected:
+                return
+            try:
+                if self._session is None or self._session.closed:
+                    self._session = aiohttp.ClientSession()
+                self._ws = await self._session.ws_connect(self.ws_url, heartbeat=20)
+                self._reader_task = asyncio.create_task(self._reader_loop())
+
+                ts = int(time.time())
+                await self._request(
+                    self.LOGIN_CHANNEL,
+                    {
+                        "api_key": self.api_key,
+                        "signature": self._sign(self.LOGIN_CHANNEL, "", ts),
+                        "timestamp": str(ts),
+                    },
+                    ts=ts,
+                )
+            except Exception as e:
+                # 未登录的连接不可复用，否则 connected 恒为 True 且不再重试登录
+                await self._close_ws()
+                raise GateWsNotSentError(f"Gate WS 下单通道连接/登录失败: {e}") from e
+            self.logger.info("✅ Gate WS 下单通道已登录")
+
+    async def _reader_loop(self) -> None:
+        """读取响应并按 req_id 分发"""
+        ws = self._ws
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                data = json.loads(msg.data)
+                # 下单请求会先返回 ack，再返回最终结果
+                if data.get("ack"):
+                    continue
+                req_id = data.get("request_id") or (data.get("header") or {}).get("request_id")
+                future = self._pending.pop(req_id, None)
+                if future and not future.done():
+                    future.set_result(data)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Gate WS 下单通道读取异常: {e}")
+        finally:
+            # 连接断开：唤醒所有等待中的请求
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Gate WS 下单通道已断开"))
+            self._pending.clear()
+
+    async def _request(
+        self,
+        channel: str,
+        payload: Dict[str, Any],
+        ts: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """发送 API 请求并等待结果"""
+        req_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = future
+
+        payload = dict(payload, req_id=req_id)
+        try:
+            await self._ws.send_str(json.dumps({
+                "time": ts or int(time.time()),
+                "channel": channel,
+                "event": "api",
+                "payload": payload,
+            }))
+        except Exception as e:
+            self._pending.pop(req_id, None)
+            raise GateWsNotSentError(f"Gate WS 请求发送失败: {e}") from e
+        try:
+            data = await asyncio.wait_for(future, timeout=self.timeout_sec)
+        finally:
+            self._pending.pop(req_id, None)
+
+        header = data.get("header") or {}
+        if str(header.get("status", "200")) != "200":
+            errs = (data.get("data") or {}).get("errs") or {}
+            raise GateWsOrderError(errs.get("label", "UNKNOWN"), errs.get("message", ""))
+        return (data.get("data") or {}).get("result") or {}
+
+    async def place_order(
+        self,
+        contract: str,
+        size: int,
+        price: str,
+        text: Optional[str] = None,
+        reduce_only: bool = False,
+        tif: str = "gtc",
+    ) -> Dict[str, Any]:
+        """
+        通过 WebSocket 下限价单
+
+        Args:
+            contract: 合约 (如 BTC_USDT)
+            size: 张数，正数买入、负数卖出
+            price: 价格字符串（已按精度格式化）
+            text: 自定义订单 ID（须以 "t-" 开头）
+            reduce_only: 仅减仓
+            tif: 有效方式
+
+        Returns:
+            交易所返回的订单信息
+        """
+        await self._ensure_connected()
+
+        req_param: Dict[str, Any] = {
+            "contract": contract,
+            "size": size,
+            "price": price,
+            "tif": tif,
+            "reduce_only": reduce_only,
+        }
+        if text:
+            req_param["text"] = text
+
+        return await self._request(self.ORDER_PLACE_CHANNEL, {"req_param": req_param})
+
+    async def _close_ws(self) -> None:
+        """关闭当前连接与读取任务（保留 session 供重连）"""
+        ws, self._ws = self._ws, None
+        reader, self._reader_task = self._reader_task, None
+        if ws is not None and not ws.closed:
+            await ws.close()
+        if reader is not None and reader is not asyncio.current_task():
+            reader.cancel()
+
+    async def close(self) -> None:
+        """关闭连接"""
+        await self._close_ws()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,64 @@
+"""
+订单对象池
+
+复用 Order 实例及其 metadata 字典，减少批量挂单路径上的对象分配。
+"""
+
+from typing import List, Optional
+
+from key_level_grid.executor.base import Order, OrderSide, OrderType
+
+
+class OrderPool:
+    """
+    Order 对象池
+
+    get() 取出并原地重置一个 Order；调用方在订单不再被引用后 put() 归还。
+    """
+
+    def __init__(self, max_size: int = 64):
+        """
+        初始化对象池
+
+        Args:
+            max_size: 池中最多保留的空闲订单数
+        """
+        self.max_size = max_size
+        self._free: List[Order] = []
+
+    def get(
+        self,
+        symbol: str,
+        side: OrderSide,
+        quantity: float,
+        order_type: OrderType = OrderType.LIMIT,
+        price: Optional[float] = None,
+        **kwargs
+    ) -> Order:
+        """取出一个订单（参数同 Order.create）"""
+        if self._free:
+            return self._free.pop().reset(
+                symbol=symbol,
+                side=side,
+                quantity=quantity,
+                order_type=order_type,
+                price=price,
+                **kwargs
+            )
+        return Order.create(
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            order_type=order_type,
+            price=price,
+            **kwargs
+        )
+
+    def put(self, order: Order) -> None:
+        """归还订单"""
+        if len(self._free) < self.max_size:
+            order.metadata.clear()
+            self._free.append(order)
+
+    def __len__(self) -> int:
+        return len(self._free)
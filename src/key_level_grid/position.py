@@ -6,12 +6,14 @@
 注意: 配置类、类型、状态类已迁移到 core/ 模块
 """
 
-import json
+import asyncio
+import threading
 import time
 from decimal import Decimal, ROUND_DOWN
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from key_level_grid.utils import fastjson
 from key_level_grid.utils.logger import get_logger
 
 # 从 core 模块导入（新路径）
@@ -70,11 +72,11 @@ class GridPositionManager:
         exchange: str = "",
         full_config: Optional[Dict] = None,  # 🆕 V3.0: 完整配置字典
     ):
-        self.grid_config = grid_config or GridConfig()
-        self.position_config = position_config or PositionConfig()
-        self.stop_loss_config = stop_loss_config or StopLossConfig()
-        self.take_profit_config = take_profit_config or TakeProfitConfig()
-        self.resistance_config = resistance_config or ResistanceConfig()
+        self.grid_config: GridConfig = grid_config or GridConfig()
+        self.position_config: PositionConfig = position_config or PositionConfig()
+        self.stop_loss_config: StopLossConfig = stop_loss_config or StopLossConfig()
+        self.take_profit_config: TakeProfitConfig = take_profit_config or TakeProfitConfig()
+        self.resistance_config: ResistanceConfig = resistance_config or ResistanceConfig()
         self.symbol = symbol
         self.exchange = exchange
         self.logger = get_logger(__name__)
@@ -93,6 +95,17 @@ class GridPositionManager:
             self.state_dir = self.state_dir / self.exchange.lower()
         self.state_dir.mkdir(parents=True, exist_ok=True)
         self.state_file = self.state_dir / f"{self.symbol.lower()}_state.json"
+        # 状态写盘序号：保证后台线程写入不会覆盖更新的快照
+        self._state_write_lock = threading.Lock()
+        self._state_seq: int = 0
+        self._state_written_seq: int = 0
+        # 状态修订号：每次保存或 mark_changed() 时递增，供展示层判断缓存是否失效
+        self.revision: int = 0
+        self._inventory_dicts_key: Optional[tuple] = None
+        self._inventory_dicts: tuple = ([], [])
+        # 展示用网格底线缓存（按状态对象与修订号失效）
+        self._support_floor_key: Optional[tuple] = None
+        self._support_floor: float = 0
         
         # 🆕 V3.0: 延迟初始化组件
         self._level_calculator = None
@@ -445,6 +458,7 @@ class GridPositionManager:
         order.is_filled = True
         order.fill_price = fill_price
         order.fill_time = fill_time
+        self.state.refresh_sell_order_index()
         
         pnl_pct = (fill_price - self.state.avg_entry_price) / self.state.avg_entry_price
         pnl_usdt = order.amount_usdt * pnl_pct
@@ -1908,25 +1922,85 @@ class GridPositionManager:
     def _save_state(self) -> None:
         """保存状态"""
         try:
-            payload: Dict = {"trade_history": self.trade_history}
-            if self.state:
-                payload["grid_state"] = self.state.to_dict()
-            else:
-                payload["grid_state"] = None
-            
-            with self.state_file.open("w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
+            self._write_state(*self._snapshot_state())
+        except Exception as e:
+            self.logger.error(f"保存网格状态失败: {e}", exc_info=True)
+    
+    async def save_state_async(self) -> None:
+        """
+        保存状态（异步）
+        
+        快照在事件循环内序列化为 bytes（状态容器只在事件循环内被修改，跨线程编码会读到
+        正在变化的 dict/list），仅写盘放到工作线程
+        """
+        try:
+            seq, data = self._snapshot_state()
+            await asyncio.to_thread(self._write_state, seq, data)
         except Exception as e:
             self.logger.error(f"保存网格状态失败: {e}", exc_info=True)
     
+    def mark_changed(self) -> None:
+        """标记状态已变更（未落盘的修改也需让展示缓存失效）"""
+        self.revision += 1
+    
+    def get_inventory_dicts(self) -> tuple:
+        """
+        持仓/已结算记录的字典列表 (active, settled)
+        
+        行情每次刷新都会重建展示数据，而持仓记录只在成交时变化；
+        以状态对象、列表标识与长度及修订号为键缓存序列化结果，调用方不得修改返回的列表
+        """
+        state = self.state
+        if not state:
+            return [], []
+        active, settled = state.active_inventory, state.settled_inventory
+        key = (id(state), id(active), len(active), id(settled), len(settled), self.revision)
+        if key != self._inventory_dicts_key:
+            self._inventory_dicts = (
+                [f.to_dict() for f in active],
+                [f.to_dict() for f in settled],
+            )
+            self._inventory_dicts_key = key
+        return self._inventory_dicts
+    
+    def get_support_floor(self) -> float:
+        """展示用网格底线（最低支撑价 × 0.995），状态未变更时直接返回缓存值"""
+        state = self.state
+        if state is None:
+            return 0
+        key = (id(state), id(state.support_levels), self.revision)
+        if key != self._support_floor_key:
+            self._support_floor = state.support_floor()
+            self._support_floor_key = key
+        return self._support_floor
+    
+    def _snapshot_state(self) -> tuple:
+        """生成待写盘的状态快照（已序列化的 bytes）及其序号"""
+        self.revision += 1
+        self._state_seq += 1
+        payload: Dict = {"trade_history": list(self.trade_history)}
+        if self.state:
+            payload["grid_state"] = self.state.to_dict()
+        else:
+            payload["grid_state"] = None
+        return self._state_seq, fastjson.dumps(payload, indent=True)
+    
+    def _write_state(self, seq: int, data: bytes) -> None:
+        """写入状态快照（旧快照不覆盖新快照）"""
+        with self._state_write_lock:
+            if seq < self._state_written_seq:
+                return
+            with self.state_file.open("wb") as f:
+                f.write(data)
+            self._state_written_seq = seq
+    
     def restore_state(self, current_price: float, price_tolerance: float = 0.02) -> bool:
         """恢复网格状态"""
         if not self.state_file.exists():
             return False
         
         try:
-            with self.state_file.open("r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = fastjson.loads(self.state_file.read_bytes())
         except Exception as e:
             self.logger.error(f"读取网格状态失败: {e}", exc_info=True)
             return False
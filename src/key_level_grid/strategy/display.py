@@ -4,15 +4,178 @@
 负责生成策略状态的展示数据，供前端面板显示
 """
 
+import time
+from operator import attrgetter, itemgetter
 from typing import Any, Dict, List, Optional
 
-from key_level_grid.core.models import KeyLevelGridState
+import numpy as np
+
+from key_level_grid.core.models import KeyLevelGridState, LevelView
 from key_level_grid.core.state import GridState
+from key_level_grid.utils import fastjson
+from key_level_grid.utils.njit import njit
+
+
+# 展示数据缓存的最长有效期（秒）：兜底未通过修订号通知的状态变更
+_DISPLAY_CACHE_TTL_SEC = 1.0
+
+# 水位元数据默认值: (strength, timeframe, source, description)
+_DEFAULT_TIMEFRAME = "4h"
+_DEFAULT_LEVEL_META = (0, _DEFAULT_TIMEFRAME, "", "")
+
+# get_status 中展示的指标
+_STATUS_INDICATORS = ("macd", "rsi", "atr", "adx")
+
+# 按价格排序的 key（C 实现，避免 lambda 调用开销）
+_BY_PRICE_ITEM = itemgetter("price")
+_BY_PRICE_ATTR = attrgetter("price")
+
+
+def _price_sort_key(rows: list):
+    """按首个元素选择 dict 或属性取价 key（列表内形式一致）"""
+    return _BY_PRICE_ITEM if rows and isinstance(rows[0], dict) else _BY_PRICE_ATTR
+
+
+def _rows_from_dicts(levels: list, default_type: str) -> List[LevelView]:
+    """dict 形式水位 → 展示行"""
+    rows = []
+    for lvl in levels:
+        get = lvl.get
+        rows.append(LevelView(
+            get("price", 0),
+            get("type", default_type),
+            get("strength", 0),
+            get("timeframe", _DEFAULT_TIMEFRAME),
+            get("source", ""),
+            get("description", ""),
+            get("fill_counter", 0),
+        ))
+    return rows
+
+
+def _rows_from_attrs(levels: list, default_type: str) -> List[LevelView]:
+    """对象形式水位（PriceLevel 等）→ 展示行"""
+    rows = []
+    for lvl in levels:
+        level_type = getattr(lvl, "level_type", default_type)
+        rows.append(LevelView(
+            lvl.price,
+            getattr(level_type, "value", level_type),
+            lvl.strength,
+            getattr(lvl, "timeframe", _DEFAULT_TIMEFRAME),
+            getattr(lvl, "source", ""),
+            getattr(lvl, "description", ""),
+            int(getattr(lvl, "fill_counter", 0) or 0),
+        ))
+    return rows
+
+
+def _levels_to_rows(levels: list, default_type: str, limit: int = 10) -> List[LevelView]:
+    """
+    水位列表 → 展示行（最多 limit 个）
+    
+    列表内水位形式一致，按首个元素一次性选择构建函数，避免逐个 isinstance 判断
+    """
+    levels = levels[:limit]
+    if not levels:
+        return []
+    if isinstance(levels[0], dict):
+        return _rows_from_dicts(levels, default_type)
+    return _rows_from_attrs(levels, default_type)
+
+
+@njit(cache=True)
+def level_filter_mask(
+    prices: np.ndarray,
+    strengths: np.ndarray,
+    min_strength: float,
+    lower: float,
+    upper: float,
+) -> np.ndarray:
+    """
+    水位过滤掩码：强度不低于 min_strength 且价格位于 [lower, upper] 内
+
+    参数为 0 表示不限制
+    """
+    mask = np.ones(prices.shape[0], dtype=np.bool_)
+    if min_strength:
+        mask &= ~(strengths < min_strength)
+    if lower:
+        mask &= ~(prices < lower)
+    if upper:
+        mask &= ~(prices > upper)
+    return mask
+
+
+@njit(cache=True)
+def account_risk_scalars(
+    total_balance: float,
+    max_leverage: float,
+    max_capital_usage: float,
+    expected_avg_price: float,
+    stop_loss_price: float,
+) -> tuple:
+    """
+    账户风险标量：(最大仓位, 预计最大亏损, 预计最大亏损百分比)
+
+    均价或止损价无效时亏损项为 0
+    """
+    max_position = total_balance * max_leverage * max_capital_usage
+    max_loss = 0.0
+    max_loss_pct = 0.0
+    if expected_avg_price > 0 and stop_loss_price > 0:
+        max_loss_pct = (expected_avg_price - stop_loss_price) / expected_avg_price * 100
+        max_loss = max_position * (max_loss_pct / 100)
+    return max_position, max_loss, max_loss_pct
+
+
+def _levels_to_meta(levels) -> Dict[float, tuple]:
+    """
+    水位列表 → {价格: (strength, timeframe, source, description)}
+    
+    仅 dict 形式的水位带元数据，其余按默认值
+    """
+    if not levels:
+        return {}
+    if isinstance(levels[0], dict):
+        return {
+            float(lvl.get("price", 0)): (
+                lvl.get("strength", 0),
+                lvl.get("timeframe", _DEFAULT_TIMEFRAME),
+                lvl.get("source", ""),
+                lvl.get("description", ""),
+            )
+            for lvl in levels
+        }
+    return {float(lvl.price): _DEFAULT_LEVEL_META for lvl in levels}
 
 
 class DisplayDataGenerator:
     """展示数据生成器"""
     
+    # 属性固定，使用 __slots__ 省去实例 __dict__，属性读取更快
+    __slots__ = (
+        "position_manager",
+        "config",
+        "_account_balance",
+        "_gate_position",
+        "_gate_open_orders",
+        "_contract_size",
+        "_min_strength",
+        "_max_grids",
+        "_primary_tf",
+        "_timeframe_info",
+        "_display_cache_key",
+        "_display_cache_val",
+        "_display_cache_at",
+        "_sr_cache_key",
+        "_sr_cache_val",
+        "_level_meta_key",
+        "_level_meta",
+        "_state_views_key",
+        "_state_views",
+    )
+    
     def __init__(
         self,
         position_manager,
@@ -28,6 +191,69 @@ class DisplayDataGenerator:
         self._gate_position = gate_position or {}
         self._gate_open_orders = gate_open_orders or []
         self._contract_size = contract_size
+        self.refresh_config_cache()
+        
+        # get_display_data 缓存：输入未变化时直接复用上次结果
+        self._display_cache_key: Optional[tuple] = None
+        self._display_cache_val: Optional[Dict[str, Any]] = None
+        self._display_cache_at: float = 0.0
+        
+        # 实时支撑/阻力位计算缓存：(周期, 末根K线时间, K线数, 价格) -> (阻力位行, 支撑位行)
+        self._sr_cache_key: Optional[tuple] = None
+        self._sr_cache_val: tuple = ([], [])
+        
+        # 水位元数据缓存：(水位列表标识, 修订号) -> {价格: 元数据}
+        self._level_meta_key: Optional[tuple] = None
+        self._level_meta: Dict[float, tuple] = {}
+        
+        # 行情快照视图缓存：(行情状态标识, 时间戳) -> (价格字典, 指标字典)
+        self._state_views_key: Optional[tuple] = None
+        self._state_views: tuple = ({}, {})
+    
+    def _get_state_views(self, state: KeyLevelGridState) -> tuple:
+        """行情状态 → (价格字典, 指标字典)，同一行情状态只提取一次，get_status 与面板数据共用"""
+        key = (id(state), state.timestamp)
+        if key != self._state_views_key:
+            self._state_views = (state.price_dict(), state.indicators_dict())
+            self._state_views_key = key
+        return self._state_views
+    
+    def refresh_config_cache(self) -> None:
+        """
+        缓存运行期不变的配置项（周期、水位强度阈值、最大网格数）
+
+        网格区间等可通过 Telegram 修改的配置仍每次读取；替换上述配置对象后需重新调用
+        """
+        pm = self.position_manager
+        resistance_config = getattr(pm, "resistance_config", None)
+        grid_config = getattr(pm, "grid_config", None)
+        self._min_strength = getattr(resistance_config, "min_strength", 0) or 0
+        self._max_grids = getattr(grid_config, "max_grids", 10)
+        
+        kline_config = getattr(self.config, "kline_config", None)
+        if kline_config is None:
+            self._primary_tf = None
+            self._timeframe_info = {}
+            return
+        primary_tf = kline_config.primary_timeframe
+        aux_tfs = [tf.value for tf in kline_config.auxiliary_timeframes]
+        self._primary_tf = primary_tf
+        self._timeframe_info = {
+            "primary": primary_tf.value,
+            "auxiliary": aux_tfs,
+            "display": f"{primary_tf.value} + {' + '.join(aux_tfs)}" if aux_tfs else primary_tf.value,
+        }
+    
+    def _get_level_meta(self, pos: GridState) -> Dict[float, tuple]:
+        """合并支撑/阻力位元数据（同价位以阻力位为准），水位列表未变化时复用"""
+        key = (id(pos.support_levels), id(pos.resistance_levels), self.position_manager.revision)
+        if key != self._level_meta_key:
+            self._level_meta = {
+                **_levels_to_meta(pos.support_levels),
+                **_levels_to_meta(pos.resistance_levels),
+            }
+            self._level_meta_key = key
+        return self._level_meta
     
     def update_context(
         self,
@@ -58,16 +284,17 @@ class DisplayDataGenerator:
             current_state.close if current_state else 0
         )
         
+        if current_state:
+            indicators = self._get_state_views(current_state)[1]
+            indicators = {k: indicators[k] for k in _STATUS_INDICATORS}
+        else:
+            indicators = dict.fromkeys(_STATUS_INDICATORS)
+        
         return {
             "running": running,
             "symbol": self.config.symbol,
             "current_price": current_state.close if current_state else None,
-            "indicators": {
-                "macd": current_state.macd if current_state else None,
-                "rsi": current_state.rsi if current_state else None,
-                "atr": current_state.atr if current_state else None,
-                "adx": current_state.adx if current_state else None,
-            },
+            "indicators": indicators,
             "position": position_summary,
             "pending_signal": pending_signal.to_dict() if pending_signal else None,
             "kline_stats": kline_feed.get_stats(),
@@ -80,186 +307,142 @@ class DisplayDataGenerator:
         build_klines_by_timeframe_func,
         dry_run: bool = True,
     ) -> Dict[str, Any]:
-        """获取显示面板数据"""
+        """获取显示面板数据（输入未变化时返回缓存结果的浅拷贝）"""
+        pos = self.position_manager.state
+        grid_config = self.position_manager.grid_config
+        # 行情/持仓状态/交易所数据均为整体替换更新，以对象标识 + 修订号作为缓存键；
+        # 手动区间原地修改，直接以取值参与缓存键
+        cache_key = (
+            id(current_state),
+            current_state.timestamp if current_state else None,
+            id(pos),
+            self.position_manager.revision,
+            grid_config.range_mode,
+            grid_config.manual_lower,
+            grid_config.manual_upper,
+            id(self._account_balance),
+            id(self._gate_position),
+            id(self._gate_open_orders),
+            self._contract_size,
+            dry_run,
+        )
+        now = time.monotonic()
+        if (
+            cache_key == self._display_cache_key
+            and now - self._display_cache_at < _DISPLAY_CACHE_TTL_SEC
+        ):
+            return dict(self._display_cache_val)
+        
+        data = self._build_display_data(
+            current_state, kline_feed, build_klines_by_timeframe_func, dry_run
+        )
+        self._display_cache_key = cache_key
+        self._display_cache_val = data
+        self._display_cache_at = now
+        return dict(data)
+    
+    def get_display_json(
+        self,
+        current_state: Optional[KeyLevelGridState],
+        kline_feed,
+        build_klines_by_timeframe_func,
+        dry_run: bool = True,
+    ) -> bytes:
+        """获取显示面板数据的 JSON（UTF-8 bytes），展示行等对象由 default 钩子直接序列化"""
+        data = self.get_display_data(
+            current_state, kline_feed, build_klines_by_timeframe_func, dry_run
+        )
+        return fastjson.dumps(data, default=fastjson.default_hook)
+    
+    def _build_display_data(
+        self,
+        current_state: Optional[KeyLevelGridState],
+        kline_feed,
+        build_klines_by_timeframe_func,
+        dry_run: bool,
+    ) -> Dict[str, Any]:
+        """生成显示面板数据"""
         state = current_state
         pos = self.position_manager.state
         grid_config = self.position_manager.grid_config
-        resistance_config = self.position_manager.resistance_config
         levels_from_grid = False
         
-        # 周期信息
-        kline_config = self.config.kline_config
-        primary_tf = kline_config.primary_timeframe.value
-        aux_tfs = [tf.value for tf in kline_config.auxiliary_timeframes]
-        
         data = {
             "symbol": self.config.symbol,
             "timestamp": state.timestamp if state else None,
-            "timeframe": {
-                "primary": primary_tf,
-                "auxiliary": aux_tfs,
-                "display": f"{primary_tf} + {' + '.join(aux_tfs)}" if aux_tfs else primary_tf,
-            },
+            "timeframe": self._timeframe_info,
         }
         
         # 价格数据
         if state:
-            data["price"] = {
-                "current": state.close,
-                "open": state.open,
-                "high": state.high,
-                "low": state.low,
-            }
-            
-            # 技术指标
-            data["indicators"] = {
-                "macd": state.macd,
-                "macd_signal": state.macd_signal,
-                "macd_histogram": state.macd_histogram,
-                "rsi": state.rsi,
-                "atr": state.atr,
-                "adx": state.adx,
-                "volume_ratio": state.volume_ratio,
-            }
+            # 价格与技术指标（与 get_status 共用同一份提取结果）
+            data["price"], data["indicators"] = self._get_state_views(state)
             
             # 实时计算阻力位和支撑位
             if not (pos and (pos.support_levels_state or pos.resistance_levels_state)):
-                klines = kline_feed.get_cached_klines(
-                    self.config.kline_config.primary_timeframe
-                )
+                klines = kline_feed.get_cached_klines(self._primary_tf)
                 
                 if len(klines) >= 50:
-                    klines_dict = build_klines_by_timeframe_func(klines)
-                    resistance_calc = self.position_manager.resistance_calc
+                    # 同一根K线、同一价格下结果不变，直接复用（计算量远大于展示的其余部分）
+                    sr_key = (self._primary_tf, klines[-1].timestamp, len(klines), round(state.close, 4))
+                    if sr_key != self._sr_cache_key:
+                        klines_dict = build_klines_by_timeframe_func(klines)
+                        resistance_calc = self.position_manager.resistance_calc
+                        
+                        resistances = resistance_calc.calculate_resistance_levels(
+                            state.close, klines, "long", klines_by_timeframe=klines_dict
+                        )
+                        supports = resistance_calc.calculate_support_levels(
+                            state.close, klines, klines_by_timeframe=klines_dict
+                        )
+                        self._sr_cache_val = (
+                            _rows_from_attrs(resistances[:10], "resistance"),
+                            _rows_from_attrs(supports[:10], "support"),
+                        )
+                        self._sr_cache_key = sr_key
                     
-                    resistances = resistance_calc.calculate_resistance_levels(
-                        state.close, klines, "long", klines_by_timeframe=klines_dict
-                    )
-                    supports = resistance_calc.calculate_support_levels(
-                        state.close, klines, klines_by_timeframe=klines_dict
-                    )
-                    
-                    data["resistance_levels"] = [
-                        {
-                            "price": r.price, 
-                            "type": r.level_type.value, 
-                            "strength": r.strength, 
-                            "timeframe": getattr(r, 'timeframe', '4h'),
-                            "source": getattr(r, 'source', ''),
-                            "description": getattr(r, 'description', ''),
-                            "fill_counter": 0,
-                        }
-                        for r in resistances[:10]
-                    ]
-                    data["support_levels"] = [
-                        {
-                            "price": s.price, 
-                            "type": s.level_type.value, 
-                            "strength": s.strength, 
-                            "timeframe": getattr(s, 'timeframe', '4h'),
-                            "source": getattr(s, 'source', ''),
-                            "description": getattr(s, 'description', ''),
-                            "fill_counter": 0,
-                        }
-                        for s in supports[:10]
-                    ]
+                    data["resistance_levels"], data["support_levels"] = self._sr_cache_val
         
-        # 仓位信息
+        # 仓位信息统一由 get_position_display_data 生成（见下方 data["position"]）
+        # GridState 的 stop_loss/take_profit_plan 仅为兼容属性（恒为 None），不再输出
         if pos:
-            data["position"] = {
-                "direction": pos.direction,
-                "entry_price": pos.entry_price,
-                "size_usdt": pos.position_usdt,
-                "unrealized_pnl": pos.unrealized_pnl,
-            }
-            if pos.stop_loss:
-                data["stop_loss"] = {
-                    "price": pos.stop_loss.stop_price,
-                    "type": pos.stop_loss.stop_type.value,
-                }
-            if pos.take_profit_plan:
-                data["take_profit"] = [
-                    {"price": tp.price, "pct": tp.close_pct, "rr": tp.rr_multiple}
-                    for tp in pos.take_profit_plan.levels if tp.close_pct > 0
-                ]
-            
             # 使用网格固定水位
-            support_meta = {
-                float(s.get("price", 0) if isinstance(s, dict) else s.price): s
-                for s in (pos.support_levels or [])
-            }
-            resistance_meta = {
-                float(r.get("price", 0) if isinstance(r, dict) else r.price): r
-                for r in (pos.resistance_levels or [])
-            }
-
             if pos.support_levels_state or pos.resistance_levels_state:
                 levels_from_grid = True
                 current_price = state.close if state else 0
                 
                 # 合并所有水位元数据
-                all_meta = {**support_meta, **resistance_meta}
+                all_meta = self._get_level_meta(pos)
                 
-                # 合并所有水位，根据当前价格动态分类
-                all_levels = list(pos.support_levels_state) + list(pos.resistance_levels_state)
+                # 合并所有水位（列式数组），根据当前价格动态分类
+                arrays = pos.level_arrays()
+                prices = arrays.prices.tolist()
+                fill_counters = arrays.fill_counters.tolist()
                 
-                # 价格低于当前价的为支撑位
-                data["support_levels"] = [
-                    {
-                        "price": lvl.price,
-                        "type": "support",
-                        "strength": all_meta.get(lvl.price, {}).get("strength", 0) if isinstance(all_meta.get(lvl.price), dict) else 0,
-                        "timeframe": all_meta.get(lvl.price, {}).get("timeframe", "4h") if isinstance(all_meta.get(lvl.price), dict) else "4h",
-                        "source": all_meta.get(lvl.price, {}).get("source", "") if isinstance(all_meta.get(lvl.price), dict) else "",
-                        "description": all_meta.get(lvl.price, {}).get("description", "") if isinstance(all_meta.get(lvl.price), dict) else "",
-                        "fill_counter": int(getattr(lvl, "fill_counter", 0) or 0),
-                    }
-                    for lvl in all_levels
-                    if lvl.price < current_price
-                ]
+                def _level_rows(idx: np.ndarray, level_type: str) -> List[LevelView]:
+                    return [
+                        LevelView(
+                            prices[i],
+                            level_type,
+                            *all_meta.get(prices[i], _DEFAULT_LEVEL_META),
+                            fill_counters[i],
+                        )
+                        for i in idx.tolist()
+                    ]
                 
-                # 价格高于当前价的为阻力位
-                data["resistance_levels"] = [
-                    {
-                        "price": lvl.price,
-                        "type": "resistance",
-                        "strength": all_meta.get(lvl.price, {}).get("strength", 0) if isinstance(all_meta.get(lvl.price), dict) else 0,
-                        "timeframe": all_meta.get(lvl.price, {}).get("timeframe", "4h") if isinstance(all_meta.get(lvl.price), dict) else "4h",
-                        "source": all_meta.get(lvl.price, {}).get("source", "") if isinstance(all_meta.get(lvl.price), dict) else "",
-                        "description": all_meta.get(lvl.price, {}).get("description", "") if isinstance(all_meta.get(lvl.price), dict) else "",
-                        "fill_counter": int(getattr(lvl, "fill_counter", 0) or 0),
-                    }
-                    for lvl in all_levels
-                    if lvl.price > current_price
-                ]
+                # 价格低于当前价的为支撑位，高于当前价的为阻力位
+                data["support_levels"] = _level_rows(
+                    np.flatnonzero(arrays.prices < current_price), "support"
+                )
+                data["resistance_levels"] = _level_rows(
+                    np.flatnonzero(arrays.prices > current_price), "resistance"
+                )
             else:
-                data["resistance_levels"] = [
-                    {
-                        "price": r.get("price", 0) if isinstance(r, dict) else r.price,
-                        "type": r.get("type", "resistance") if isinstance(r, dict) else getattr(r, 'level_type', 'resistance'),
-                        "strength": r.get("strength", 0) if isinstance(r, dict) else r.strength,
-                        "timeframe": r.get("timeframe", "4h") if isinstance(r, dict) else getattr(r, 'timeframe', '4h'),
-                        "source": r.get("source", "") if isinstance(r, dict) else getattr(r, 'source', ''),
-                        "description": r.get("description", "") if isinstance(r, dict) else getattr(r, 'description', ''),
-                        "fill_counter": r.get("fill_counter", 0) if isinstance(r, dict) else int(getattr(r, "fill_counter", 0) or 0),
-                    }
-                    for r in pos.resistance_levels[:10]
-                ]
-                data["support_levels"] = [
-                    {
-                        "price": s.get("price", 0) if isinstance(s, dict) else s.price,
-                        "type": s.get("type", "support") if isinstance(s, dict) else getattr(s, 'level_type', 'support'),
-                        "strength": s.get("strength", 0) if isinstance(s, dict) else s.strength,
-                        "timeframe": s.get("timeframe", "4h") if isinstance(s, dict) else getattr(s, 'timeframe', '4h'),
-                        "source": s.get("source", "") if isinstance(s, dict) else getattr(s, 'source', ''),
-                        "description": s.get("description", "") if isinstance(s, dict) else getattr(s, 'description', ''),
-                        "fill_counter": s.get("fill_counter", 0) if isinstance(s, dict) else int(getattr(s, "fill_counter", 0) or 0),
-                    }
-                    for s in pos.support_levels[:10]
-                ]
+                data["resistance_levels"] = _levels_to_rows(pos.resistance_levels, "resistance")
+                data["support_levels"] = _levels_to_rows(pos.support_levels, "support")
 
         # 过滤水位（无论来源，统一应用 min_strength 和区间过滤）
-        min_strength = getattr(resistance_config, "min_strength", 0) or 0
+        min_strength = self._min_strength
         lower = grid_config.manual_lower if grid_config.range_mode == "manual" else 0
         upper = grid_config.manual_upper if grid_config.range_mode == "manual" else 0
         if lower <= 0 or upper <= 0:
@@ -274,8 +457,9 @@ class DisplayDataGenerator:
         )
         
         # 交易历史
-        data["active_inventory"] = [f.to_dict() for f in pos.active_inventory] if pos else []
-        data["settled_inventory"] = [f.to_dict() for f in pos.settled_inventory] if pos else []
+        data["active_inventory"], data["settled_inventory"] = (
+            self.position_manager.get_inventory_dicts() if pos else ([], [])
+        )
         
         # 账户信息
         data["account"] = self.get_account_display_data()
@@ -300,19 +484,24 @@ class DisplayDataGenerator:
         lower: float,
         upper: float
     ) -> List[Dict[str, Any]]:
-        """过滤水位"""
-        filtered = []
-        for lvl in levels or []:
-            price = float(lvl.get("price", 0) or 0)
-            strength = float(lvl.get("strength", 0) or 0)
-            if min_strength and strength < min_strength:
-                continue
-            if lower and price < lower:
-                continue
-            if upper and price > upper:
-                continue
-            filtered.append(lvl)
-        return filtered
+        """过滤水位（无过滤条件或全部通过时原样返回列表，不复制）"""
+        if not levels:
+            return []
+        if not (min_strength or lower or upper):
+            return levels
+        n = len(levels)
+        prices = np.fromiter(
+            (float(lvl.get("price", 0) or 0) for lvl in levels), dtype=np.float64, count=n
+        )
+        strengths = np.fromiter(
+            (float(lvl.get("strength", 0) or 0) for lvl in levels), dtype=np.float64, count=n
+        )
+        mask = level_filter_mask(
+            prices, strengths, float(min_strength), float(lower), float(upper)
+        )
+        if mask.all():
+            return levels
+        return [levels[i] for i in np.flatnonzero(mask)]
     
     def get_account_display_data(self) -> Dict[str, Any]:
         """获取账户信息显示数据"""
@@ -331,8 +520,6 @@ class DisplayDataGenerator:
             available = pos_config.total_capital - total_invested
             frozen = total_invested
         
-        max_position = total_balance * pos_config.max_leverage * pos_config.max_capital_usage
-        
         # 网格底线和止损价格
         grid_floor = 0
         stop_loss_price = 0
@@ -350,12 +537,14 @@ class DisplayDataGenerator:
                 prices = [o.price for o in grid_state.buy_orders if o.price > 0]
                 expected_avg_price = sum(prices) / len(prices) if prices else 0
         
-        # 预计最大亏损
-        max_loss = 0.0
-        max_loss_pct = 0.0
-        if expected_avg_price > 0 and stop_loss_price > 0:
-            max_loss_pct = ((expected_avg_price - stop_loss_price) / expected_avg_price) * 100
-            max_loss = max_position * (max_loss_pct / 100)
+        # 最大仓位与预计最大亏损
+        max_position, max_loss, max_loss_pct = account_risk_scalars(
+            float(total_balance),
+            float(pos_config.max_leverage),
+            float(pos_config.max_capital_usage),
+            float(expected_avg_price),
+            float(stop_loss_price),
+        )
         
         return {
             "total_balance": total_balance,
@@ -394,14 +583,7 @@ class DisplayDataGenerator:
             if notional == 0 and entry_price > 0:
                 notional = contracts * entry_price
             
-            grid_floor = 0
-            pos = self.position_manager.state
-            if pos and pos.support_levels:
-                prices = [s.get('price', 0) if isinstance(s, dict) else s.price 
-                          for s in pos.support_levels if (s.get('price', 0) if isinstance(s, dict) else s.price) > 0]
-                if prices:
-                    min_support = min(prices)
-                    grid_floor = min_support * 0.995
+            grid_floor = self.position_manager.get_support_floor()
             
             return {
                 "side": "long",
@@ -427,13 +609,7 @@ class DisplayDataGenerator:
         else:
             pnl = 0
         
-        grid_floor = 0
-        if pos.support_levels:
-            prices = [s.get('price', 0) if isinstance(s, dict) else s.price 
-                      for s in pos.support_levels if (s.get('price', 0) if isinstance(s, dict) else s.price) > 0]
-            if prices:
-                min_support = min(prices)
-                grid_floor = min_support * 0.995
+        grid_floor = self.position_manager.get_support_floor()
         
         return {
             "side": pos.direction,
@@ -457,10 +633,18 @@ class DisplayDataGenerator:
         
         # 实盘模式使用真实挂单
         if not dry_run and self._gate_open_orders:
-            orders = []
+            buy_orders = []
+            sell_orders = []
             for o in self._gate_open_orders:
-                orders.append({
-                    "side": o.get("side", ""),
+                side = o.get("side", "")
+                if side == "buy":
+                    bucket = buy_orders
+                elif side == "sell":
+                    bucket = sell_orders
+                else:
+                    continue
+                bucket.append({
+                    "side": side,
                     "price": o.get("price", 0),
                     "amount": o.get("amount", 0),           # USDT 价值
                     "contracts": o.get("base_amount", 0),   # 币数量（用于计算张数）
@@ -471,8 +655,9 @@ class DisplayDataGenerator:
                     "strength": 0,
                     "order_id": o.get("id", ""),
                 })
-            buy_orders = sorted([o for o in orders if o.get("side") == "buy"], key=lambda x: x["price"], reverse=True)
-            sell_orders = sorted([o for o in orders if o.get("side") == "sell"], key=lambda x: x["price"], reverse=True)
+            # 卖单在上、买单在下，整体按价格从高到低排列（盘口视图）
+            buy_orders.sort(key=_BY_PRICE_ITEM, reverse=True)
+            sell_orders.sort(key=_BY_PRICE_ITEM, reverse=True)
             return sell_orders + buy_orders
         
         # 使用本地网格状态
@@ -481,34 +666,40 @@ class DisplayDataGenerator:
         if pos_state:
             if pos_state.support_levels_state or pos_state.resistance_levels_state:
                 # 优先使用配置中的 base_amount_per_grid，回退到状态中的值
-                grid_config = getattr(self.position_manager, "grid_config", None)
-                base_btc = float(getattr(grid_config, "base_amount_per_grid", 0) or 0)
+                base_btc = float(self.position_manager.grid_config.base_amount_per_grid or 0)
                 if base_btc <= 0:
                     base_btc = float(getattr(pos_state, "base_amount_per_grid", 0) or 0)
+                # 价格降序（稳定排序，同价保持原顺序）
+                sup = pos_state.level_arrays("support")
+                sup_prices = sup.prices.tolist()
                 buy_orders = [
                     {
                         "side": "buy",
-                        "price": lvl.price,
-                        "amount": base_btc * lvl.price,
+                        "price": sup_prices[i],
+                        "amount": base_btc * sup_prices[i],
                         "contracts": base_btc,
                         "status": "pending",
                         "source": "support",
                         "strength": 0,
                     }
-                    for lvl in sorted(pos_state.support_levels_state, key=lambda x: x.price, reverse=True)
+                    for i in np.argsort(-sup.prices, kind="stable").tolist()
                 ]
+                res = pos_state.level_arrays("resistance")
+                res_idx = np.flatnonzero(res.target_qtys > 0)
+                res_idx = res_idx[np.argsort(-res.prices[res_idx], kind="stable")]
+                res_prices = res.prices.tolist()
+                res_qtys = res.target_qtys.tolist()
                 sell_orders = [
                     {
                         "side": "sell",
-                        "price": lvl.price,
-                        "amount": lvl.target_qty * lvl.price,
-                        "contracts": lvl.target_qty,
+                        "price": res_prices[i],
+                        "amount": res_qtys[i] * res_prices[i],
+                        "contracts": res_qtys[i],
                         "status": "pending",
                         "source": "resistance",
                         "strength": 0,
                     }
-                    for lvl in sorted(pos_state.resistance_levels_state, key=lambda x: x.price, reverse=True)
-                    if lvl.target_qty > 0
+                    for i in res_idx.tolist()
                 ]
                 return buy_orders + sell_orders
 
@@ -522,7 +713,7 @@ class DisplayDataGenerator:
                     "source": o.source,
                     "strength": o.strength,
                 }
-                for o in sorted(pos_state.buy_orders, key=lambda x: x.price, reverse=True)
+                for o in sorted(pos_state.buy_orders, key=_BY_PRICE_ATTR, reverse=True)
             ]
             sell_orders = [
                 {
@@ -533,7 +724,7 @@ class DisplayDataGenerator:
                     "source": o.source,
                     "strength": o.strength,
                 }
-                for o in sorted(pos_state.sell_orders, key=lambda x: x.price, reverse=True)
+                for o in sorted(pos_state.sell_orders, key=_BY_PRICE_ATTR, reverse=True)
             ]
             return buy_orders + sell_orders
 
@@ -542,7 +733,7 @@ class DisplayDataGenerator:
         support_levels = support_levels or []
         resistance_levels = resistance_levels or []
         
-        min_strength = getattr(self.position_manager.resistance_config, 'min_strength', 80)
+        min_strength = self._min_strength
         strong_supports = [
             s for s in support_levels 
             if s.get("strength", 0) >= min_strength and s.get("price", 0) < state.close
@@ -552,10 +743,10 @@ class DisplayDataGenerator:
             if r.get("strength", 0) >= min_strength and r.get("price", 0) > state.close
         ]
         
-        strong_supports.sort(key=lambda x: -x.get("price", 0))
-        strong_resistances.sort(key=lambda x: x.get("price", 0))
+        strong_supports.sort(key=_price_sort_key(strong_supports), reverse=True)
+        strong_resistances.sort(key=_price_sort_key(strong_resistances))
         
-        max_grids = getattr(self.position_manager.grid_config, 'max_grids', 10)
+        max_grids = self._max_grids
         strong_supports = strong_supports[:max_grids]
         strong_resistances = strong_resistances[:max_grids]
         
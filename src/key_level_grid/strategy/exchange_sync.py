@@ -6,12 +6,87 @@
 
 import asyncio
 import time
-from datetime import datetime
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 
+from key_level_grid.core.models import GatePositionView
 from key_level_grid.utils.logger import get_logger
 
 
+# 合约大小缓存有效期（秒）：contractSize 基本不变，过期后重新读取市场信息
+_CONTRACT_SIZE_TTL_SEC = 3600.0
+
+# 持仓变动通知最小间隔（秒）：窗口内的多次变动合并为一条
+_FLUX_MIN_INTERVAL_SEC = 0.25
+
+# 成交记录：保留窗口（秒）、增量拉取的回退重叠（毫秒）、最多保留条数
+_TRADES_WINDOW_SEC = 172800
+_TRADES_OVERLAP_MS = 2000
+_TRADES_MAX_KEEP = 200
+
+
+_BY_TIMESTAMP = itemgetter("timestamp")
+
+
+def _safe_float(d: Dict, key: str, default: float = 0.0) -> float:
+    """读取数值字段，None / 0 / 空串统一返回 default"""
+    v = d.get(key)
+    return float(v) if v else default
+
+
+def _order_signature(o: Dict) -> tuple:
+    """原始挂单签名：签名不变时沿用已构建的记录"""
+    return (o.get("id"), o.get("price"), o.get("remaining"), o.get("filled"), o.get("status"))
+
+
+def _build_order(o: Dict, contract_size: float) -> Dict[str, Any]:
+    """ccxt 挂单 → 展示/去重用挂单字典"""
+    price = _safe_float(o, "price")
+    remaining_contracts = _safe_float(o, "remaining")
+    real_btc = remaining_contracts * contract_size
+    return {
+        "id": o.get("id", ""),
+        "side": o.get("side", ""),
+        "price": price,
+        "amount": real_btc * price,
+        "contracts": remaining_contracts,
+        "base_amount": real_btc,
+        "raw_contracts": remaining_contracts,
+        "filled": _safe_float(o, "filled"),
+        "remaining": remaining_contracts,
+        "status": o.get("status", ""),
+        "type": o.get("type", ""),
+        "timestamp": o.get("timestamp", 0),
+        "contract_size": contract_size,
+    }
+
+
+def format_trade_time(ts: int) -> str:
+    """成交时间戳（毫秒）→ 本地时间字符串，时间戳为空时返回空串"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts // 1000)) if ts else ""
+
+
+def _build_trade(trade: Dict, amount_factor: float) -> Dict[str, Any]:
+    """
+    ccxt 成交 → 成交记录字典（amount_factor: 张数到币数量的换算系数）
+    
+    只保留毫秒时间戳，需要展示时再用 format_trade_time 格式化
+    """
+    trade_time = trade.get("timestamp") or 0
+    fee = trade.get("fee") or {}
+    return {
+        "id": trade.get("id", ""),
+        "order_id": trade.get("order") or trade.get("order_id") or trade.get("orderId", ""),
+        "timestamp": trade_time,
+        "side": trade.get("side", ""),
+        "price": _safe_float(trade, "price"),
+        "amount": _safe_float(trade, "amount") * amount_factor,
+        "cost": _safe_float(trade, "cost"),
+        "fee": _safe_float(fee, "cost"),
+        "fee_currency": fee.get("currency", ""),
+    }
+
+
 class ExchangeSyncManager:
     """交易所数据同步管理器"""
     
@@ -37,26 +112,45 @@ class ExchangeSyncManager:
         self.notifier = notifier
         self.logger = get_logger(__name__)
         
+        # 交易对在策略生命周期内不变，预先转换为 Gate 格式及持仓匹配用的基础币种
+        self._gate_symbol = self._convert_to_gate_symbol(config.symbol)
+        self._gate_symbol_base = self._gate_symbol.split("/")[0]
+        
         # 账户余额缓存
         self.account_balance: Dict[str, float] = {"total": 0, "free": 0, "used": 0}
         self.balance_updated_at: float = 0
         
         # 挂单缓存
         self.open_orders: List[Dict] = []
+        self.buy_prices: List[float] = []    # 买单价格（升序）
+        self.sell_prices: List[float] = []   # 卖单价格（升序）
+        self.sell_contracts: float = 0.0     # 卖单剩余张数合计
         self.orders_updated_at: float = 0
+        self._orders_signature: Optional[tuple] = None  # 上次挂单原始数据的签名
         self.contract_size: float = 1.0
+        # 合约大小缓存: gate_symbol -> (contractSize, 过期时间 monotonic)
+        self._contract_size_cache: Dict[str, tuple] = {}
+        # 每个交易对一把锁：缓存未命中时只由一个协程加载，其余等待其结果
+        self._contract_size_locks: Dict[str, asyncio.Lock] = {}
         
         # 持仓缓存
         self.position: Dict[str, Any] = {}
+        self.position_view: GatePositionView = GatePositionView()  # 类型化持仓视图
         self.position_updated_at: float = 0
         self._last_position_btc: Optional[float] = None
         self._last_position_avg_price: float = 0.0
         self._last_position_unrealized_pnl: float = 0.0
         self._last_position_contracts: Optional[int] = None
         
+        # 持仓变动通知合并：待发送变动、上次发送时间、延迟发送任务
+        self._pending_flux: Optional[Dict[str, float]] = None
+        self._last_flux_emit_ts: float = 0.0
+        self._flux_flush_task: Optional[asyncio.Task] = None
+        
         # 成交记录缓存
         self.trades: List[Dict] = []
         self.trades_updated_at: float = 0
+        self._trades_high_watermark_ms: int = 0  # 已同步成交的最大时间戳（毫秒）
         
         # 当前市场状态
         self._current_state = None
@@ -65,7 +159,8 @@ class ExchangeSyncManager:
         """设置当前市场状态"""
         self._current_state = state
     
-    def _convert_to_gate_symbol(self, binance_symbol: str) -> str:
+    @staticmethod
+    def _convert_to_gate_symbol(binance_symbol: str) -> str:
         """将 Binance 符号转换为 Gate 格式"""
         symbol = binance_symbol.upper()
         if symbol.endswith("USDT"):
@@ -80,19 +175,19 @@ class ExchangeSyncManager:
         
         try:
             balance = await self.executor.get_balance("USDT")
+            # 更新时即转为 float（ccxt 可能返回 None），读取方无需再做 float(x or 0)
             self.account_balance = {
-                "total": balance.get("total", 0),
-                "free": balance.get("free", 0),
-                "used": balance.get("used", 0),
+                key: 0.0 if (v := balance.get(key)) is None else float(v)
+                for key in ("total", "free", "used")
             }
-            self.balance_updated_at = time.time()
+            self.balance_updated_at = time.monotonic()
             
             self.logger.debug(
-                f"💰 账户余额更新: total={self.account_balance['total']:.2f}, "
-                f"free={self.account_balance['free']:.2f}"
+                "💰 账户余额更新: total=%.2f, free=%.2f",
+                self.account_balance["total"], self.account_balance["free"],
             )
         except Exception as e:
-            self.logger.error(f"获取账户余额失败: {e}")
+            self.logger.error("获取账户余额失败: %s", e)
         
         return self.account_balance
     
@@ -102,44 +197,32 @@ class ExchangeSyncManager:
             return self.open_orders
         
         try:
-            gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+            gate_symbol = self._gate_symbol
             orders = await self.executor.get_open_orders(gate_symbol)
             
             # 获取合约信息
             contract_size = await self._get_contract_size(gate_symbol)
             self.contract_size = contract_size
             
-            self.open_orders = []
-            for o in orders:
-                price = float(o.get("price", 0) or 0)
-                remaining_contracts = float(o.get("remaining", 0) or 0)
-                real_btc = remaining_contracts * contract_size
-                amount_usdt = real_btc * price
+            # 挂单未变化时沿用上次的列表对象（不重建字典，下游按对象标识的缓存也保持有效）
+            signature = (contract_size, tuple(map(_order_signature, orders)))
+            if signature != self._orders_signature:
+                self.open_orders = [_build_order(o, contract_size) for o in orders]
+                self._orders_signature = signature
                 
-                self.open_orders.append({
-                    "id": o.get("id", ""),
-                    "side": o.get("side", ""),
-                    "price": price,
-                    "amount": amount_usdt,
-                    "contracts": remaining_contracts,
-                    "base_amount": real_btc,
-                    "raw_contracts": remaining_contracts,
-                    "filled": float(o.get("filled", 0) or 0),
-                    "remaining": remaining_contracts,
-                    "status": o.get("status", ""),
-                    "type": o.get("type", ""),
-                    "timestamp": o.get("timestamp", 0),
-                    "contract_size": contract_size,
-                })
+                # 按方向预建价格索引，供挂单去重直接使用
+                self.buy_prices = sorted(o["price"] for o in self.open_orders if o["side"] == "buy")
+                sells = [o for o in self.open_orders if o["side"] == "sell"]
+                self.sell_prices = sorted(o["price"] for o in sells)
+                self.sell_contracts = sum(o["raw_contracts"] for o in sells)
             
-            self.orders_updated_at = time.time()
+            self.orders_updated_at = time.monotonic()
             
             self.logger.debug(
-                f"📋 挂单同步: {len(self.open_orders)} 个订单, "
-                f"contractSize={contract_size}"
+                "📋 挂单同步: %d 个订单, contractSize=%s", len(self.open_orders), contract_size
             )
         except Exception as e:
-            self.logger.error(f"同步挂单失败: {e}")
+            self.logger.error("同步挂单失败: %s", e)
         
         return self.open_orders
     
@@ -149,96 +232,132 @@ class ExchangeSyncManager:
             return self.position
         
         try:
-            gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+            gate_symbol = self._gate_symbol
             positions = await self.executor.get_positions(gate_symbol)
             
             contract_size = await self._get_contract_size(gate_symbol)
             self.contract_size = contract_size
             
-            self.position = {}
-            for pos in positions:
+            gate_symbol_base = self._gate_symbol_base
+            
+            def _matches(pos: Dict) -> bool:
+                # 精确匹配最常见，先比较；其余写法（如 BTC_USDT）归一化后相等时必然包含基础币种，
+                # 由子串检查覆盖。符号不匹配时短路，不再读取张数
                 pos_symbol = pos.get("symbol", "")
-                symbol_match = (
-                    pos_symbol == gate_symbol or
-                    pos_symbol.replace("/", "_").replace(":USDT", "") == gate_symbol.replace("/", "_").replace(":USDT", "") or
-                    gate_symbol.split("/")[0] in pos_symbol
+                return (
+                    (pos_symbol == gate_symbol or gate_symbol_base in pos_symbol)
+                    and _safe_float(pos, "contracts") > 0
+                )
+            
+            self.position = {}
+            target = next((pos for pos in positions if _matches(pos)), None)
+            if target is not None:
+                raw_contracts = _safe_float(target, "contracts")
+                notional = _safe_float(target, "notional")
+                entry_price = _safe_float(target, "entryPrice")
+                real_btc = raw_contracts * contract_size
+                
+                self.position = {
+                    "symbol": target.get("symbol", ""),
+                    "contracts": real_btc,
+                    "raw_contracts": raw_contracts,
+                    "notional": abs(notional) if notional else real_btc * entry_price,
+                    "entry_price": entry_price,
+                    "side": "long",
+                    "unrealized_pnl": _safe_float(target, "unrealizedPnl"),
+                    "contract_size": contract_size,
+                }
+                self.logger.info(
+                    "📊 持仓同步: %.6f BTC (%.0f张) @ %.2f, 价值=%.2f USDT",
+                    real_btc, raw_contracts, entry_price, self.position["notional"],
                 )
                 
-                if symbol_match:
-                    raw_contracts = float(pos.get("contracts", 0) or 0)
-                    notional = float(pos.get("notional", 0) or 0)
-                    entry_price = float(pos.get("entryPrice", 0) or 0)
-                    
-                    real_btc = raw_contracts * contract_size
-                    
-                    if raw_contracts > 0:
-                        self.position = {
-                            "symbol": pos_symbol,
-                            "contracts": real_btc,
-                            "raw_contracts": raw_contracts,
-                            "notional": abs(notional) if notional else real_btc * entry_price,
-                            "entry_price": entry_price,
-                            "side": "long",
-                            "unrealized_pnl": float(pos.get("unrealizedPnl", 0) or 0),
-                            "contract_size": contract_size,
-                        }
-                        self.logger.info(
-                            f"📊 持仓同步: {real_btc:.6f} BTC ({raw_contracts:.0f}张) @ {entry_price:.2f}, "
-                            f"价值={self.position['notional']:.2f} USDT"
-                        )
-                        
-                        if self._last_position_contracts is None:
-                            self._last_position_contracts = int(raw_contracts)
-                        break
+                if self._last_position_contracts is None:
+                    self._last_position_contracts = int(raw_contracts)
             
             if not self.position:
                 self.logger.debug("📊 无持仓")
+            self.position_view = GatePositionView.from_dict(self.position)
             
             # 检测持仓变动并通知
             await self._check_position_change()
             
-            self.position_updated_at = time.time()
+            self.position_updated_at = time.monotonic()
             
         except Exception as e:
-            self.logger.error(f"同步持仓失败: {e}")
+            self.logger.error("同步持仓失败: %s", e)
         
         return self.position
     
     async def _check_position_change(self) -> None:
         """检测持仓变动并发送通知"""
-        new_qty = float(self.position.get("contracts", 0) or 0) if self.position else 0.0
-        new_avg = float(self.position.get("entry_price", 0) or 0) if self.position else 0.0
-        new_unreal = float(self.position.get("unrealized_pnl", 0) or 0) if self.position else 0.0
+        view = self.position_view
+        new_qty = view.contracts
+        new_avg = view.entry_price
+        new_unreal = view.unrealized_pnl
         
         if self._last_position_btc is None:
             self._last_position_btc = new_qty
             self._last_position_avg_price = new_avg
             self._last_position_unrealized_pnl = new_unreal
         elif new_qty != self._last_position_btc:
-            action = "买入" if new_qty > self._last_position_btc else "卖出"
-            if new_qty == 0 and self._last_position_btc > 0:
-                action = "平仓"
-            qty_delta = abs(new_qty - self._last_position_btc)
-            
             price_hint = 0.0
             if self._current_state:
                 price_hint = float(self._current_state.close or 0)
             if price_hint <= 0 and new_avg > 0:
                 price_hint = new_avg
             
-            if self.notifier:
-                await self.notifier.notify_position_flux(
-                    action=action,
-                    price=price_hint,
-                    qty=qty_delta,
-                    total_qty=new_qty,
-                    avg_price=new_avg,
-                    pnl=new_unreal,
-                )
+            # 合并到待发送变动：保留首次变动前的持仓量，其余取最新值
+            if self._pending_flux is None:
+                self._pending_flux = {"base_qty": self._last_position_btc}
+            self._pending_flux.update(
+                qty=new_qty, avg_price=new_avg, pnl=new_unreal, price=price_hint
+            )
             
             self._last_position_btc = new_qty
             self._last_position_avg_price = new_avg
             self._last_position_unrealized_pnl = new_unreal
+            
+            elapsed = time.monotonic() - self._last_flux_emit_ts
+            if elapsed >= _FLUX_MIN_INTERVAL_SEC:
+                await self._flush_position_flux()
+            elif self._flux_flush_task is None or self._flux_flush_task.done():
+                self._flux_flush_task = asyncio.create_task(
+                    self._flush_position_flux_later(_FLUX_MIN_INTERVAL_SEC - elapsed)
+                )
+    
+    async def _flush_position_flux_later(self, delay: float) -> None:
+        """延迟发送合并后的持仓变动"""
+        await asyncio.sleep(delay)
+        await self._flush_position_flux()
+    
+    async def _flush_position_flux(self) -> None:
+        """发送合并后的持仓变动通知（净变动为 0 时不发送）"""
+        flux = self._pending_flux
+        self._pending_flux = None
+        if flux is None or not self.notifier:
+            return
+        
+        base_qty = flux["base_qty"]
+        new_qty = flux["qty"]
+        if new_qty == base_qty:
+            return
+        action = "买入" if new_qty > base_qty else "卖出"
+        if new_qty == 0 and base_qty > 0:
+            action = "平仓"
+        
+        self._last_flux_emit_ts = time.monotonic()
+        try:
+            await self.notifier.notify_position_flux(
+                action=action,
+                price=flux["price"],
+                qty=abs(new_qty - base_qty),
+                total_qty=new_qty,
+                avg_price=flux["avg_price"],
+                pnl=flux["pnl"],
+            )
+        except Exception as e:
+            self.logger.error("发送持仓变动通知失败: %s", e)
     
     async def update_trades(self) -> List[Dict]:
         """从交易所获取成交记录"""
@@ -246,10 +365,14 @@ class ExchangeSyncManager:
             return self.trades
         
         try:
-            gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+            gate_symbol = self._gate_symbol
             
-            # 获取最近 48 小时的成交记录
-            since = int((time.time() - 172800) * 1000)
+            # 保留最近 48 小时的成交记录；首次全量拉取，之后只拉高水位之后的新成交
+            # （回退 2 秒，兜底交易所乱序落库的成交）
+            window_start = int((time.time() - _TRADES_WINDOW_SEC) * 1000)
+            since = window_start
+            if self._trades_high_watermark_ms:
+                since = max(self._trades_high_watermark_ms - _TRADES_OVERLAP_MS, window_start)
             
             trades = await self.executor.get_trade_history(
                 symbol=gate_symbol,
@@ -257,37 +380,36 @@ class ExchangeSyncManager:
                 limit=50
             )
             
-            self.trades = []
-            for trade in trades:
-                trade_time = trade.get("timestamp", 0)
-                trade_datetime = datetime.fromtimestamp(trade_time / 1000) if trade_time else None
-
-                amount_raw = float(trade.get("amount", 0) or 0)
-                amount = amount_raw
-                if self.config.market_type == "futures" and self.contract_size > 0:
-                    amount = amount_raw * self.contract_size
-                
-                self.trades.append({
-                    "id": trade.get("id", ""),
-                    "order_id": trade.get("order") or trade.get("order_id") or trade.get("orderId", ""),
-                    "time": trade_datetime.strftime("%Y-%m-%d %H:%M:%S") if trade_datetime else "",
-                    "timestamp": trade_time,
-                    "side": trade.get("side", ""),
-                    "price": float(trade.get("price", 0) or 0),
-                    "amount": amount,
-                    "cost": float(trade.get("cost", 0) or 0),
-                    "fee": float(trade.get("fee", {}).get("cost", 0) or 0),
-                    "fee_currency": trade.get("fee", {}).get("currency", ""),
-                })
+            # 期货成交数量为张数，换算为币数量
+            amount_factor = 1.0
+            if self.config.market_type == "futures" and self.contract_size > 0:
+                amount_factor = self.contract_size
+            known_ids = {t["id"] for t in self.trades}
+            new_trades = [
+                _build_trade(t, amount_factor) for t in trades
+                if t.get("id", "") not in known_ids
+            ]
             
-            self.trades.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
-            self.trades_updated_at = time.time()
+            # 无新成交且没有过期记录时沿用原列表对象
+            expired = bool(self.trades) and self.trades[-1]["timestamp"] < window_start
+            if new_trades or expired:
+                merged = [t for t in self.trades if t["timestamp"] >= window_start]
+                merged.extend(new_trades)
+                merged.sort(key=_BY_TIMESTAMP, reverse=True)
+                self.trades = merged[:_TRADES_MAX_KEEP]
+            
+            if new_trades:
+                self._trades_high_watermark_ms = max(
+                    self._trades_high_watermark_ms,
+                    max(t["timestamp"] for t in new_trades),
+                )
+            self.trades_updated_at = time.monotonic()
             
             if self.trades:
-                self.logger.debug(f"📜 成交记录同步: {len(self.trades)} 条")
+                self.logger.debug("📜 成交记录同步: %d 条", len(self.trades))
             
         except Exception as e:
-            self.logger.error(f"同步成交记录失败: {e}")
+            self.logger.error("同步成交记录失败: %s", e)
         
         return self.trades
     
@@ -297,12 +419,15 @@ class ExchangeSyncManager:
         
         这个方法可以在 dry_run 模式下调用，因为只需要市场信息不需要账户权限
         """
-        if self.contract_size > 0 and self.contract_size != 1.0:
+        gate_symbol = self._gate_symbol
+        if gate_symbol in self._contract_size_cache:
+            self.contract_size = await self._get_contract_size(gate_symbol)
             return self.contract_size
         
-        gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
         self.contract_size = await self._get_contract_size(gate_symbol)
-        self.logger.info(f"📐 合约大小: {self.contract_size} {self._get_base_symbol()}/张 ({gate_symbol})")
+        self.logger.info(
+            "📐 合约大小: %s %s/张 (%s)", self.contract_size, self._get_base_symbol(), gate_symbol
+        )
         return self.contract_size
     
     def _get_base_symbol(self) -> str:
@@ -314,36 +439,62 @@ class ExchangeSyncManager:
         return symbol
     
     async def _get_contract_size(self, gate_symbol: str) -> float:
-        """获取合约大小"""
-        if self.contract_size > 0 and self.contract_size != 1.0:
-            return self.contract_size
+        """获取合约大小（成功读取的值缓存 _CONTRACT_SIZE_TTL_SEC 秒，回退默认值不缓存）"""
+        cached = self._contract_size_cache.get(gate_symbol)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
         
+        lock = self._contract_size_locks.setdefault(gate_symbol, asyncio.Lock())
+        async with lock:
+            # 等锁期间可能已由其他协程加载完成
+            cached = self._contract_size_cache.get(gate_symbol)
+            if cached and cached[1] > time.monotonic():
+                return cached[0]
+            return await self._load_contract_size(gate_symbol)
+    
+    async def _load_contract_size(self, gate_symbol: str) -> float:
+        """从市场信息读取合约大小并写入缓存，失败时返回配置的默认值"""
         try:
             if not self.executor or not self.executor._exchange:
                 raise ValueError("交易所未初始化")
             
-            markets = self.executor._exchange.markets
+            exchange = self.executor._exchange
+            markets = exchange.markets
             if not markets:
-                await asyncio.get_event_loop().run_in_executor(
-                    None, self.executor._exchange.load_markets
-                )
-                markets = self.executor._exchange.markets
+                # 同步 ccxt 的 load_markets 会阻塞，放到工作线程执行
+                await asyncio.to_thread(exchange.load_markets)
+                markets = exchange.markets
             market = markets.get(gate_symbol, {})
             contract_size = market.get('contractSize', 0) or 0
             
             if contract_size > 0:
+                self._contract_size_cache[gate_symbol] = (
+                    contract_size, time.monotonic() + _CONTRACT_SIZE_TTL_SEC
+                )
                 return contract_size
             else:
                 raise ValueError(f"未找到合约 {gate_symbol} 的 contractSize")
         except Exception as e:
             default_size = getattr(self.config, 'default_contract_size', 1.0)
-            self.logger.warning(f"获取 contractSize 失败，使用配置值 {default_size}: {e}")
+            self.logger.warning("获取 contractSize 失败，使用配置值 %s: %s", default_size, e)
             return default_size
     
+    def invalidate_contract_size(self, symbol: Optional[str] = None) -> None:
+        """
+        清除合约大小缓存（如交易所重连、重新加载市场信息后）
+        
+        Args:
+            symbol: Gate 格式交易对，None 表示全部清除
+        """
+        if symbol is None:
+            self._contract_size_cache.clear()
+        else:
+            self._contract_size_cache.pop(symbol, None)
+    
     def get_exchange_min_contracts(self) -> float:
         """获取交易所最小下单张数"""
         try:
-            gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+            gate_symbol = self._gate_symbol
             markets = self.executor._exchange.markets if self.executor else {}
             if not markets:
                 return 1.0
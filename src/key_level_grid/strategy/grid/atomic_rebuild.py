@@ -13,11 +13,14 @@
 - 全部成功 → 更新本地状态
 """
 
+import asyncio
 import time
-import json
 import logging
+import os
+import random
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass, field
+from operator import itemgetter
 from pathlib import Path
 
 from key_level_grid.core.triggers import (
@@ -30,10 +33,14 @@ from key_level_grid.strategy.grid.level_lifecycle import (
     InheritanceResult,
     OrderRequest,
 )
+from key_level_grid.utils import fastjson
 
 
 logger = logging.getLogger(__name__)
 
+# 挂单字典的身份键（与 _order_request_to_dict 字段一致），用于集合查找
+_ORDER_KEY = itemgetter("price", "qty", "side", "level_id")
+
 
 @dataclass
 class AtomicRebuildResult:
@@ -75,7 +82,7 @@ class AtomicRebuildExecutor:
             executor: 交易所执行器 (支持 cancel_order, place_order)
             state_dir: 状态目录 (用于持久化迁移计划)
             max_retries: 最大重试次数
-            retry_delay_sec: 重试延迟 (秒)
+            retry_delay_sec: 首次重试延迟 (秒)，之后按指数退避
             config: 配置字典
         """
         self.executor = executor
@@ -84,6 +91,9 @@ class AtomicRebuildExecutor:
         self.retry_delay_sec = retry_delay_sec
         self.config = config or {}
         
+        # 撤单/挂单并发上限（低于交易所单接口限频）
+        self._concurrency = asyncio.Semaphore(int(self.config.get("rebuild_concurrency", 8)))
+        
         # 迁移计划文件
         self._migration_file = self.state_dir / "pending_migration.json"
         
@@ -126,7 +136,7 @@ class AtomicRebuildExecutor:
         )
         
         # 2. 持久化迁移计划 (崩溃恢复用)
-        self._save_migration()
+        await self._save_migration()
         
         result = AtomicRebuildResult(
             success=False,
@@ -162,7 +172,7 @@ class AtomicRebuildExecutor:
             self._pending.phase = RebuildPhase.COMPLETED
             
         except Exception as e:
-            logger.error(f"Atomic rebuild failed: {e}")
+            logger.error("Atomic rebuild failed: %s", e)
             result.phase = RebuildPhase.ALARM
             result.needs_alarm = True
             result.error_message = str(e)
@@ -171,10 +181,10 @@ class AtomicRebuildExecutor:
         finally:
             # 6. 清理迁移计划 (成功时)
             if result.success:
-                self._clear_migration()
+                await self._clear_migration()
             else:
                 # 失败时保留迁移计划，供恢复使用
-                self._save_migration()
+                await self._save_migration()
         
         return result
     
@@ -190,7 +200,7 @@ class AtomicRebuildExecutor:
             True if all cancels succeeded
         """
         self._pending.phase = RebuildPhase.CANCELLING
-        self._save_migration()
+        await self._save_migration()
         
         orders_to_cancel = self._pending.orders_to_cancel
         
@@ -198,20 +208,23 @@ class AtomicRebuildExecutor:
             logger.debug("No orders to cancel")
             return True
         
-        logger.info(f"Cancelling {len(orders_to_cancel)} orders...")
+        logger.info("Cancelling %d orders...", len(orders_to_cancel))
         
-        for order_id in orders_to_cancel:
-            success = await self._cancel_order_with_retry(symbol, order_id)
-            
-            if success:
+        outcomes = await asyncio.gather(
+            *(self._guarded_cancel(symbol, order_id) for order_id in orders_to_cancel),
+            return_exceptions=True,
+        )
+        
+        for order_id, success in zip(orders_to_cancel, outcomes):
+            if success is True:
                 result.orders_cancelled.append(order_id)
                 self._pending.orders_cancelled.append(order_id)
             else:
                 result.failed_cancels.append(order_id)
-                logger.error(f"Failed to cancel order {order_id}")
+                logger.error("Failed to cancel order %s", order_id)
         
         # 更新迁移计划
-        self._save_migration()
+        await self._save_migration()
         
         # 全部成功才继续
         return len(result.failed_cancels) == 0
@@ -228,7 +241,7 @@ class AtomicRebuildExecutor:
             True if all places succeeded
         """
         self._pending.phase = RebuildPhase.PLACING
-        self._save_migration()
+        await self._save_migration()
         
         orders_to_place = self._pending.orders_to_place
         
@@ -236,15 +249,15 @@ class AtomicRebuildExecutor:
             logger.debug("No orders to place")
             return True
         
-        logger.info(f"Placing {len(orders_to_place)} orders...")
+        logger.info("Placing %d orders...", len(orders_to_place))
         
-        for order_dict in orders_to_place:
-            new_order_id, success = await self._place_order_with_retry(
-                symbol,
-                order_dict["price"],
-                order_dict["qty"],
-                order_dict["side"],
-            )
+        outcomes = await asyncio.gather(
+            *(self._guarded_place(symbol, order_dict) for order_dict in orders_to_place),
+            return_exceptions=True,
+        )
+        
+        for order_dict, outcome in zip(orders_to_place, outcomes):
+            new_order_id, success = (None, False) if isinstance(outcome, BaseException) else outcome
             
             if success and new_order_id:
                 result.orders_placed.append(new_order_id)
@@ -252,14 +265,34 @@ class AtomicRebuildExecutor:
             else:
                 result.failed_places.append(order_dict)
                 self._pending.failed_orders.append(order_dict)
-                logger.error(f"Failed to place order at price {order_dict['price']}")
+                logger.error("Failed to place order at price %s", order_dict["price"])
         
         # 更新迁移计划
-        self._save_migration()
+        await self._save_migration()
         
         # 全部成功才算成功
         return len(result.failed_places) == 0
     
+    async def _guarded_cancel(self, symbol: str, order_id: str) -> bool:
+        """受并发上限约束的撤单"""
+        async with self._concurrency:
+            return await self._cancel_order_with_retry(symbol, order_id)
+    
+    async def _guarded_place(self, symbol: str, order_dict: Dict) -> Tuple[Optional[str], bool]:
+        """受并发上限约束的挂单"""
+        async with self._concurrency:
+            return await self._place_order_with_retry(
+                symbol,
+                order_dict["price"],
+                order_dict["qty"],
+                order_dict["side"],
+            )
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """第 attempt 次失败后的等待时间：指数退避 + 10% 随机抖动（避免批量失败后同时重试）"""
+        delay = self.retry_delay_sec * (2 ** attempt)
+        return delay + random.uniform(0, delay * 0.1)
+    
     async def _cancel_order_with_retry(
         self,
         symbol: str,
@@ -274,12 +307,12 @@ class AtomicRebuildExecutor:
         for attempt in range(self.max_retries):
             try:
                 await self.executor.cancel_order(symbol, order_id)
-                logger.debug(f"Cancelled order {order_id}")
+                logger.debug("Cancelled order %s", order_id)
                 return True
             except Exception as e:
-                logger.warning(f"Cancel attempt {attempt + 1} failed for {order_id}: {e}")
+                logger.warning("Cancel attempt %d failed for %s: %s", attempt + 1, order_id, e)
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay_sec)
+                    await asyncio.sleep(self._retry_delay(attempt))
         
         return False
     
@@ -304,12 +337,12 @@ class AtomicRebuildExecutor:
                     price=price,
                     amount=qty,
                 )
-                logger.debug(f"Placed order {order_id} at {price}")
+                logger.debug("Placed order %s at %s", order_id, price)
                 return order_id, True
             except Exception as e:
-                logger.warning(f"Place attempt {attempt + 1} failed at {price}: {e}")
+                logger.warning("Place attempt %d failed at %s: %s", attempt + 1, price, e)
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay_sec)
+                    await asyncio.sleep(self._retry_delay(attempt))
         
         return None, False
     
@@ -320,6 +353,10 @@ class AtomicRebuildExecutor:
         Args:
             result: 重构结果
         """
+        # 告警正文较长，无回调且 CRITICAL 级别未启用时不必拼接
+        if not self._alarm_callback and not logger.isEnabledFor(logging.CRITICAL):
+            return
+        
         message = f"""
 🚨 **网格重构告警 (ALARM)**
 
@@ -340,30 +377,34 @@ class AtomicRebuildExecutor:
             try:
                 self._alarm_callback(message)
             except Exception as e:
-                logger.error(f"Alarm callback failed: {e}")
+                logger.error("Alarm callback failed: %s", e)
     
-    def _save_migration(self) -> None:
-        """持久化迁移计划"""
+    async def _save_migration(self) -> None:
+        """持久化迁移计划（快照在事件循环内生成，写盘放到工作线程）"""
         if not self._pending:
             return
         
         try:
-            self.state_dir.mkdir(parents=True, exist_ok=True)
-            with open(self._migration_file, "w") as f:
-                json.dump(self._pending.to_dict(), f, indent=2)
-            logger.debug(f"Saved migration plan to {self._migration_file}")
+            await asyncio.to_thread(self._write_migration, self._pending.to_dict())
+            logger.debug("Saved migration plan to %s", self._migration_file)
         except Exception as e:
-            logger.error(f"Failed to save migration plan: {e}")
+            logger.error("Failed to save migration plan: %s", e)
+    
+    def _write_migration(self, payload: Dict) -> None:
+        """写入迁移计划（先写临时文件再原子替换，崩溃时不会留下半截文件）"""
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self._migration_file.with_suffix(".json.tmp")
+        tmp_file.write_bytes(fastjson.dumps(payload))
+        os.replace(tmp_file, self._migration_file)
     
-    def _clear_migration(self) -> None:
+    async def _clear_migration(self) -> None:
         """清理迁移计划"""
         try:
-            if self._migration_file.exists():
-                self._migration_file.unlink()
             self._pending = None
+            await asyncio.to_thread(self._migration_file.unlink, missing_ok=True)
             logger.debug("Cleared migration plan")
         except Exception as e:
-            logger.error(f"Failed to clear migration plan: {e}")
+            logger.error("Failed to clear migration plan: %s", e)
     
     def load_pending_migration(self) -> Optional[PendingMigration]:
         """
@@ -376,18 +417,17 @@ class AtomicRebuildExecutor:
             if not self._migration_file.exists():
                 return None
             
-            with open(self._migration_file) as f:
-                data = json.load(f)
+            data = fastjson.loads(self._migration_file.read_bytes())
             
             self._pending = PendingMigration.from_dict(data)
             
             if self._pending.is_incomplete():
-                logger.warning(f"Found incomplete migration at phase {self._pending.phase.value}")
+                logger.warning("Found incomplete migration at phase %s", self._pending.phase.value)
                 return self._pending
             
             return None
         except Exception as e:
-            logger.error(f"Failed to load migration plan: {e}")
+            logger.error("Failed to load migration plan: %s", e)
             return None
     
     async def resume_migration(self, symbol: str) -> Optional[AtomicRebuildResult]:
@@ -404,7 +444,7 @@ class AtomicRebuildExecutor:
         if not pending:
             return None
         
-        logger.warning(f"Resuming migration from phase {pending.phase.value}")
+        logger.warning("Resuming migration from phase %s", pending.phase.value)
         
         result = AtomicRebuildResult(
             success=False,
@@ -440,9 +480,10 @@ class AtomicRebuildExecutor:
                 
             elif pending.phase == RebuildPhase.PLACING:
                 # 继续挂单
+                failed_keys = {_ORDER_KEY(o) for o in pending.failed_orders}
                 remaining = [
                     o for o in pending.orders_to_place
-                    if o not in pending.failed_orders
+                    if _ORDER_KEY(o) not in failed_keys
                 ]
                 self._pending.orders_to_place = remaining
                 
@@ -462,10 +503,10 @@ class AtomicRebuildExecutor:
             # 成功完成
             result.success = True
             result.phase = RebuildPhase.COMPLETED
-            self._clear_migration()
+            await self._clear_migration()
             
         except Exception as e:
-            logger.error(f"Resume migration failed: {e}")
+            logger.error("Resume migration failed: %s", e)
             result.phase = RebuildPhase.ALARM
             result.needs_alarm = True
             result.error_message = str(e)
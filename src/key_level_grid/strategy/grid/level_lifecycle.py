@@ -8,8 +8,11 @@
 """
 
 import time
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Set
+
+import numpy as np
 
 from key_level_grid.core.state import (
     GridLevelState,
@@ -207,27 +210,75 @@ def inherit_levels_by_index(
 # 销毁保护机制
 # ============================================
 
+# 挂单价格索引: (升序价格列表, [(价格, 原序号, 订单 id)])
+_OrderPriceIndex = Tuple[List[float], List[Tuple[float, int, Any]]]
+
+
+def _build_order_price_index(exchange_orders: List[Dict[str, Any]]) -> _OrderPriceIndex:
+    """按价格升序索引交易所挂单（价格解析一次，供多个水位二分查找）"""
+    entries = []
+    for idx, order in enumerate(exchange_orders):
+        order_price = float(order.get("price", 0))
+        if order_price > 0:
+            entries.append((order_price, idx, order.get("id")))
+    entries.sort()
+    return [entry[0] for entry in entries], entries
+
+
+def _find_order_at_price(
+    index: _OrderPriceIndex,
+    price: float,
+    tolerance: float,
+) -> Optional[Tuple[float, Any]]:
+    """在索引中查找与 price 匹配的挂单，多个匹配时取原列表中靠前的一个"""
+    if price <= 0:
+        return None
+    prices, entries = index
+    # 候选窗口放宽一倍，边界上的浮点误差交给 price_matches 精确判断
+    lo = bisect_left(prices, price * (1 - 2 * tolerance))
+    hi = bisect_right(prices, price * (1 + 2 * tolerance))
+    best = None
+    for k in range(lo, hi):
+        entry = entries[k]
+        if price_matches(entry[0], price, tolerance) and (best is None or entry[1] < best[1]):
+            best = entry
+    if best is None:
+        return None
+    return best[0], best[2]
+
+
 def can_destroy_level(
     level: GridLevelState,
     exchange_orders: List[Dict[str, Any]],
     level_mapping: Dict[int, int],
     price_tolerance: float = 0.0001,
+    *,
+    order_index: Optional[_OrderPriceIndex] = None,
+    mapped_targets: Optional[Set[int]] = None,
 ) -> Tuple[bool, str]:
-    """检查水位是否可以销毁"""
+    """
+    检查水位是否可以销毁
+    
+    批量检查时可传入预先构建的 order_index / mapped_targets，避免每个水位重复扫描
+    """
     # 条件 1: fill_counter == 0
     if level.fill_counter > 0:
         return False, f"fill_counter={level.fill_counter}, 有未清仓持仓"
     
     # 条件 2: 交易所无该价位挂单
-    for order in exchange_orders:
-        order_price = float(order.get("price", 0))
-        if order_price > 0 and price_matches(order_price, level.price, price_tolerance):
-            return False, f"交易所存在挂单 {order.get('id')} @ {order_price}"
+    if order_index is None:
+        order_index = _build_order_price_index(exchange_orders)
+    matched = _find_order_at_price(order_index, level.price, price_tolerance)
+    if matched is not None:
+        order_price, order_id = matched
+        return False, f"交易所存在挂单 {order_id} @ {order_price}"
     
     # 条件 3: 无其他水位的卖单映射到此
-    for src_id, tgt_id in level_mapping.items():
-        if tgt_id == level.level_id:
-            return False, f"水位 L_{src_id} 的止盈仍映射到此"
+    if mapped_targets is None:
+        mapped_targets = set(level_mapping.values())
+    if level.level_id in mapped_targets:
+        src_id = next(k for k, v in level_mapping.items() if v == level.level_id)
+        return False, f"水位 L_{src_id} 的止盈仍映射到此"
     
     return True, "OK"
 
@@ -240,9 +291,14 @@ def process_retired_levels(
     destroyed = []
     remaining_retired = []
     
+    # 挂单索引与映射目标集合对所有退役水位共用
+    order_index = _build_order_price_index(exchange_orders)
+    mapped_targets = set(state.level_mapping.values())
+    
     for level in state.retired_levels:
         can_destroy, reason = can_destroy_level(
-            level, exchange_orders, state.level_mapping
+            level, exchange_orders, state.level_mapping,
+            order_index=order_index, mapped_targets=mapped_targets,
         )
         
         if can_destroy:
@@ -297,19 +353,19 @@ def rebuild_level_mapping(state: GridState) -> Dict[int, int]:
         state.resistance_levels_state + 
         [lvl for lvl in state.retired_levels if lvl.fill_counter > 0]
     )
-    sorted_levels = sorted(all_levels, key=lambda x: x.price)
+    n = len(all_levels)
+    prices = np.fromiter((lvl.price for lvl in all_levels), dtype=np.float64, count=n)
+    ids = np.fromiter((lvl.level_id for lvl in all_levels), dtype=np.int64, count=n)
+    fill_counters = np.fromiter((lvl.fill_counter for lvl in all_levels), dtype=np.int64, count=n)
     
-    mapping = {}
+    # 稳定排序保持同价水位的原有先后；每个水位的邻位即第一个价格 > price * 1.0001 的位置
+    order = np.argsort(prices, kind="stable")
+    prices_sorted = prices[order]
+    ids_sorted = ids[order]
+    adjacent = np.searchsorted(prices_sorted, prices_sorted * 1.0001, side="right")
     
-    for i, level in enumerate(sorted_levels):
-        if level.fill_counter <= 0:
-            continue
-        
-        for j in range(i + 1, len(sorted_levels)):
-            adjacent = sorted_levels[j]
-            if adjacent.price > level.price * 1.0001:
-                mapping[level.level_id] = adjacent.level_id
-                break
+    mask = (fill_counters[order] > 0) & (adjacent < n)
+    mapping = dict(zip(ids_sorted[mask].tolist(), ids_sorted[adjacent[mask]].tolist()))
     
     state.level_mapping = mapping
     logger.info(f"🔗 重建邻位映射: {len(mapping)} 个")
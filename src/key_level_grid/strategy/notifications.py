@@ -4,12 +4,42 @@
 封装 Telegram 通知逻辑，降低 strategy.py 复杂度
 """
 
+import asyncio
+import random
 import time
 from typing import Any, Dict, List, Optional
 
 from key_level_grid.utils.logger import get_logger
 
 
+# Telegram Bot 看门狗检查间隔（秒），亦为重连退避上限
+_TG_WATCHDOG_INTERVAL_SEC = 300.0
+# 重连退避基数（秒）与抖动比例
+_TG_BACKOFF_BASE_SEC = 1.0
+_TG_BACKOFF_JITTER = 0.3
+# 单次重启的超时预算（秒），超时按重连失败进入退避
+_TG_RESTART_TIMEOUT_SEC = 30.0
+
+# 网格重建通知合并窗口（秒）与单批最大条数
+_REBUILD_NOTIFY_WINDOW_SEC = 0.5
+_REBUILD_NOTIFY_MAX_BATCH = 32
+
+# 同类错误/告警的去重窗口（秒）：窗口内重复的只计数，下次发送时附带
+_ALERT_DEDUP_WINDOW_SEC = 60.0
+
+# 告警通知中堆栈的最大长度：保留末尾若干行（异常信息在最后）
+_ALERT_TRACEBACK_MAX_CHARS = 600
+_ALERT_TRACEBACK_MAX_LINES = 10
+
+
+def _shorten_traceback(traceback_text: str) -> str:
+    """截取堆栈末尾，短堆栈原样返回"""
+    if len(traceback_text) <= _ALERT_TRACEBACK_MAX_CHARS:
+        return traceback_text
+    tail = "\n".join(traceback_text.splitlines()[-_ALERT_TRACEBACK_MAX_LINES:])
+    return tail[-_ALERT_TRACEBACK_MAX_CHARS:]
+
+
 class NotificationHelper:
     """通知助手类"""
     
@@ -35,9 +65,19 @@ class NotificationHelper:
         self.get_display_data = get_display_data_func
         self.logger = get_logger(__name__)
         
-        # Telegram Bot 健康检查
+        # Telegram Bot 健康检查（独立看门狗任务）
         self._tg_bot = None
-        self._tg_bot_checked_at: float = 0
+        self._tg_bot_watchdog_task: Optional[asyncio.Task] = None
+        self._tg_reconnect_attempt: int = 0  # 连续重连失败次数
+        self._tg_next_retry_at: float = 0.0  # 下次允许重连的时间 (time.monotonic)
+        
+        # 网格重建通知队列：短时间内的多次重建合并为一条通知
+        self._notify_queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+        self._notify_worker_task: Optional[asyncio.Task] = None
+        
+        # 错误/告警去重：key -> 上次发送时间 (monotonic) / 被抑制次数
+        self._alert_last_sent: Dict[tuple, float] = {}
+        self._alert_suppressed: Dict[tuple, int] = {}
     
     def set_tg_bot(self, tg_bot):
         """设置 Telegram Bot 实例"""
@@ -94,9 +134,7 @@ class NotificationHelper:
                 "grid_floor": grid_cfg.get("grid_floor", 0),
                 "sell_quota_ratio": self.position_manager.grid_config.sell_quota_ratio,
             }
-            sl_cfg = getattr(self.position_manager, "stop_loss_config", None)
-            if sl_cfg:
-                grid_config["sl_pct"] = float(getattr(sl_cfg, "fixed_pct", 0) or 0) * 100
+            grid_config["sl_pct"] = self.position_manager.stop_loss_config.fixed_pct * 100
             
             resistance_levels = data.get("resistance_levels", [])
             support_levels = data.get("support_levels", [])
@@ -185,55 +223,197 @@ class NotificationHelper:
         new_anchor: float,
         new_orders: list,
     ) -> None:
-        """发送网格重建通知"""
+        """
+        发送网格重建通知（入队，由后台任务合并发送）
+        
+        new_orders 须为规范格式 [{"side": str, "price": float, "amount": float}]，
+        原样转交 NotificationManager，不再逐单重组字典
+        
+        合并窗口内的多次重建只发一条通知：锚点取首次旧锚点 → 末次新锚点，
+        挂单取最后一次重建的结果
+        """
         if not self.notifier:
             return
         
+        if self._notify_worker_task is None or self._notify_worker_task.done():
+            self._notify_worker_task = asyncio.create_task(self._notify_worker())
         try:
-            orders = [
-                {
-                    "side": o.get("side", "buy"),
-                    "price": o.get("price", 0),
-                    "amount": o.get("amount", 0),
-                }
-                for o in new_orders
-            ]
-            
-            await self.notifier.notify_grid_rebuild(
-                symbol=self.config.symbol,
-                reason=reason,
-                old_anchor=old_anchor,
-                new_anchor=new_anchor,
-                new_orders=orders,
-            )
-        except Exception as e:
-            self.logger.error(f"发送网格重建通知失败: {e}")
+            self._notify_queue.put_nowait((reason, old_anchor, new_anchor, new_orders))
+        except asyncio.QueueFull:
+            self.logger.warning("⚠️ 网格重建通知队列已满，丢弃本次通知")
     
-    async def check_telegram_bot(self) -> None:
-        """定期检查 Telegram Bot 状态"""
-        if time.time() - self._tg_bot_checked_at < 300:
+    async def _notify_worker(self) -> None:
+        """后台合并发送网格重建通知（合并窗口从本批首条事件起算）"""
+        queue = self._notify_queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + _REBUILD_NOTIFY_WINDOW_SEC
+            while len(batch) < _REBUILD_NOTIFY_MAX_BATCH:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._send_grid_rebuild_batch(batch)
+            except Exception as e:
+                self.logger.error(f"发送网格重建通知失败: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _send_grid_rebuild_batch(self, batch: List[tuple]) -> None:
+        """将一批重建事件合并为一条通知发送"""
+        reasons = list(dict.fromkeys(item[0] for item in batch))
+        reason = " / ".join(reasons)
+        if len(batch) > 1:
+            reason = f"{reason} (合并 {len(batch)} 次)"
+        old_anchor = batch[0][1]
+        new_anchor = batch[-1][2]
+        
+        await self.notifier.notify_grid_rebuild(
+            symbol=self.config.symbol,
+            reason=reason,
+            old_anchor=old_anchor,
+            new_anchor=new_anchor,
+            new_orders=batch[-1][3],
+        )
+    
+    async def stop_notify_worker(self, timeout_sec: float = 2.0) -> None:
+        """停止通知后台任务（先尽量发送完队列中的通知）"""
+        task = self._notify_worker_task
+        self._notify_worker_task = None
+        if not task or task.done():
             return
+        try:
+            await asyncio.wait_for(self._notify_queue.join(), timeout=timeout_sec)
+        except asyncio.TimeoutError:
+            pass
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    
+    def start_tg_bot_watchdog(self) -> None:
+        """启动 Telegram Bot 看门狗任务（已启动则忽略）"""
+        if not self._tg_bot:
+            return
+        if self._tg_bot_watchdog_task and not self._tg_bot_watchdog_task.done():
+            return
+        self._tg_bot_watchdog_task = asyncio.create_task(self._tg_bot_watchdog())
+    
+    async def stop_tg_bot_watchdog(self) -> None:
+        """停止 Telegram Bot 看门狗任务"""
+        task = self._tg_bot_watchdog_task
+        self._tg_bot_watchdog_task = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
+    async def _tg_bot_watchdog(self, interval_sec: float = _TG_WATCHDOG_INTERVAL_SEC) -> None:
+        """
+        每 interval_sec 秒检查一次 Bot 状态，主循环无需轮询
         
-        self._tg_bot_checked_at = time.time()
+        重连失败后按退避时间提前复查，退避上限为 interval_sec；退避已到期则按正常间隔
+        """
+        while True:
+            delay = interval_sec
+            if self._tg_reconnect_attempt:
+                remaining = self._tg_next_retry_at - time.monotonic()
+                if remaining > 0:
+                    delay = min(interval_sec, remaining)
+            await asyncio.sleep(delay)
+            try:
+                await self.check_telegram_bot()
+            except Exception as e:
+                self.logger.error(f"Telegram Bot 健康检查异常: {e}")
+    
+    def _tg_backoff_delay(self, error: Exception) -> float:
+        """
+        计算下次重连等待时间
         
+        - 429 限流: 直接使用交易所返回的 retry_after
+        - 其他错误: 指数退避 + ±30% 抖动，上限为看门狗间隔
+        """
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            if hasattr(retry_after, "total_seconds"):
+                retry_after = retry_after.total_seconds()
+            return float(retry_after)
+        
+        delay = min(
+            _TG_WATCHDOG_INTERVAL_SEC,
+            _TG_BACKOFF_BASE_SEC * (2 ** self._tg_reconnect_attempt),
+        )
+        return delay * (1 + random.uniform(-_TG_BACKOFF_JITTER, _TG_BACKOFF_JITTER))
+    
+    async def _restart_tg_bot(self) -> bool:
+        """重启 Bot（受退避时间约束），返回是否成功"""
+        if time.monotonic() < self._tg_next_retry_at:
+            return False
+        try:
+            await asyncio.wait_for(self._tg_bot.restart(), timeout=_TG_RESTART_TIMEOUT_SEC)
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.logger.warning(f"⚠️ Telegram Bot 重启超时 ({_TG_RESTART_TIMEOUT_SEC:.0f}s)")
+            delay = self._tg_backoff_delay(e)
+            self._tg_reconnect_attempt += 1
+            self._tg_next_retry_at = time.monotonic() + delay
+            self.logger.error(
+                f"Telegram Bot 重连失败 (第{self._tg_reconnect_attempt}次, {delay:.0f}s 后重试): {e}"
+            )
+            return False
+        self._tg_reconnect_attempt = 0
+        self._tg_next_retry_at = 0.0
+        return True
+    
+    async def check_telegram_bot(self) -> None:
+        """检查 Telegram Bot 状态，断开或长时间无指令时重启"""
         if not self._tg_bot:
             return
         
         try:
             if not self._tg_bot.is_running():
                 self.logger.warning("⚠️ Telegram Bot 已断开，正在重连...")
-                await self._tg_bot.restart()
-                self.logger.info("✅ Telegram Bot 重连成功")
+                if await self._restart_tg_bot():
+                    self.logger.info("✅ Telegram Bot 重连成功")
                 return
 
             last_ts = self._tg_bot.get_last_update_ts()
-            if last_ts and (time.time() - last_ts) > 600:
+            if last_ts and (time.monotonic() - last_ts) > 600:
                 self.logger.warning("⚠️ Telegram Bot 超过 10 分钟无指令，尝试重启")
-                await self._tg_bot.restart()
-                self.logger.info("✅ Telegram Bot 重启完成")
+                if await self._restart_tg_bot():
+                    self.logger.info("✅ Telegram Bot 重启完成")
+                return
+            
+            # Bot 已自行恢复：清除退避状态
+            self._tg_reconnect_attempt = 0
+            self._tg_next_retry_at = 0.0
         except Exception as e:
             self.logger.error(f"Telegram Bot 重连失败: {e}")
     
+    def _acquire_alert_slot(self, key: tuple) -> Optional[int]:
+        """
+        同类错误/告警去重
+        
+        Returns:
+            None 表示去重窗口内，本次不发送；否则返回上次发送以来被抑制的次数
+        """
+        now = time.monotonic()
+        last = self._alert_last_sent.get(key)
+        if last is not None and now - last < _ALERT_DEDUP_WINDOW_SEC:
+            self._alert_suppressed[key] = self._alert_suppressed.get(key, 0) + 1
+            return None
+        self._alert_last_sent[key] = now
+        return self._alert_suppressed.pop(key, 0)
+    
     async def notify_error(
         self,
         error_type: str,
@@ -241,10 +421,16 @@ class NotificationHelper:
         context: str = "",
         suggestion: str = "",
     ) -> None:
-        """发送错误通知"""
+        """发送错误通知（同类错误 60 秒内只发一次）"""
         if not self.notifier:
             return
         
+        suppressed = self._acquire_alert_slot(("error", error_type, context))
+        if suppressed is None:
+            return
+        if suppressed:
+            error_msg = f"{error_msg} (期间已抑制 {suppressed} 条重复)"
+        
         try:
             await self.notifier.notify_error(
                 error_type=error_type,
@@ -265,9 +451,15 @@ class NotificationHelper:
         suggestion: str = "",
         traceback_text: str = "",
     ) -> None:
-        """发送告警通知"""
+        """发送告警通知（同类告警 60 秒内只发一次）"""
         if not self.notifier:
             return
+        suppressed = self._acquire_alert_slot(("alert", error_type, error_code))
+        if suppressed is None:
+            return
+        if suppressed:
+            error_msg = f"{error_msg} (期间已抑制 {suppressed} 条重复)"
+        short_tb = _shorten_traceback(traceback_text)
         try:
             await self.notifier.notify_system_alert(
                 error_type=error_type,
@@ -275,7 +467,7 @@ class NotificationHelper:
                 error_msg=error_msg,
                 impact=impact,
                 suggestion=suggestion,
-                traceback_text=traceback_text[:600],
+                traceback_text=short_tb,
             )
         except Exception as e:
             self.logger.error(f"发送告警通知失败: {e}")
@@ -5,13 +5,23 @@ Recon/Event 双轨道模块
 """
 
 import asyncio
+import bisect
+import itertools
+import math
 import time
 from typing import Any, Dict, List, Optional, Set
 
+from key_level_grid.core.models import GatePositionView
 from key_level_grid.core.types import LevelStatus
+from key_level_grid.executor.base import Order, OrderSide, OrderType
 from key_level_grid.utils.logger import get_logger
 
 
+def _neg_price(lvl) -> float:
+    """降序水位列表的二分查找键"""
+    return -lvl.price
+
+
 class ReconEventManager:
     """
     Recon/Event 双轨道管理器
@@ -46,6 +56,8 @@ class ReconEventManager:
         self.trade_store = trade_store
         self.notifier = notifier
         self.logger = logger or get_logger(__name__)
+        # Gate 合约符号在策略生命周期内不变，构造时计算一次
+        self._gate_symbol = self._convert_to_gate_symbol(config.symbol)
         
         # Recon 状态
         self.recon_last_run_at: float = 0.0
@@ -61,6 +73,12 @@ class ReconEventManager:
         self._notify_order_filled_callback = None
         self._mark_level_filled_callback = None
         self._mark_level_idle_callback = None
+        
+        # 动作分发表: action -> handler
+        self._action_handlers = {
+            "place": self._handle_place_action,
+            "cancel": self._handle_cancel_action,
+        }
     
     def set_callbacks(
         self,
@@ -89,7 +107,7 @@ class ReconEventManager:
     def _get_exchange_min_contracts(self) -> float:
         """获取交易所最小下单张数"""
         try:
-            gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+            gate_symbol = self._gate_symbol
             markets = self.executor._exchange.markets if self.executor else {}
             if not markets:
                 return 1.0
@@ -102,7 +120,7 @@ class ReconEventManager:
     async def run_recon_track(
         self,
         current_state,
-        gate_position: Dict[str, Any],
+        gate_position: GatePositionView,
         gate_open_orders: List[Dict],
         gate_trades: List[Dict],
         contract_size: float,
@@ -116,7 +134,7 @@ class ReconEventManager:
         if not grid_created or not self.position_manager.state:
             return
 
-        now_ts = time.time()
+        now_ts = time.monotonic()
         grid_cfg = self.position_manager.grid_config
         if now_ts - self.recon_last_run_at < grid_cfg.recon_interval_sec:
             return
@@ -125,8 +143,8 @@ class ReconEventManager:
 
         async with self._grid_lock:
             # 更新持仓快照
-            holdings = float(gate_position.get("contracts", 0) or 0)
-            avg_entry = float(gate_position.get("entry_price", 0) or 0)
+            holdings = gate_position.contracts
+            avg_entry = gate_position.entry_price
             self.position_manager.update_position_snapshot(holdings, avg_entry)
             
             if self.position_manager.state:
@@ -300,8 +318,8 @@ class ReconEventManager:
         )
         if actions:
             self.logger.debug(
-                f"⚡ Event买成补卖: price={price:.2f}, qty={qty:.6f}, "
-                f"support_level_id={filled_support_level_id}"
+                "⚡ Event买成补卖: price=%.2f, qty=%.6f, support_level_id=%s",
+                price, qty, filled_support_level_id,
             )
         await self._execute_actions(actions)
         
@@ -350,7 +368,7 @@ class ReconEventManager:
         if self._mark_level_filled_callback:
             self._mark_level_filled_callback("sell", price)
         
-        self.logger.debug(f"⚡ Event卖成补买: price={price:.2f}")
+        self.logger.debug("⚡ Event卖成补买: price=%.2f", price)
         
         # 尝试挂回买单
         await self._handle_sell_rebuy(
@@ -395,9 +413,10 @@ class ReconEventManager:
             return
         
         state = self.position_manager.state
-        for lvl in state.support_levels_state:
-            if lvl.price >= current_price:
-                continue
+        levels = state.support_levels_state
+        # 支撑位按价格降序排列：二分跳过现价之上的水位，从最近的支撑位开始检查
+        start = bisect.bisect_right(levels, -current_price, key=_neg_price)
+        for lvl in itertools.islice(levels, start, None):
             if (
                 lvl.status == LevelStatus.IDLE
                 and current_price > lvl.price * (1 + state.buy_price_buffer_pct)
@@ -418,130 +437,141 @@ class ReconEventManager:
                     "reason": "event_rebuy",
                 }])
                 self.logger.debug(
-                    f"⚡ Event卖成补买: price={lvl.price:.2f}, qty={qty:.6f}"
+                    "⚡ Event卖成补买: price=%.2f, qty=%.6f", lvl.price, qty,
                 )
                 break
     
+    def _find_level_by_id(self, side: str, level_id: int):
+        """按 level_id 查找对应方向的水位"""
+        state = self.position_manager.state
+        if not state:
+            return None
+        levels = state.support_levels_state if side == "buy" else state.resistance_levels_state
+        for lvl in levels:
+            if lvl.level_id == level_id:
+                return lvl
+        return None
+    
     async def _execute_actions(self, actions: List[Dict[str, Any]]) -> None:
         """执行订单动作"""
         if not actions or not self.executor:
             return
         
-        from key_level_grid.executor.base import Order, OrderSide, OrderType
-        
-        gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+        gate_symbol = self._gate_symbol
+        handlers = self._action_handlers
         
         for action in actions:
-            act = action.get("action")
+            handler = handlers.get(action.get("action"))
+            if handler is None:
+                continue
             side = action.get("side", "buy")
-            price = float(action.get("price", 0) or 0)
-            qty = float(action.get("qty", 0) or 0)
-            level_id = action.get("level_id", 0)
-            reason = action.get("reason", "")
-            order_id = action.get("order_id", "")
+            # 水位在 await 期间不会被移除，动作开始前查找一次即可
+            lvl = self._find_level_by_id(side, action.get("level_id", 0))
             
             try:
-                if act == "place" and price > 0 and qty > 0:
-                    # 转换为张数
-                    contract_size = float(getattr(self.position_manager.state, "contract_size", 0) or 0)
-                    if contract_size > 0:
-                        import math
-                        contracts = math.ceil(qty / contract_size)
-                    else:
-                        contracts = qty
-                    
-                    order = Order.create(
-                        symbol=gate_symbol,
-                        side=OrderSide.BUY if side == "buy" else OrderSide.SELL,
-                        order_type=OrderType.LIMIT,
-                        quantity=contracts,
-                        price=price,
-                    )
-                    if side == "sell":
-                        order.reduce_only = True
-                    order.metadata["level_id"] = level_id
-                    order.metadata["reason"] = reason
-                    order.metadata["order_type"] = f"Recon-{side.upper()}"
-                    
-                    success = await self.executor.submit_order(order)
-                    if success:
-                        self.logger.info(
-                            f"✅ 挂单成功: {side.upper()} {contracts}张 @ {price:.2f}, "
-                            f"level_id={level_id}, reason={reason}"
-                        )
-                    else:
-                        self.logger.warning(
-                            f"⚠️ 挂单失败: {side.upper()} {contracts}张 @ {price:.2f}, "
-                            f"level_id={level_id}, reason={reason}"
-                        )
-                    
-                    # 更新水位状态
-                    if self.position_manager.state:
-                        levels = (
-                            self.position_manager.state.support_levels_state
-                            if side == "buy"
-                            else self.position_manager.state.resistance_levels_state
-                        )
-                        for lvl in levels:
-                            if lvl.level_id == level_id:
-                                if success:
-                                    lvl.status = LevelStatus.ACTIVE
-                                    # 从 Order 对象获取 exchange_order_id，而非从返回值
-                                    lvl.order_id = order.exchange_order_id or ""
-                                    lvl.active_order_id = lvl.order_id
-                                    lvl.open_qty = qty
-                                else:
-                                    lvl.status = LevelStatus.IDLE
-                                    lvl.last_error = "submit_failed"
-                                lvl.last_action_ts = int(time.time())
-                                break
-                
-                elif act == "cancel" and order_id:
-                    # 创建 Order 对象用于取消
-                    cancel_order = Order.create(
-                        symbol=gate_symbol,
-                        side=OrderSide.BUY if side == "buy" else OrderSide.SELL,
-                        order_type=OrderType.LIMIT,
-                        quantity=0.0,
-                        price=0.0,
-                    )
-                    cancel_order.exchange_order_id = order_id
-                    cancel_order.metadata["reason"] = reason
-                    cancel_order.metadata["side"] = side
-                    cancel_order.metadata["price"] = price
-                    
-                    success = await self.executor.cancel_order(cancel_order)
-                    if success:
-                        self.logger.info(
-                            f"🗑️ 撤单成功: {side.upper()} @ {price:.2f}, "
-                            f"order_id={order_id}, reason={reason}"
-                        )
-                    else:
-                        self.logger.warning(
-                            f"⚠️ 撤单失败: {side.upper()} @ {price:.2f}, "
-                            f"order_id={order_id}, reason={reason}"
-                        )
-                    
-                    # 更新水位状态
-                    if self.position_manager.state:
-                        levels = (
-                            self.position_manager.state.support_levels_state
-                            if side == "buy"
-                            else self.position_manager.state.resistance_levels_state
-                        )
-                        for lvl in levels:
-                            if lvl.level_id == level_id:
-                                lvl.status = LevelStatus.IDLE if success else LevelStatus.CANCELING
-                                if success:
-                                    lvl.order_id = ""
-                                    lvl.active_order_id = ""
-                                    lvl.open_qty = 0
-                                lvl.last_action_ts = int(time.time())
-                                break
-            
+                await handler(action, gate_symbol, side, lvl)
             except Exception as e:
                 self.logger.error(f"执行动作失败: {action}, 错误: {e}")
     
+    async def _handle_place_action(
+        self,
+        action: Dict[str, Any],
+        gate_symbol: str,
+        side: str,
+        lvl,
+    ) -> None:
+        """执行挂单动作"""
+        price = float(action.get("price", 0) or 0)
+        qty = float(action.get("qty", 0) or 0)
+        if price <= 0 or qty <= 0:
+            return
+        level_id = action.get("level_id", 0)
+        reason = action.get("reason", "")
+        
+        # 转换为张数
+        contract_size = float(getattr(self.position_manager.state, "contract_size", 0) or 0)
+        if contract_size > 0:
+            contracts = math.ceil(qty / contract_size)
+        else:
+            contracts = qty
+        
+        order = Order.create(
+            symbol=gate_symbol,
+            side=OrderSide.BUY if side == "buy" else OrderSide.SELL,
+            order_type=OrderType.LIMIT,
+            quantity=contracts,
+            price=price,
+        )
+        if side == "sell":
+            order.reduce_only = True
+        order.metadata["level_id"] = level_id
+        order.metadata["reason"] = reason
+        order.metadata["order_type"] = f"Recon-{side.upper()}"
+        
+        success = await self.executor.submit_order(order)
+        if success:
+            self.logger.info(
+                f"✅ 挂单成功: {side.upper()} {contracts}张 @ {price:.2f}, "
+                f"level_id={level_id}, reason={reason}"
+            )
+        else:
+            self.logger.warning(
+                f"⚠️ 挂单失败: {side.upper()} {contracts}张 @ {price:.2f}, "
+                f"level_id={level_id}, reason={reason}"
+            )
+        
+        # 更新水位状态
+        if lvl:
+            if success:
+                lvl.status = LevelStatus.ACTIVE
+                # 从 Order 对象获取 exchange_order_id，而非从返回值
+                lvl.order_id = order.exchange_order_id or ""
+                lvl.active_order_id = lvl.order_id
+                lvl.open_qty = qty
+            else:
+                lvl.status = LevelStatus.IDLE
+                lvl.last_error = "submit_failed"
+            lvl.last_action_ts = int(time.time())
+    
+    async def _handle_cancel_action(
+        self,
+        action: Dict[str, Any],
+        gate_symbol: str,
+        side: str,
+        lvl,
+    ) -> None:
+        """执行撤单动作"""
+        order_id = action.get("order_id", "")
+        if not order_id:
+            return
+        price = float(action.get("price", 0) or 0)
+        reason = action.get("reason", "")
+        
+        success = await self.executor.cancel_order_by_id(
+            order_id,
+            gate_symbol,
+            {"reason": reason, "side": side, "price": price},
+        )
+        if success:
+            self.logger.info(
+                f"🗑️ 撤单成功: {side.upper()} @ {price:.2f}, "
+                f"order_id={order_id}, reason={reason}"
+            )
+        else:
+            self.logger.warning(
+                f"⚠️ 撤单失败: {side.upper()} @ {price:.2f}, "
+                f"order_id={order_id}, reason={reason}"
+            )
+        
+        # 更新水位状态
+        if lvl:
+            lvl.status = LevelStatus.IDLE if success else LevelStatus.CANCELING
+            if success:
+                lvl.order_id = ""
+                lvl.active_order_id = ""
+                lvl.open_qty = 0
+            lvl.last_action_ts = int(time.time())
+    
     async def reset_fill_counters(self, reason: str = "manual") -> bool:
         """重置持仓计数器"""
         if not self.position_manager.state:
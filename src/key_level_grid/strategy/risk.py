@@ -8,6 +8,7 @@ import time
 import uuid
 from typing import Any, Dict, Optional
 
+from key_level_grid.core.models import GatePositionView
 from key_level_grid.utils.logger import get_logger
 
 
@@ -43,12 +44,14 @@ class RiskManager:
         self.position_manager = position_manager
         self.notifier = notifier
         self.logger = logger or get_logger(__name__)
+        # Gate 合约符号在策略生命周期内不变，构造时计算一次
+        self._gate_symbol = self._convert_to_gate_symbol(config.symbol)
         
         # 止损单状态
         self.stop_loss_order_id: Optional[str] = None
         self.stop_loss_contracts: float = 0
         self.stop_loss_trigger_price: float = 0
-        self.sl_order_updated_at: float = 0
+        self.sl_order_updated_at: float = 0  # monotonic 时间，仅用于冷却计算
         self.sl_synced_from_exchange: bool = False
         self.sl_last_entry_price: float = 0
     
@@ -62,14 +65,14 @@ class RiskManager:
     
     async def check_and_update_stop_loss(
         self,
-        gate_position: Dict[str, Any],
+        gate_position: GatePositionView,
         contract_size: float,
     ) -> None:
         """
         检查并更新止损单
         
         Args:
-            gate_position: Gate 持仓数据
+            gate_position: Gate 持仓视图
             contract_size: 合约大小
         """
         if self.config.dry_run or not self.executor:
@@ -81,24 +84,24 @@ class RiskManager:
             return
         
         # 获取当前持仓张数
-        current_contracts = int(float(gate_position.get("raw_contracts", 0) or 0))
+        current_contracts = gate_position.raw_contracts
         
         # 获取网格底线（止损价）
         grid_floor = self.position_manager.state.grid_floor if self.position_manager.state else 0
-        sl_cfg = getattr(self.position_manager, "stop_loss_config", None)
-        if sl_cfg and getattr(sl_cfg, "trigger", "") == "fixed_pct":
-            avg_entry = float(gate_position.get("entry_price", 0) or 0)
-            fixed_pct = float(getattr(sl_cfg, "fixed_pct", 0) or 0)
+        sl_cfg = self.position_manager.stop_loss_config
+        if sl_cfg.trigger == "fixed_pct":
+            avg_entry = gate_position.entry_price
+            fixed_pct = sl_cfg.fixed_pct
             if avg_entry > 0 and fixed_pct > 0:
                 grid_floor = avg_entry * (1 - fixed_pct)
         
         self.logger.debug(
-            f"止损单检查: current_contracts={current_contracts}, grid_floor={grid_floor}, "
-            f"sl_order_id={self.stop_loss_order_id}, sl_contracts={self.stop_loss_contracts}"
+            "止损单检查: current_contracts=%d, grid_floor=%s, sl_order_id=%s, sl_contracts=%s",
+            current_contracts, grid_floor, self.stop_loss_order_id, self.stop_loss_contracts,
         )
         
         if grid_floor <= 0:
-            self.logger.warning(f"⚠️ 网格底线无效 (grid_floor={grid_floor})，跳过止损单更新")
+            self.logger.warning("⚠️ 网格底线无效 (grid_floor=%s)，跳过止损单更新", grid_floor)
             return
         
         # 情况1: 无持仓，但有止损单 → 取消止损单
@@ -126,27 +129,28 @@ class RiskManager:
 
         # 情况3: 有持仓，持仓张数未变化且已有止损单 → 无需更新
         if current_contracts == self.stop_loss_contracts and self.stop_loss_order_id:
-            self.logger.debug(f"止损单无需更新: {current_contracts}张 @ {grid_floor:.2f}")
+            self.logger.debug("止损单无需更新: %d张 @ %.2f", current_contracts, grid_floor)
             return
         
         # 防止短时间内重复提交（30秒冷却）
-        if self.sl_order_updated_at > 0 and (time.time() - self.sl_order_updated_at) < 30:
+        if self.sl_order_updated_at > 0 and (time.monotonic() - self.sl_order_updated_at) < 30:
             self.logger.debug("止损单冷却中，跳过本次更新")
             return
         
         # 情况4: 有持仓，持仓变化或无止损单 → 创建/更新止损单
         self.logger.info(
-            f"🛡️ 准备更新止损单: {self.stop_loss_contracts}张 → {current_contracts}张 @ {grid_floor:.2f}"
+            "🛡️ 准备更新止损单: %s张 → %d张 @ %.2f",
+            self.stop_loss_contracts, current_contracts, grid_floor,
         )
         
         # 先取消旧止损单
         old_order_id = self.stop_loss_order_id
         if old_order_id:
-            self.logger.info(f"🔄 取消旧止损单: ID={old_order_id}")
+            self.logger.info("🔄 取消旧止损单: ID=%s", old_order_id)
             await self._cancel_stop_loss_order_on_exchange(old_order_id)
         
         # 提交新止损单
-        self.logger.info(f"📤 开始提交新止损单: {current_contracts}张 @ {grid_floor:.2f}")
+        self.logger.info("📤 开始提交新止损单: %d张 @ %.2f", current_contracts, grid_floor)
         success = await self._submit_stop_loss_order(
             current_contracts, grid_floor, gate_position, contract_size
         )
@@ -157,7 +161,7 @@ class RiskManager:
         self,
         contracts: int,
         trigger_price: float,
-        gate_position: Dict[str, Any],
+        gate_position: GatePositionView,
         contract_size: float,
     ) -> bool:
         """提交止损单"""
@@ -166,7 +170,7 @@ class RiskManager:
         if contracts <= 0 or trigger_price <= 0:
             return False
         
-        gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+        gate_symbol = self._gate_symbol
         
         try:
             sl_order = Order(
@@ -179,7 +183,7 @@ class RiskManager:
                 reduce_only=True,
             )
             
-            sl_order.metadata['order_mode'] = 'trigger'
+            sl_order.order_mode = 'trigger'
             sl_order.metadata['triggerPrice'] = trigger_price
             sl_order.metadata['rule'] = 2  # <= (价格跌破触发)
             sl_order.metadata['is_stop_loss'] = True
@@ -201,8 +205,8 @@ class RiskManager:
                 self.stop_loss_order_id = str(order_id) if order_id else "pending"
                 self.stop_loss_contracts = contracts
                 self.stop_loss_trigger_price = trigger_price
-                self.sl_order_updated_at = time.time()
-                self.sl_last_entry_price = float(gate_position.get('entry_price', 0) or 0)
+                self.sl_order_updated_at = time.monotonic()
+                self.sl_last_entry_price = gate_position.entry_price
                 self.logger.info(f"✅ 止损单提交成功: ID={self.stop_loss_order_id}")
                 return True
             else:
@@ -218,7 +222,7 @@ class RiskManager:
         if not order_id or order_id == "pending":
             return True
         
-        gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+        gate_symbol = self._gate_symbol
         
         try:
             if hasattr(self.executor, 'cancel_plan_order'):
@@ -255,14 +259,14 @@ class RiskManager:
             return
         
         try:
-            symbol = self._convert_to_gate_symbol(self.config.symbol)
+            symbol = self._gate_symbol
             plan_orders = await self.executor.get_plan_orders(symbol, status='open')
             
             if not plan_orders:
                 self.logger.info("📊 启动同步: 交易所无现有止损单")
                 return
             
-            self.logger.debug(f"📊 获取到 {len(plan_orders)} 个计划委托")
+            self.logger.debug("📊 获取到 %d 个计划委托", len(plan_orders))
             
             for order in plan_orders:
                 order_id = str(order.get('id', ''))
@@ -277,8 +281,8 @@ class RiskManager:
                 trigger_price = float(trigger_info.get('price', 0) if isinstance(trigger_info, dict) else 0)
                 
                 self.logger.debug(
-                    f"📊 检查订单: id={order_id}, size_raw={size_raw}, "
-                    f"is_sell={is_sell}, trigger_price={trigger_price}"
+                    "📊 检查订单: id=%s, size_raw=%s, is_sell=%s, trigger_price=%s",
+                    order_id, size_raw, is_sell, trigger_price,
                 )
                 
                 if is_sell and size > 0:
@@ -318,7 +322,7 @@ class RiskManager:
     
     async def check_stop_loss_triggered(
         self,
-        gate_position: Dict[str, Any],
+        gate_position: GatePositionView,
     ) -> Optional[Dict[str, Any]]:
         """
         检测止损单是否被触发执行
@@ -333,7 +337,7 @@ class RiskManager:
             return None
         
         try:
-            symbol = self._convert_to_gate_symbol(self.config.symbol)
+            symbol = self._gate_symbol
             plan_orders = await self.executor.get_plan_orders(symbol, status='finished')
             
             for order in plan_orders:
@@ -346,9 +350,9 @@ class RiskManager:
                         trigger_info_data = order.get('trigger', {})
                         trigger_price = float(trigger_info_data.get('price', 0) if isinstance(trigger_info_data, dict) else 0)
                         contracts = abs(int(order.get('size', 0)))
-                        contract_size = float(gate_position.get('contract_size', 0.0001) or 0.0001)
+                        contract_size = gate_position.contract_size or 0.0001
                         
-                        entry_price = self.sl_last_entry_price or float(gate_position.get('entry_price', 0) or 0)
+                        entry_price = self.sl_last_entry_price or gate_position.entry_price
                         
                         triggered_info = None
                         if entry_price > 0 and trigger_price > 0:
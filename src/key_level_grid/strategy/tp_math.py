@@ -0,0 +1,112 @@
+"""
+止盈/挂单数值计算模块
+
+将止盈挂单规划、挂单去重中的纯数值部分抽离为独立函数，便于 Numba 编译
+"""
+
+import bisect
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+from key_level_grid.utils.njit import njit
+
+
+@njit(cache=True)
+def compute_tp_plan(
+    max_position_usdt: float,
+    avg_entry: float,
+    contract_size: float,
+    num_grids: int,
+    position_contracts: int,
+    resistance_prices: np.ndarray,
+) -> Tuple[int, int, int, np.ndarray]:
+    """
+    计算止盈计划
+
+    Args:
+        max_position_usdt: 最大仓位 (USDT)
+        avg_entry: 持仓均价
+        contract_size: 合约大小
+        num_grids: 网格总数
+        position_contracts: 当前持仓张数
+        resistance_prices: 有效阻力位价格 (float64，按价格升序)
+
+    Returns:
+        (每档张数, 已成交网格数, 止盈档数, 选中的止盈价格)
+    """
+    total_contracts = 0
+    if contract_size > 0 and avg_entry > 0:
+        total_contracts = int(max_position_usdt / (avg_entry * contract_size))
+
+    per_grid_contracts = 1
+    if total_contracts > 0 and num_grids > 0:
+        per_grid_contracts = max(1, int(total_contracts / num_grids))
+
+    # 已成交网格数，上限为网格总数
+    filled_grids = int(math.ceil(position_contracts / per_grid_contracts))
+    if num_grids > 0 and filled_grids > num_grids:
+        filled_grids = num_grids
+
+    # 止盈档数 = 已成交网格数（受可用阻力位数量限制）
+    num_tp_levels = min(filled_grids, resistance_prices.shape[0])
+    return per_grid_contracts, filled_grids, num_tp_levels, resistance_prices[:num_tp_levels]
+
+
+def near_price_mask(
+    prices: np.ndarray,
+    existing_prices: np.ndarray,
+    tolerance: float = 0.001,
+    presorted: bool = False,
+) -> np.ndarray:
+    """
+    判断每个价格附近是否已有挂单
+
+    对已有价格排序后二分查找，等价于
+    any(abs(p - e) / p < tolerance for e in existing_prices)，
+    复杂度由 O(N*M) 降为 O((N+M) log M)。
+
+    Args:
+        prices: 待检查价格 (float64)
+        existing_prices: 已有挂单价格 (float64，无需有序)
+        tolerance: 相对容差
+        presorted: existing_prices 是否已按升序排列
+
+    Returns:
+        与 prices 等长的布尔掩码
+    """
+    if existing_prices.size == 0:
+        return np.zeros(prices.shape[0], dtype=bool)
+    existing = existing_prices if presorted else np.sort(existing_prices)
+    band = prices * tolerance
+    # 第一个严格大于 p - band 的已有价格，若也严格小于 p + band 即命中
+    lo = np.searchsorted(existing, prices - band, side="right")
+    candidate = existing[np.minimum(lo, existing.size - 1)]
+    return (lo < existing.size) & (candidate < prices + band)
+
+
+def has_near_price(sorted_prices: List[float], price: float, tolerance: float = 0.001) -> bool:
+    """
+    判断升序价格列表中是否有价格落在 price 的相对容差内
+
+    bisect 定位后只需比较左右两个邻居，O(log N)。
+
+    Args:
+        sorted_prices: 升序价格列表（价格或整数分均可，与 price 同单位）
+        price: 待检查价格
+        tolerance: 相对容差
+
+    Returns:
+        True 如果存在 |p - price| / price < tolerance 的价格
+    """
+    band = price * tolerance
+    i = bisect.bisect_left(sorted_prices, price)
+    if i < len(sorted_prices) and sorted_prices[i] - price < band:
+        return True
+    return i > 0 and price - sorted_prices[i - 1] < band
+
+
+def price_to_cents(price: float) -> int:
+    """价格量化为整数分（两位小数），用作去重键"""
+    return int(price * 100 + 0.5)
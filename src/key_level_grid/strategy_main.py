@@ -5,15 +5,22 @@
 """
 
 import asyncio
+import bisect
+import logging
+import math
 import os
 import time
+import traceback
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import yaml
 
 from key_level_grid.utils.logger import get_logger
+from key_level_grid.executor.base import Order, OrderSide, OrderType
 from key_level_grid.executor.gate_executor import GateExecutor
+from key_level_grid.executor.order_pool import OrderPool
 from key_level_grid.utils.config import SafetyConfig
 from key_level_grid.breakout_filter import (
     BreakoutFilter,
@@ -24,17 +31,27 @@ from key_level_grid.indicator import IndicatorConfig, KeyLevelGridIndicator
 from key_level_grid.signal import SignalConfig, KeyLevelSignal, KeyLevelSignalGenerator
 from key_level_grid.gate_kline_feed import GateKlineFeed
 from key_level_grid.models import Kline, KlineFeedConfig, Timeframe, KeyLevelGridState
+from key_level_grid.core.models import GatePositionView
 from key_level_grid.mtf_manager import MultiTimeframeManager
 from key_level_grid.utils.trade_store import TradeStore
 from key_level_grid.position import (
     GridConfig, StopLossConfig, TakeProfitConfig, ResistanceConfig, ActiveFill,
-    PositionConfig, KeyLevelPositionManager
+    PositionConfig, KeyLevelPositionManager, LevelStatus
 )
 from key_level_grid.strategy.display import DisplayDataGenerator
 from key_level_grid.strategy.notifications import NotificationHelper
 from key_level_grid.strategy.exchange_sync import ExchangeSyncManager
 from key_level_grid.strategy.risk import RiskManager
 from key_level_grid.strategy.recon import ReconEventManager
+from key_level_grid.strategy.tp_math import (
+    compute_tp_plan,
+    has_near_price,
+    near_price_mask,
+    price_to_cents,
+)
+
+
+_INFO = logging.INFO
 
 
 @dataclass
@@ -47,6 +64,8 @@ class KeyLevelGridConfig:
     margin_mode: str = "cross"    # cross (全仓) / isolated (逐仓)
     leverage: int = 3             # 杠杆倍数
     default_contract_size: float = 1.0  # 合约大小后备值（仅当 API 获取失败时使用）
+    max_concurrent_orders: int = 8      # 批量挂单时同时在途的最大请求数
+    use_ws_orders: bool = False         # 限价单走 WebSocket 下单通道（实验性）
     
     # API 配置 (环境变量名)
     api_key_env: str = ""
@@ -107,6 +126,8 @@ class KeyLevelGridStrategy:
     def __init__(self, config: KeyLevelGridConfig):
         self.config = config
         self.logger = get_logger(__name__)
+        # 交易对在运行期不变，Gate 符号只需转换一次
+        self._gate_symbol = self._convert_to_gate_symbol(config.symbol)
         
         # 初始化子模块
         self.kline_feed = GateKlineFeed(config.kline_config)
@@ -147,11 +168,11 @@ class KeyLevelGridStrategy:
         # Telegram 通知（先初始化，供执行器挂钩使用）
         self._notifier: Optional["NotificationManager"] = None
         self._tg_bot = None  # Telegram Bot 实例
-        self._tg_bot_checked_at: float = 0  # Bot 健康检查时间戳
         self._config_path: Optional[str] = None
         
         # 初始化交易所执行器 (Gate)
         self._executor: Optional[GateExecutor] = None
+        self._order_pool = OrderPool()  # 批量挂单复用的 Order 对象池
         self._init_executor()
         
         # 账户余额缓存
@@ -160,24 +181,28 @@ class KeyLevelGridStrategy:
         
         # Gate 挂单缓存
         self._gate_open_orders: List[Dict] = []
+        self._gate_buy_prices: List[float] = []   # 买单价格（升序）
+        self._gate_sell_prices: List[float] = []  # 卖单价格（升序）
+        self._gate_sell_contracts: float = 0.0    # 卖单剩余张数合计
         self._orders_updated_at: float = 0
-        # 最近一次获取到的合约大小（BTC/contract）
-        self._contract_size: float = 1.0
+        # 最近一次获取到的合约大小（BTC/contract），交易所同步前使用配置后备值
+        self._contract_size: float = config.default_contract_size
         
         # Gate 持仓缓存
         self._gate_position: Dict[str, Any] = {}  # 当前持仓
+        self._gate_position_view: GatePositionView = GatePositionView()  # 当前持仓（类型化视图）
         self._position_updated_at: float = 0
         self._last_position_usdt: float = 0  # 上次持仓价值（用于检测变化）
         self._last_position_contracts: Optional[int] = None  # 上次持仓张数（None 表示未初始化）
         self._tp_orders_submitted: bool = False  # 止盈单是否已提交
         self._need_rebuild_after_fill: bool = False  # 兼容保留
-        self._last_fill_at: float = 0  # 上次成交时间（用于成交后延迟重建）
+        self._last_fill_at: float = 0  # 上次成交时间（monotonic，用于成交后延迟重建）
         
         # 止损单状态
         self._stop_loss_order_id: Optional[str] = None  # 当前止损单 ID
         self._stop_loss_contracts: float = 0  # 止损单覆盖的张数
         self._stop_loss_trigger_price: float = 0  # 止损单实际触发价（从交易所同步）
-        self._sl_order_updated_at: float = 0  # 止损单更新时间
+        self._sl_order_updated_at: float = 0  # 止损单更新时间（monotonic，仅用于冷却计算）
         self._sl_synced_from_exchange: bool = False  # 是否已从交易所同步止损单
         self._sl_last_entry_price: float = 0  # 止损前的入场价（用于计算亏损）
         
@@ -196,6 +221,9 @@ class KeyLevelGridStrategy:
         self._recon_last_run_at: float = 0.0
         self._grid_lock_until: float = 0.0
         self._grid_lock = asyncio.Lock()
+        # 状态持久化去抖：Telegram 设置类命令只标记脏位，由后台任务合并落盘
+        self._state_dirty = asyncio.Event()
+        self._state_flush_task: Optional[asyncio.Task] = None
         self._last_trade_ids: set = set()
         self._last_position_btc: Optional[float] = None
         self._last_position_avg_price: float = 0.0
@@ -270,11 +298,7 @@ class KeyLevelGridStrategy:
         
         # 根据策略配置推导一个更合理的单笔最大金额（用于执行器安全检查）
         # 说明：默认 SafetyConfig.max_position_value=100，会拦截网格策略的正常挂单
-        try:
-            pos_cfg = self.position_manager.position_config
-            max_position_usdt = float(getattr(pos_cfg, "max_position_usdt", 0) or 0)
-        except Exception:
-            max_position_usdt = 0.0
+        max_position_usdt = float(self.position_manager.position_config.max_position_usdt)
 
         safety_config = SafetyConfig(
             # 单笔最大金额：允许至少覆盖“最大仓位/网格数”的量级，这里取 max_position_usdt 作为上限更直观
@@ -292,6 +316,7 @@ class KeyLevelGridStrategy:
                 api_secret=api_secret,
                 paper_trading=False,
                 safety_config=safety_config,
+                use_ws_orders=config.use_ws_orders,
             )
         else:
             self.logger.warning(
@@ -639,6 +664,8 @@ class KeyLevelGridStrategy:
             margin_mode=trading.get('margin_mode', 'cross'),
             leverage=trading.get('leverage', 3),
             default_contract_size=trading.get('default_contract_size', 1.0),
+            max_concurrent_orders=trading.get('max_concurrent_orders', 8),
+            use_ws_orders=trading.get('use_ws_orders', False),
             api_key_env=api_config.get('key_env', ''),
             api_secret_env=api_config.get('secret_env', ''),
             kline_config=kline_config,
@@ -685,7 +712,6 @@ class KeyLevelGridStrategy:
     
     async def start(self) -> None:
         """启动策略"""
-        import time
         if self._running:
             self.logger.warning("策略已在运行")
             return
@@ -707,7 +733,7 @@ class KeyLevelGridStrategy:
         # 启动时设置保证金模式和杠杆（非 dry_run 模式）
         if not self.config.dry_run and self._executor:
             try:
-                gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+                gate_symbol = self._gate_symbol
                 margin_mode = self.config.margin_mode
                 leverage = self.config.leverage
                 self.logger.info(f"🔧 启动时设置保证金模式: {margin_mode}, 杠杆: {leverage}x")
@@ -725,6 +751,8 @@ class KeyLevelGridStrategy:
             try:
                 await self._tg_bot.start()
                 self.logger.info("📱 Telegram Bot 已启动，可响应命令")
+                # Bot 健康检查由看门狗任务每 5 分钟执行
+                self._notification_helper.start_tg_bot_watchdog()
             except Exception as e:
                 self.logger.error(f"Telegram Bot 启动失败: {e}")
         
@@ -754,12 +782,11 @@ class KeyLevelGridStrategy:
                 self.logger.error(f"策略更新异常: {e}", exc_info=True)
                 # 发送错误通知
                 await self._notification_helper.notify_error("StrategyError", str(e), "主循环更新")
-                import traceback
                 await self._notification_helper.notify_alert(
                     error_type="StrategyError",
                     error_msg=str(e),
                     impact="主循环更新异常，可能影响挂单与止损维护",
-                    traceback_text="".join(traceback.format_exc(limit=4)),
+                    traceback_text=traceback.format_exc(limit=4),
                 )
                 await asyncio.sleep(5)
         
@@ -769,9 +796,18 @@ class KeyLevelGridStrategy:
         """停止策略"""
         self._running = False
         await self.kline_feed.stop()
+        await self._stop_state_flush()
+        
+        # 关闭执行器常驻连接
+        if self._executor:
+            try:
+                await self._executor.close()
+            except Exception as e:
+                self.logger.error(f"关闭执行器连接失败: {e}")
         
         # 停止 Telegram Bot
         if self._tg_bot:
+            await self._notification_helper.stop_tg_bot_watchdog()
             try:
                 await self._tg_bot.stop()
                 self.logger.info("📱 Telegram Bot 已停止")
@@ -780,6 +816,9 @@ class KeyLevelGridStrategy:
         
         self.logger.info("策略已停止")
         
+        # 发送队列中尚未发出的重建通知
+        await self._notification_helper.stop_notify_worker()
+        
         # 发送停止通知
         await self._notification_helper.send_shutdown_notification(reason=reason, gate_position=self._gate_position)
     
@@ -827,7 +866,6 @@ class KeyLevelGridStrategy:
             # 不再直接 return，允许策略继续运行使用心理关口
         
         # 首次运行：先获取账户余额，用真实余额覆盖配置的 total_capital
-        import time
         if self._balance_updated_at == 0:
             await self._update_account_balance()
             # 用真实账户余额覆盖配置的 total_capital
@@ -872,19 +910,17 @@ class KeyLevelGridStrategy:
         self._current_state = self.indicator.calculate(klines)
         
         # 定期更新账户余额 (每 60 秒)
-        if time.time() - self._balance_updated_at > 60:
+        if time.monotonic() - self._balance_updated_at > 60:
             await self._update_account_balance()
         # 定期同步 Gate 挂单 (每 30 秒)
-        if time.time() - self._orders_updated_at > 30:
+        if time.monotonic() - self._orders_updated_at > 30:
             await self._update_gate_orders()
         # 定期同步 Gate 持仓 (每 15 秒)
-        if time.time() - self._position_updated_at > 15:
+        if time.monotonic() - self._position_updated_at > 15:
             await self._update_gate_position()
         # 定期同步 Gate 成交记录 (每 60 秒)
-        if time.time() - self._trades_updated_at > 60:
+        if time.monotonic() - self._trades_updated_at > 60:
             await self._update_gate_trades()
-        # 定期检查 Telegram Bot 状态 (每 5 分钟)
-        await self._notification_helper.check_telegram_bot()
         
         # 首次创建网格 (需要价格数据和支撑/阻力位计算完成)
         if not self._grid_created and self._current_state:
@@ -906,8 +942,8 @@ class KeyLevelGridStrategy:
 
         if self._notifier and self._current_state:
             uptime_hours = (time.time() - (self._strategy_start_time / 1000)) / 3600
-            pos_value = float(self._gate_position.get("notional", 0) or 0)
-            unrealized = float(self._gate_position.get("unrealized_pnl", 0) or 0)
+            pos_value = self._gate_position_view.notional
+            unrealized = self._gate_position_view.unrealized_pnl
             await self._notifier.notify_idle_heartbeat(
                 symbol=self.config.symbol,
                 current_price=float(self._current_state.close or 0),
@@ -933,7 +969,6 @@ class KeyLevelGridStrategy:
         - 无持仓：按最新支撑位全量挂买单
         - 有持仓：计算 N，从 N+1 支撑位开始挂买单；卖单按 Recon 规则分配
         """
-        import time
         start_ts = time.time()
 
         if not self._executor:
@@ -958,7 +993,7 @@ class KeyLevelGridStrategy:
 
         self.logger.info(f"🔄 强制重置网格: current_price={current_price:.2f}")
 
-        gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+        gate_symbol = self._gate_symbol
 
         try:
             # 1) 同步账户/挂单/持仓
@@ -1042,14 +1077,14 @@ class KeyLevelGridStrategy:
 
             new_grid.anchor_price = current_price
             new_grid.anchor_ts = int(time.time())
-            self.position_manager._save_state()
+            await self.position_manager.save_state_async()
 
             # 6) 同步 Recon 执行冷却
-            self._recon_last_run_at = time.time()
+            self._recon_last_run_at = time.monotonic()
 
             # 7) 直接调用 build_recon_actions 确保与 Recon 逻辑完全一致
             exchange_min_qty = self._get_exchange_min_contracts()
-            contract_size = float(getattr(self, "_contract_size", 0) or self.config.default_contract_size)
+            contract_size = self._contract_size
             exchange_min_qty_btc = exchange_min_qty * contract_size
             
             # 这里的 open_orders 传空，因为上面已经 cancel_all 了
@@ -1078,7 +1113,7 @@ class KeyLevelGridStrategy:
                 old_anchor=old_anchor,
                 new_anchor=current_price,
                 new_orders=[
-                    {"side": a.get("side"), "price": a.get("price"), "amount": 0}
+                    {"side": "buy", "price": a.get("price", 0), "amount": 0}
                     for a in buy_actions
                 ],
             )
@@ -1112,6 +1147,9 @@ class KeyLevelGridStrategy:
         await self._exchange_sync.update_open_orders()
         # 同步数据到策略实例变量（向后兼容）
         self._gate_open_orders = self._exchange_sync.open_orders
+        self._gate_buy_prices = self._exchange_sync.buy_prices
+        self._gate_sell_prices = self._exchange_sync.sell_prices
+        self._gate_sell_contracts = self._exchange_sync.sell_contracts
         self._orders_updated_at = self._exchange_sync.orders_updated_at
         self._contract_size = self._exchange_sync.contract_size
     
@@ -1122,6 +1160,7 @@ class KeyLevelGridStrategy:
         await self._exchange_sync.update_position()
         # 同步数据到策略实例变量（向后兼容）
         self._gate_position = self._exchange_sync.position
+        self._gate_position_view = self._exchange_sync.position_view
         self._position_updated_at = self._exchange_sync.position_updated_at
         self._contract_size = self._exchange_sync.contract_size
         self._last_position_btc = self._exchange_sync._last_position_btc
@@ -1129,8 +1168,8 @@ class KeyLevelGridStrategy:
         self._last_position_unrealized_pnl = self._exchange_sync._last_position_unrealized_pnl
         # 首次同步时对齐基准
         if self._last_position_contracts is None and self._gate_position:
-            self._last_position_contracts = int(self._gate_position.get("raw_contracts", 0) or 0)
-            self._last_position_usdt = float(self._gate_position.get("notional", 0) or 0)
+            self._last_position_contracts = self._gate_position_view.raw_contracts
+            self._last_position_usdt = self._gate_position_view.notional
     
     async def _update_gate_trades(self) -> None:
         """从 Gate 交易所获取成交记录 - 委托给 ExchangeSyncManager"""
@@ -1164,7 +1203,7 @@ class KeyLevelGridStrategy:
         """运行 Recon 轨道 - 委托给 ReconEventManager"""
         await self._recon_manager.run_recon_track(
             current_state=self._current_state,
-            gate_position=self._gate_position,
+            gate_position=self._gate_position_view,
             gate_open_orders=self._gate_open_orders,
             gate_trades=self._gate_trades,
             contract_size=self._contract_size,
@@ -1206,18 +1245,18 @@ class KeyLevelGridStrategy:
         return None
 
     def _mark_level_filled(self, side: str, price: float) -> None:
-        from key_level_grid.position import LevelStatus
         lvl = self._find_level_state(side, price)
         if lvl:
             lvl.status = LevelStatus.FILLED
             lvl.last_action_ts = int(time.time())
+            self.position_manager.mark_changed()
 
     def _mark_level_idle(self, side: str, price: float) -> None:
-        from key_level_grid.position import LevelStatus
         lvl = self._find_level_state(side, price)
         if lvl:
             lvl.status = LevelStatus.IDLE
             lvl.last_action_ts = int(time.time())
+            self.position_manager.mark_changed()
     
     async def _check_and_submit_take_profit_orders(self) -> None:
         """
@@ -1230,11 +1269,12 @@ class KeyLevelGridStrategy:
             return
         
         # 获取当前持仓张数（更精确）
-        current_contracts = int(float(self._gate_position.get("raw_contracts", 0) or 0))
-        current_position_usdt = self._gate_position.get("notional", 0)
+        position = self._gate_position_view
+        current_contracts = position.raw_contracts
+        current_position_usdt = position.notional
         
         # 获取上次持仓张数
-        last_contracts = getattr(self, "_last_position_contracts", 0)
+        last_contracts = self._last_position_contracts
         
         # 检测持仓增加（买单成交）
         if last_contracts is None:
@@ -1251,11 +1291,11 @@ class KeyLevelGridStrategy:
             )
             # 标记需要重建（成交驱动），记录成交时间
             self._need_rebuild_after_fill = True
-            self._last_fill_at = time.time()
+            self._last_fill_at = time.monotonic()
             
             # 发送买入成交通知（使用真实 contract_size）
-            fill_price = float(self._gate_position.get("entry_price", 0) or 0)
-            contract_size = float(self._gate_position.get("contract_size", getattr(self, "_contract_size", 0.0001)) or 0.0001)
+            fill_price = position.entry_price
+            contract_size = position.contract_size or self._contract_size
             fill_amount = added_contracts * contract_size * fill_price  # USDT
             # 避免 contract_size 异常导致巨额金额
             if fill_amount > 0:
@@ -1280,14 +1320,14 @@ class KeyLevelGridStrategy:
             )
             # 标记需要重建（成交驱动），记录成交时间
             self._need_rebuild_after_fill = True
-            self._last_fill_at = time.time()
+            self._last_fill_at = time.monotonic()
             
             # 发送卖出成交通知（使用真实 contract_size）
-            fill_price = float(self._gate_position.get("mark_price", 0) or 0)
-            contract_size = float(self._gate_position.get("contract_size", getattr(self, "_contract_size", 0.0001)) or 0.0001)
+            fill_price = position.mark_price
+            contract_size = position.contract_size or self._contract_size
             fill_amount = reduced_contracts * contract_size * fill_price  # USDT
             # 计算实现盈亏（简化估算）
-            entry_price = float(self._gate_position.get("entry_price", 0) or 0)
+            entry_price = position.entry_price
             realized_pnl = (fill_price - entry_price) * reduced_contracts * contract_size if entry_price > 0 else 0
             if fill_amount > 0:
                 await self._notification_helper.notify_order_filled(
@@ -1317,15 +1357,12 @@ class KeyLevelGridStrategy:
     
     def _has_existing_tp_orders(self) -> bool:
         """检查是否已有止盈卖单挂单"""
-        for order in self._gate_open_orders:
-            if order.get("side") == "sell":
-                return True
-        return False
+        return bool(self._gate_sell_prices)
     
     async def _check_and_update_stop_loss_order(self) -> None:
         """检查并更新止损单 - 委托给 RiskManager"""
         await self._risk_manager.check_and_update_stop_loss(
-            gate_position=self._gate_position,
+            gate_position=self._gate_position_view,
             contract_size=self._contract_size,
         )
         # 同步状态到策略实例变量（向后兼容）
@@ -1340,7 +1377,7 @@ class KeyLevelGridStrategy:
         success = await self._risk_manager._submit_stop_loss_order(
             contracts=contracts,
             trigger_price=trigger_price,
-            gate_position=self._gate_position,
+            gate_position=self._gate_position_view,
             contract_size=self._contract_size,
         )
         # 同步状态
@@ -1374,7 +1411,7 @@ class KeyLevelGridStrategy:
     async def _check_stop_loss_triggered(self) -> None:
         """检测止损触发 - 委托给 RiskManager"""
         triggered_info = await self._risk_manager.check_stop_loss_triggered(
-            gate_position=self._gate_position,
+            gate_position=self._gate_position_view,
         )
         # 同步状态
         self._stop_loss_order_id = self._risk_manager.stop_loss_order_id
@@ -1396,28 +1433,27 @@ class KeyLevelGridStrategy:
         """
         旧版止盈卖单逻辑（Spec2.0 已废弃，保留但不使用）。
         """
-        import math
-        from key_level_grid.executor.base import Order, OrderSide, OrderType
         
         # ===== 1. 获取 Gate 真实持仓 =====
         # 先同步最新持仓数据
         await self._update_gate_position()
         await self._update_gate_orders()
         
-        if not self._gate_position:
+        position = self._gate_position_view
+        if not position.is_open:
             self.logger.warning("⚠️ 无 Gate 持仓数据，无法生成止盈挂单")
             return
         
         # 调试：打印持仓详情
         self.logger.info(
-            f"🔍 止盈-持仓详情: raw_contracts={self._gate_position.get('raw_contracts')}, "
-            f"entry_price={self._gate_position.get('entry_price')}, "
-            f"contract_size={self._gate_position.get('contract_size')}"
+            f"🔍 止盈-持仓详情: raw_contracts={position.raw_contracts}, "
+            f"entry_price={position.entry_price}, "
+            f"contract_size={position.contract_size}"
         )
         
-        position_raw_contracts = int(float(self._gate_position.get("raw_contracts", 0) or 0))
-        avg_entry_price = float(self._gate_position.get("entry_price", 0) or 0)
-        contract_size = float(self._gate_position.get("contract_size", getattr(self, "_contract_size", 0.0001)) or 0.0001)
+        position_raw_contracts = position.raw_contracts
+        avg_entry_price = position.entry_price
+        contract_size = position.contract_size or self._contract_size
         position_btc = position_raw_contracts * contract_size
         
         if position_raw_contracts <= 0:
@@ -1439,44 +1475,37 @@ class KeyLevelGridStrategy:
             self.logger.warning("⚠️ 无买单信息，无法计算每格张数")
             return
         
+        # ===== 3. 获取有效阻力位（卖单视图已按价格升序，掩码筛选均价之上且未成交的部分） =====
+        valid_idx = state.valid_sell_indices(avg_entry_price)
+        
+        if valid_idx.size == 0:
+            self.logger.warning(f"无有效阻力位（均价={avg_entry_price:.2f}）")
+            return
+        
+        resistance_prices = state.sell_prices_sorted[valid_idx]
+        
+        # ===== 4. 计算每档张数、已成交网格数、止盈档数 =====
         # 总是基于当前的 max_position_usdt 计算（确保与账户余额同步）
         num_grids = state.num_grids if state.num_grids > 0 else len(buy_orders)
         max_position_usdt = self.position_manager.position_config.max_position_usdt
-        total_contracts = int(max_position_usdt / (avg_entry_price * contract_size)) if contract_size > 0 else 0
-        per_grid_contracts = max(1, int(total_contracts / num_grids)) if total_contracts > 0 else 1
-        self.logger.info(
-            f"📊 止盈网格配置: max_position={max_position_usdt:.0f}U, "
-            f"每档={per_grid_contracts}张, 网格数={num_grids}"
+        per_grid_contracts, filled_grids, num_tp_levels, _ = compute_tp_plan(
+            float(max_position_usdt),
+            avg_entry_price,
+            contract_size,
+            num_grids,
+            position_raw_contracts,
+            resistance_prices,
         )
-        
-        # ===== 3. 计算已成交网格数 =====
-        filled_grids = math.ceil(position_raw_contracts / per_grid_contracts)
-        
-        # 上限检查：不能超过网格总数
-        filled_grids = min(filled_grids, num_grids)
-        
         self.logger.info(
-            f"📊 止盈分析: 持仓={position_raw_contracts}张 (≈{position_btc:.6f}BTC), "
+            f"📊 止盈分析: max_position={max_position_usdt:.0f}U, "
+            f"持仓={position_raw_contracts}张 (≈{position_btc:.6f}BTC), "
             f"每格={per_grid_contracts}张, 已成交网格={filled_grids}/{num_grids}"
         )
         
-        # ===== 4. 获取有效阻力位 =====
-        sell_orders = self.position_manager.state.sell_orders if self.position_manager.state else []
-        valid_resistances = [
-            o for o in sell_orders 
-            if not o.is_filled and o.price > avg_entry_price
-        ]
-        
-        if not valid_resistances:
-            self.logger.warning(f"无有效阻力位（均价={avg_entry_price:.2f}）")
-            return
-        
-        # 按价格从低到高排序
-        valid_resistances.sort(key=lambda x: x.price)
-        
         # 只取前 filled_grids 个阻力位（止盈单数量 = 已成交网格数）
-        selected_resistances = valid_resistances[:filled_grids]
-        num_tp_levels = len(selected_resistances)
+        selected_resistances = [state.sell_orders_sorted[i] for i in valid_idx[:num_tp_levels]]
+        # 阻力位价格的整数分键，与 selected_resistances 一一对应
+        res_price_keys = [price_to_cents(r.price) for r in selected_resistances]
         
         self.logger.info(
             f"🎯 止盈计划: 已成交{filled_grids}格 → 挂{num_tp_levels}档止盈, "
@@ -1484,14 +1513,9 @@ class KeyLevelGridStrategy:
         )
         
         # ===== 5. 检查已有止盈单（防重复 + 计算剩余可挂量） =====
-        existing_sell_prices = set()
-        existing_sell_contracts = 0  # 已挂止盈单总张数
-        
-        for order in self._gate_open_orders:
-            if order.get("side") == "sell":
-                existing_sell_prices.add(round(order.get("price", 0), 2))
-                # 累加已挂止盈单的张数
-                existing_sell_contracts += int(float(order.get("raw_contracts", 0) or 0))
+        # 已有卖单价格的整数分键（升序），批次内新增用 insort 维持有序
+        existing_sell_cents = [price_to_cents(p) for p in self._gate_sell_prices]
+        existing_sell_contracts = int(self._gate_sell_contracts)  # 已挂止盈单总张数
         
         # 可挂止盈单的张数 = 持仓张数 - 已挂止盈单张数
         available_to_sell = position_raw_contracts - existing_sell_contracts
@@ -1509,69 +1533,80 @@ class KeyLevelGridStrategy:
             self._tp_orders_submitted = True
             return
         
-        gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+        gate_symbol = self._gate_symbol
         
-        # ===== 6. 逐档分配止盈（只分配可挂的张数） =====
-        remaining_contracts = available_to_sell  # 改为只分配可挂的部分
+        # ===== 6. 可挂张数可覆盖的档数：full_levels 档满额 + 1 档余量 =====
+        full_levels, rest = divmod(available_to_sell, per_grid_contracts)
+        needed_levels = full_levels + (1 if rest else 0)
+        
+        # ===== 7. 去重：排除已有相近价位挂单的阻力位（价格容差 0.1%），凑够档数即停止 =====
         submitted_count = 0
         skipped_count = 0
         failed_count = 0
+        candidates = []  # [(档位序号, 阻力位)]
         
         for i, resistance in enumerate(selected_resistances):
-            if remaining_contracts <= 0:
+            if len(candidates) >= needed_levels:
                 break
-            
-            # 检查是否已有相同价位的挂单
-            if round(resistance.price, 2) in existing_sell_prices:
-                self.logger.debug(f"⏭️ 跳过已存在的止盈单 @ {resistance.price:.2f}")
+            cents = res_price_keys[i]
+            if has_near_price(existing_sell_cents, cents, 0.001):
+                self.logger.debug("⏭️ 跳过已存在的止盈单 @ %.2f", resistance.price)
                 skipped_count += 1
                 continue
+            bisect.insort(existing_sell_cents, cents)
+            candidates.append((i, resistance))
+        
+        # ===== 8. 分配张数：每档等量，最后一档用完剩余（候选档数不超过可覆盖档数，分配均为正） =====
+        allocations = [
+            per_grid_contracts if k < full_levels else rest
+            for k in range(len(candidates))
+        ]
+        if candidates and candidates[-1][0] == num_tp_levels - 1:
+            allocations[-1] = available_to_sell - sum(allocations[:-1])
+        remaining_contracts = available_to_sell - sum(allocations)
+        
+        # ===== 9. 构建全部止盈订单 =====
+        pending = []  # [(档位序号, 阻力位, 张数, 订单)]
+        
+        for (i, resistance), tp_contracts in zip(candidates, allocations):
+            # 创建限价卖单 (reduce_only=True, quantity=张数)
+            tp_order = self._order_pool.get(
+                symbol=gate_symbol,
+                side=OrderSide.SELL,
+                order_type=OrderType.LIMIT,
+                quantity=tp_contracts,  # 张数（整数）
+                price=resistance.price,
+                reduce_only=True,
+            )
+            tp_order.order_mode = 'limit'
+            tp_order.grid_id = resistance.grid_id
+            tp_order.is_take_profit = True
+            tp_order.source = resistance.source
+            tp_order.contract_size = contract_size
+            tp_order.target_contracts = tp_contracts
             
-            # 分配张数：每档等量，最后一档用完剩余
-            if i == num_tp_levels - 1:
-                tp_contracts = remaining_contracts
-            else:
-                tp_contracts = min(per_grid_contracts, remaining_contracts)
-            
-            tp_btc = tp_contracts * contract_size
-            tp_usdt = tp_btc * resistance.price
-            profit_pct = ((resistance.price - avg_entry_price) / avg_entry_price) * 100
-            
-            try:
-                # 创建限价卖单 (reduce_only=True, quantity=张数)
-                tp_order = Order.create(
-                    symbol=gate_symbol,
-                    side=OrderSide.SELL,
-                    order_type=OrderType.LIMIT,
-                    quantity=tp_contracts,  # 张数（整数）
-                    price=resistance.price,
-                    reduce_only=True,
-                )
-                tp_order.metadata['order_mode'] = 'limit'
-                tp_order.metadata['grid_id'] = resistance.grid_id
-                tp_order.metadata['is_take_profit'] = True
-                tp_order.metadata['source'] = resistance.source
-                tp_order.metadata['contract_size'] = contract_size
-                tp_order.metadata['target_contracts'] = tp_contracts
-                
-                success = await self._executor.submit_order(tp_order)
-                
-                if success:
-                    submitted_count += 1
-                    remaining_contracts -= tp_contracts
-                    # 添加到已存在列表，防止同一批次重复
-                    existing_sell_prices.add(round(resistance.price, 2))
+            pending.append((i, resistance, tp_contracts, tp_order))
+        
+        # ===== 10. 批量提交（交易所批量接口，不支持时并发逐单提交） =====
+        results = await self._executor.submit_orders_batch(
+            [item[-1] for item in pending], self.config.max_concurrent_orders
+        ) if pending else []
+        
+        for (i, resistance, tp_contracts, tp_order), success in zip(pending, results):
+            if success:
+                submitted_count += 1
+                if self.logger.isEnabledFor(_INFO):
+                    tp_usdt = tp_contracts * contract_size * resistance.price
+                    profit_pct = ((resistance.price - avg_entry_price) / avg_entry_price) * 100
                     self.logger.info(
-                        f"✅ 止盈卖单 #{i+1}: {tp_contracts}张 @ {resistance.price:.2f} "
-                        f"(+{profit_pct:.1f}%, ≈{tp_usdt:.0f}U)"
+                        "✅ 止盈卖单 #%d: %d张 @ %.2f (+%.1f%%, ≈%.0fU)",
+                        i + 1, tp_contracts, resistance.price, profit_pct, tp_usdt,
                     )
-                else:
-                    failed_count += 1
-                    self.logger.error(f"❌ 止盈卖单 #{i+1} 失败: {tp_order.reject_reason}")
-                    
-            except Exception as e:
+            else:
                 failed_count += 1
-                self.logger.error(f"❌ 止盈卖单 #{i+1} 异常: {e}")
+                remaining_contracts += tp_contracts
+                self.logger.error("❌ 止盈卖单 #%d 失败: %s", i + 1, tp_order.reject_reason)
+            self._order_pool.put(tp_order)
         
         if submitted_count > 0:
             self._tp_orders_submitted = True
@@ -1660,44 +1695,41 @@ class KeyLevelGridStrategy:
         """
         旧版网格挂单逻辑（Spec2.0 已废弃，保留但不使用）。
         """
-        import math
-        from key_level_grid.executor.base import Order, OrderSide, OrderType
         
         # 符号格式转换：Binance BTCUSDT → Gate BTC_USDT
-        binance_symbol = self.config.symbol
-        gate_symbol = self._convert_to_gate_symbol(binance_symbol)
+        gate_symbol = self._gate_symbol
         
         self.logger.info(f"🚀 开始提交网格挂单到 Gate.io: {gate_symbol}")
         
         # ============================================
-        # 1. 同步 Gate 挂单、持仓和余额
+        # 1. 同步 Gate 挂单、持仓和余额（三者互不依赖，并发请求）
         # ============================================
-        await self._update_gate_orders()
-        await self._update_gate_position()
-        await self._update_account_balance()
+        await asyncio.gather(
+            self._update_gate_orders(),
+            self._update_gate_position(),
+            self._update_account_balance(),
+        )
         
         # 调试：打印持仓数据
+        position = self._gate_position_view
         self.logger.info(
-            f"🔍 Gate 持仓数据: raw_contracts={self._gate_position.get('raw_contracts', 0)}, "
-            f"entry_price={self._gate_position.get('entry_price', 0)}, "
-            f"notional={self._gate_position.get('notional', 0)}"
+            f"🔍 Gate 持仓数据: raw_contracts={position.raw_contracts}, "
+            f"entry_price={position.entry_price}, "
+            f"notional={position.notional}"
         )
         
-        # 获取 Gate 已有的买单价格
-        gate_buy_prices = [
-            o.get("price", 0) for o in self._gate_open_orders 
-            if o.get("side") == "buy"
-        ]
+        # 获取 Gate 已有的买单价格（同步时已按价格升序索引）
+        gate_buy_prices = self._gate_buy_prices
         
         self.logger.info(
             f"📋 Gate 已有买单: {len(gate_buy_prices)} 个, "
-            f"价格: {[f'{p:.2f}' for p in sorted(gate_buy_prices, reverse=True)[:5]]}"
+            f"价格: {[f'{p:.2f}' for p in gate_buy_prices[:-6:-1]]}"
         )
         
         # ============================================
         # 1.5 余额预检查
         # ============================================
-        available_balance = float(self._account_balance.get("free", 0) or 0)
+        available_balance = self._account_balance["free"]
         self.logger.info(f"💰 可用余额: {available_balance:.2f} USDT")
         
         # ============================================
@@ -1709,11 +1741,12 @@ class KeyLevelGridStrategy:
             
             self.logger.info(f"🔧 配置保证金模式: {margin_mode}, 杠杆: {leverage}x")
 
-            # 先设置保证金模式，再设置杠杆
-            await self._executor.set_margin_mode(gate_symbol, margin_mode)
-            
+            # 保证金模式与杠杆为独立接口，并发设置
             # 全仓/逐仓模式都使用配置的杠杆值
-            await self._executor.set_leverage(gate_symbol, leverage)
+            await asyncio.gather(
+                self._executor.set_margin_mode(gate_symbol, margin_mode),
+                self._executor.set_leverage(gate_symbol, leverage),
+            )
             self.logger.info(f"✅ 保证金模式设置完成: {margin_mode}, {leverage}x")
             
         except Exception as e:
@@ -1727,7 +1760,7 @@ class KeyLevelGridStrategy:
             self.logger.warning("无买单网格，跳过提交")
             return
         
-        contract_size = getattr(self, "_contract_size", 0.0001) or 0.0001
+        contract_size = self._contract_size
         current_price = self._current_state.close if self._current_state else 0
         if current_price <= 0:
             current_price = grid_state.buy_orders[0].price
@@ -1735,22 +1768,31 @@ class KeyLevelGridStrategy:
         # 记录合同规模用于后续转换
         grid_state.contract_size = contract_size
         grid_state.num_grids = num_grids
-        self.position_manager._save_state()
+        await self.position_manager.save_state_async()
         
         # ============================================
         # 4. 三层过滤：计算已成交网格数 + 均价保护
-        position_contracts = int(float(self._gate_position.get("raw_contracts", 0) or 0))
-        avg_entry_price = float(self._gate_position.get("entry_price", 0) or 0)
+        position_contracts = position.raw_contracts
+        avg_entry_price = position.entry_price
         price_threshold = avg_entry_price * 0.995 if (avg_entry_price > 0 and not rebuild_mode) else 0
 
-        # 5. 买单排序（按价格从高到低）
+        # 5. 买单排序（按价格从高到低，构建时即排除已成交网格）
         leverage = self.config.leverage or 20
-        sorted_orders = sorted(grid_state.buy_orders, key=lambda x: x.price, reverse=True)
+        sorted_orders = sorted(
+            (o for o in grid_state.buy_orders if not o.is_filled),
+            key=lambda x: x.price,
+            reverse=True,
+        )
 
-        # 粗略估计每格张数（用于日志）：取首档金额
-        ref_contracts_per_grid = 0
-        if sorted_orders:
-            ref_contracts_per_grid = int(sorted_orders[0].amount_usdt / (sorted_orders[0].price * contract_size)) or 1
+        # 张数与保证金一次性向量计算（循环内只做分支与下单构建）
+        n = len(sorted_orders)
+        prices = np.fromiter((o.price for o in sorted_orders), dtype=np.float64, count=n)
+        amounts = np.fromiter((o.amount_usdt for o in sorted_orders), dtype=np.float64, count=n)
+        qtys = np.maximum(1, (amounts / (prices * contract_size)).astype(np.int64))
+        required_margins = amounts / leverage
+
+        # 粗略估计每格张数（用于日志）：取首档张数
+        ref_contracts_per_grid = int(qtys[0]) if n else 0
 
         filled_grids = 0
         if position_contracts > 0 and ref_contracts_per_grid > 0:
@@ -1762,78 +1804,80 @@ class KeyLevelGridStrategy:
         )
 
         submitted_count = 0
-        skipped_exists = 0
-        skipped_threshold = 0
         failed_count = 0
 
-        for idx, order in enumerate(sorted_orders):
-            if order.is_filled:
-                continue
-
-            # 规则 B：跳过 Gate 上已有的挂单（价格容差 0.1%）
-            already_exists = any(
-                abs(order.price - gate_price) / order.price < 0.001
-                for gate_price in gate_buy_prices
-            )
-            if already_exists:
-                skipped_exists += 1
-                self.logger.debug(f"⏭️ 跳过 Gate 已有挂单: @ {order.price:.2f}")
-                continue
-
-            # 规则 C：跳过 price >= avg_entry * 0.995（均价保护）
-            if price_threshold > 0 and order.price >= price_threshold:
-                skipped_threshold += 1
-                self.logger.debug(f"⏭️ 跳过均价保护: @ {order.price:.2f} >= {price_threshold:.2f}")
-                continue
-
-            # 计算张数与保证金
-            qty = max(1, int(order.amount_usdt / (order.price * contract_size)))
-            required_margin = order.amount_usdt / leverage
-
+        # 过滤规则向量化：一次性计算各买单的保留掩码
+        # 规则 B：跳过 Gate 上已有的挂单（价格容差 0.1%）
+        exists = near_price_mask(
+            prices, np.asarray(gate_buy_prices, dtype=np.float64), 0.001, presorted=True,
+        )
+        # 规则 C：跳过 price >= avg_entry * 0.995（均价保护）
+        above = ~exists & (prices >= price_threshold) if price_threshold > 0 else np.zeros(n, dtype=bool)
+        keep = ~exists & ~above
+
+        skipped_exists = int(exists.sum())
+        skipped_threshold = int(above.sum())
+        if skipped_exists:
+            self.logger.debug("⏭️ 跳过 Gate 已有挂单: %s", prices[exists].round(2).tolist())
+        if skipped_threshold:
+            self.logger.debug("⏭️ 跳过均价保护 (>= %.2f): %s", price_threshold, prices[above].round(2).tolist())
+
+        # 转为 Python 标量列表，避免循环内逐个取 numpy 标量
+        qty_list = qtys.tolist()
+        margin_list = required_margins.tolist()
+
+        pending = []  # [(网格订单, 张数, 保证金, Gate 订单)]
+        for idx in np.flatnonzero(keep).tolist():
+            order = sorted_orders[idx]
+            qty = qty_list[idx]
+            required_margin = margin_list[idx]
+
+            # 余额按顺序累计扣减，无法向量化
             if available_balance < required_margin:
                 self.logger.warning(
-                    f"⚠️ 余额不足，跳过买单: 价格={order.price:.2f}, 金额={order.amount_usdt:.2f}U, "
-                    f"需保证金≈{required_margin:.2f}U, 可用={available_balance:.2f}U"
+                    "⚠️ 余额不足，跳过买单: 价格=%.2f, 金额=%.2fU, 需保证金≈%.2fU, 可用=%.2fU",
+                    order.price, order.amount_usdt, required_margin, available_balance,
                 )
                 continue
 
-            # 提交订单
-            try:
-                gate_order = Order.create(
-                    symbol=gate_symbol,
-                    side=OrderSide.BUY,
-                    order_type=OrderType.LIMIT,
-                    price=order.price,
-                    quantity=qty,
-                    pricing_mode="usdt",
-                    target_value_usd=order.amount_usdt,
+            gate_order = self._order_pool.get(
+                symbol=gate_symbol,
+                side=OrderSide.BUY,
+                order_type=OrderType.LIMIT,
+                price=order.price,
+                quantity=qty,
+                pricing_mode="usdt",
+                target_value_usd=order.amount_usdt,
+            )
+            gate_order.order_mode = 'limit'
+            gate_order.grid_id = order.grid_id
+            gate_order.source = order.source
+            gate_order.target_contracts = qty
+            gate_order.contract_size = contract_size
+
+            # 预先扣减保证金，保证同一批次不超出可用余额
+            available_balance -= required_margin
+            pending.append((order, qty, required_margin, gate_order))
+
+        # 批量提交（交易所批量接口，不支持时并发逐单提交）
+        results = await self._executor.submit_orders_batch(
+            [item[-1] for item in pending], self.config.max_concurrent_orders
+        ) if pending else []
+
+        for (order, qty, required_margin, gate_order), success in zip(pending, results):
+            if success:
+                submitted_count += 1
+                self.logger.info(
+                    "✅ 网格买单 #%s: %d张 @ %.2f (≈%.0fU)",
+                    order.grid_id, qty, order.price, order.amount_usdt,
                 )
-                gate_order.metadata['order_mode'] = 'limit'
-                gate_order.metadata['grid_id'] = order.grid_id
-                gate_order.metadata['source'] = order.source
-                gate_order.metadata['target_contracts'] = qty
-                gate_order.metadata['contract_size'] = contract_size
-
-                success = await self._executor.submit_order(gate_order)
-
-                if success:
-                    submitted_count += 1
-                    available_balance -= required_margin
-                    self.logger.info(
-                        f"✅ 网格买单 #{order.grid_id}: {qty}张 @ {order.price:.2f} (≈{order.amount_usdt:.0f}U)"
-                    )
-                else:
-                    failed_count += 1
-                    self.logger.error(
-                        f"❌ 网格买单 #{order.grid_id} 失败: {gate_order.reject_reason}"
-                    )
-                    if "余额" in str(gate_order.reject_reason) or "insufficient" in str(gate_order.reject_reason).lower():
-                        self.logger.warning("⚠️ 余额不足，停止提交剩余买单")
-                        break
-
-            except Exception as e:
+            else:
                 failed_count += 1
-                self.logger.error(f"❌ 提交网格买单 #{order.grid_id} 异常: {e}")
+                available_balance += required_margin
+                self.logger.error(
+                    "❌ 网格买单 #%s 失败: %s", order.grid_id, gate_order.reject_reason,
+                )
+            self._order_pool.put(gate_order)
 
         self.logger.info(
             f"📊 网格挂单完成: 新提交={submitted_count}, "
@@ -1934,12 +1978,11 @@ class KeyLevelGridStrategy:
                 self._pending_signal = signal
         except Exception as e:
             self.logger.error(f"K线回调异常: {e}", exc_info=True)
-            import traceback
             await self._notification_helper.notify_alert(
                 error_type="WebSocketError",
                 error_msg=str(e),
                 impact="K线回调异常，信号生成可能延迟",
-                traceback_text="".join(traceback.format_exc(limit=4)),
+                traceback_text=traceback.format_exc(limit=4),
             )
             await self._execute_signal(signal)
         else:
@@ -2056,15 +2099,18 @@ class KeyLevelGridStrategy:
             kline_feed=self.kline_feed,
         )
     
-    def get_display_data(self) -> Dict[str, Any]:
-        """获取显示面板数据 - 委托给 DisplayDataGenerator"""
-        # 更新展示数据生成器的上下文
+    def _sync_display_context(self) -> None:
+        """更新展示数据生成器的上下文"""
         self._display_generator.update_context(
             account_balance=self._account_balance,
             gate_position=self._gate_position,
             gate_open_orders=self._gate_open_orders,
             contract_size=self._contract_size,
         )
+    
+    def get_display_data(self) -> Dict[str, Any]:
+        """获取显示面板数据 - 委托给 DisplayDataGenerator"""
+        self._sync_display_context()
         
         # 委托给 DisplayDataGenerator
         return self._display_generator.get_display_data(
@@ -2074,6 +2120,16 @@ class KeyLevelGridStrategy:
             dry_run=self.config.dry_run,
         )
     
+    def get_display_json(self) -> bytes:
+        """获取显示面板数据的 JSON（UTF-8 bytes），供需要原始报文的调用方使用"""
+        self._sync_display_context()
+        return self._display_generator.get_display_json(
+            current_state=self._current_state,
+            kline_feed=self.kline_feed,
+            build_klines_by_timeframe_func=self._build_klines_by_timeframe,
+            dry_run=self.config.dry_run,
+        )
+    
     def _generate_trade_plan_display(self, state: Optional[KeyLevelGridState]) -> Dict[str, Any]:
         """生成交易执行计划显示数据"""
         if state is None:
@@ -2141,55 +2197,96 @@ class KeyLevelGridStrategy:
         # 无信号无仓位，返回空
         return {}
     
+    def _mark_state_dirty(self) -> None:
+        """标记网格状态待保存（0.5 秒内的多次修改合并为一次写盘）"""
+        # 写盘前展示缓存即需失效，否则 Telegram 修改后立刻查询会读到旧数据
+        self.position_manager.mark_changed()
+        if self._state_flush_task is None or self._state_flush_task.done():
+            self._state_flush_task = asyncio.create_task(self._state_flush_loop())
+        self._state_dirty.set()
+
+    async def _state_flush_loop(self, delay_sec: float = 0.5) -> None:
+        """后台合并保存网格状态"""
+        while True:
+            await self._state_dirty.wait()
+            await asyncio.sleep(delay_sec)
+            self._state_dirty.clear()
+            await self.position_manager.save_state_async()
+
+    async def _stop_state_flush(self) -> None:
+        """停止后台保存任务，并落盘尚未保存的修改"""
+        task = self._state_flush_task
+        self._state_flush_task = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._state_dirty.is_set():
+            self._state_dirty.clear()
+            await self.position_manager.save_state_async()
+
     async def tg_update_grid_range(self, lower: float, upper: float) -> bool:
         if not self.position_manager or lower <= 0 or upper <= 0 or upper <= lower:
             return False
         async with self._grid_lock:
+            lower = float(lower)
+            upper = float(upper)
             grid_cfg = self.position_manager.grid_config
             grid_cfg.range_mode = "manual"
-            grid_cfg.manual_lower = float(lower)
-            grid_cfg.manual_upper = float(upper)
-            if self.config.grid_config:
-                self.config.grid_config.range_mode = "manual"
-                self.config.grid_config.manual_lower = float(lower)
-                self.config.grid_config.manual_upper = float(upper)
-            if self.position_manager.state:
-                self.position_manager.state.grid_floor = lower * (1 - grid_cfg.floor_buffer)
-                self.position_manager._save_state()
+            grid_cfg.manual_lower = lower
+            grid_cfg.manual_upper = upper
+            cfg_gc = self.config.grid_config
+            if cfg_gc:
+                cfg_gc.range_mode = "manual"
+                cfg_gc.manual_lower = lower
+                cfg_gc.manual_upper = upper
+            state = self.position_manager.state
+            if state:
+                state.grid_floor = lower * (1 - grid_cfg.floor_buffer)
+                self._mark_state_dirty()
         return True
 
     async def tg_update_base_position_locked(self, locked_btc: float) -> bool:
+        locked = 0.0 if locked_btc is None else max(float(locked_btc), 0.0)
+        # 未变化时无需加锁
+        if locked == self.position_manager.grid_config.base_position_locked:
+            return True
         async with self._grid_lock:
-            grid_cfg = self.position_manager.grid_config
-            grid_cfg.base_position_locked = max(float(locked_btc or 0), 0.0)
-            if self.config.grid_config:
-                self.config.grid_config.base_position_locked = grid_cfg.base_position_locked
-            if self.position_manager.state:
-                self.position_manager.state.base_position_locked = grid_cfg.base_position_locked
-                self.position_manager._save_state()
+            self.position_manager.grid_config.base_position_locked = locked
+            cfg_gc = self.config.grid_config
+            if cfg_gc:
+                cfg_gc.base_position_locked = locked
+            state = self.position_manager.state
+            if state:
+                state.base_position_locked = locked
+                self._mark_state_dirty()
         return True
 
     async def tg_update_stop_loss_pct(self, pct: float) -> bool:
         if pct <= 0 or pct >= 1:
             return False
         async with self._grid_lock:
-            sl_cfg = getattr(self.position_manager, "stop_loss_config", None)
-            if sl_cfg:
-                sl_cfg.trigger = "fixed_pct"
-                sl_cfg.fixed_pct = float(pct)
+            sl_cfg = self.position_manager.stop_loss_config
+            sl_cfg.trigger = "fixed_pct"
+            sl_cfg.fixed_pct = float(pct)
             self._stop_loss_order_id = None
             self._stop_loss_contracts = 0
             await self._check_and_update_stop_loss_order()
         return True
 
     async def tg_update_margin_leverage(self, margin_mode: str, leverage: int) -> bool:
+        # 有持仓时直接拒绝，无需等锁；加锁后再次确认
+        if self._gate_position_view.contracts > 0:
+            return False
         async with self._grid_lock:
-            if float(self._gate_position.get("contracts", 0) or 0) > 0:
+            if self._gate_position_view.contracts > 0:
                 return False
             self.config.margin_mode = margin_mode
             self.config.leverage = int(leverage)
             if self._executor:
-                gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
+                gate_symbol = self._gate_symbol
                 # 先保证金模式，再杠杆
                 await self._executor.set_margin_mode(gate_symbol, margin_mode)
                 # 全仓/逐仓模式都使用配置的杠杆值
@@ -2209,20 +2306,36 @@ class KeyLevelGridStrategy:
     async def tg_emergency_close(self) -> bool:
         if not self._executor:
             return False
+        gate_symbol = self._gate_symbol
+
         async with self._grid_lock:
-            gate_symbol = self._convert_to_gate_symbol(self.config.symbol)
             try:
+                # 先撤全部挂单，再查询计划单与持仓：撤单前的成交与新建的止损单都能被覆盖
                 await self._executor.cancel_all_orders(gate_symbol)
                 plan_orders = await self._executor.get_plan_orders(gate_symbol, status="open")
-                for order in plan_orders:
-                    order_id = str(order.get("id", ""))
-                    if order_id:
-                        await self._executor.cancel_plan_order(gate_symbol, order_id)
+                order_ids = [str(o.get("id", "")) for o in plan_orders if o.get("id")]
+                # 计划单并发撤销（限制并发数，避免触发交易所限频）
+                semaphore = asyncio.Semaphore(self.config.max_concurrent_orders)
+
+                async def _cancel_plan(order_id: str):
+                    async with semaphore:
+                        return await self._executor.cancel_plan_order(gate_symbol, order_id)
+
+                results = await asyncio.gather(
+                    *(_cancel_plan(oid) for oid in order_ids),
+                    return_exceptions=True,
+                )
+                for order_id, result in zip(order_ids, results):
+                    if isinstance(result, Exception):
+                        self.logger.warning(f"撤销计划单失败 {order_id}: {result}")
             except Exception as e:
                 self.logger.error(f"紧急全平撤单失败: {e}")
-            raw_contracts = float(self._gate_position.get("raw_contracts", 0) or 0)
+            try:
+                await self._update_gate_position()
+            except Exception as e:
+                self.logger.error(f"紧急全平刷新持仓失败，使用缓存持仓: {e}")
+            raw_contracts = self._gate_position_view.raw_contracts
             if raw_contracts > 0:
-                from key_level_grid.executor.base import Order, OrderSide, OrderType
                 order = Order.create(
                     symbol=gate_symbol,
                     side=OrderSide.SELL,
@@ -2234,6 +2347,6 @@ class KeyLevelGridStrategy:
                 order.metadata["reason"] = "emergency_close"
                 order.metadata["order_type"] = "紧急全平"
                 await self._executor.submit_order(order)
-            await self.stop(reason="tg_emergency_close")
+        await self.stop(reason="tg_emergency_close")
         return True
 
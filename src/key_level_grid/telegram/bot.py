@@ -90,7 +90,7 @@ class KeyLevelTelegramBot:
         self._on_reject: Optional[Callable] = None
 
         # 最近一次收到指令的时间戳（用于卡死检测）
-        self._last_update_ts: float = time.time()
+        self._last_update_ts: float = time.monotonic()
     
     def set_strategy(self, strategy: "KeyLevelGridStrategy") -> None:
         """设置策略引用"""
@@ -162,7 +162,7 @@ class KeyLevelTelegramBot:
         # 验证 polling 状态
         if self.app.updater.running:
             self.logger.info(f"✅ Telegram Bot polling 已启动，chat_id={self.config.chat_id}")
-            self._last_update_ts = time.time()
+            self._last_update_ts = time.monotonic()
         else:
             self.logger.error("❌ Telegram Bot polling 启动失败")
     
@@ -298,7 +298,7 @@ class KeyLevelTelegramBot:
         return self.app.updater.running
 
     def get_last_update_ts(self) -> float:
-        """获取最近一次收到用户指令的时间戳"""
+        """获取最近一次收到用户指令的时间戳（time.monotonic）"""
         return self._last_update_ts
     
     async def restart(self) -> None:
@@ -315,7 +315,7 @@ class KeyLevelTelegramBot:
 
     def _mark_alive(self) -> None:
         """更新最近活动时间戳"""
-        self._last_update_ts = time.time()
+        self._last_update_ts = time.monotonic()
     
     async def send_message(self, text: str, parse_mode: str = "HTML") -> None:
         """发送消息"""
@@ -869,8 +869,7 @@ class KeyLevelTelegramBot:
         if not self.strategy:
             return "❌ 策略未连接"
         grid_cfg = self.strategy.position_manager.grid_config
-        sl_cfg = getattr(self.strategy.position_manager, "stop_loss_config", None)
-        sl_pct = getattr(sl_cfg, "fixed_pct", 0) if sl_cfg else 0
+        sl_pct = self.strategy.position_manager.stop_loss_config.fixed_pct
         return (
             "⚙️ <b>策略设置</b>\n\n"
             f"网格区间: {grid_cfg.manual_lower:.2f} - {grid_cfg.manual_upper:.2f}\n"
@@ -1163,8 +1162,6 @@ class KeyLevelTelegramBot:
         Args:
             args: [symbol, timeframe1, timeframe2, ...]
         """
-        import time
-        
         if len(args) < 2:
             await update.message.reply_text(
                 "❌ 参数不足\n\n"
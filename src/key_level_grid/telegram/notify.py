@@ -717,7 +717,7 @@ class NotificationManager:
             reason: 重建原因
             old_anchor: 旧锚点价格
             new_anchor: 新锚点价格
-            new_orders: 新挂单列表
+            new_orders: 新挂单列表 [{"side": "buy"|"sell", "price": float, "amount": float}]
         """
         if not self.config.grid_rebuild:
             return
@@ -0,0 +1,68 @@
+"""
+orjson 可选依赖封装
+
+安装了 orjson 时用其序列化/反序列化（输出 UTF-8 bytes）；未安装时退化为标准库 json，
+两种环境下调用方写法一致。
+"""
+
+import dataclasses
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def default_hook(o: Any) -> Any:
+    """
+    通用 default 钩子：dataclass / NamedTuple / 带 to_dict 的对象 / numpy 标量
+
+    用于序列化展示数据等含自定义对象的结构，省去调用方逐个 to_dict
+    """
+    if hasattr(o, "_asdict"):
+        return o._asdict()
+    if hasattr(o, "to_dict"):
+        return o.to_dict()
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "item"):
+        return o.item()
+    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+
+
+if ORJSON_AVAILABLE:
+    _DUMPS_OPTION = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+        """序列化为 UTF-8 bytes（indent=True 时缩进 2 空格，default 处理不支持的类型）"""
+        option = _DUMPS_OPTION | orjson.OPT_INDENT_2 if indent else _DUMPS_OPTION
+        return orjson.dumps(obj, default=default, option=option)
+
+    loads = orjson.loads
+else:
+    def _namedtuples_to_dicts(obj: Any) -> Any:
+        """标准库 json 会把 NamedTuple 当作数组输出，先转为 dict 以与 orjson + default_hook 结果一致"""
+        if isinstance(obj, dict):
+            return {k: _namedtuples_to_dicts(v) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            if hasattr(obj, "_asdict"):
+                return obj._asdict()
+            return [_namedtuples_to_dicts(v) for v in obj]
+        return obj
+
+    def dumps(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+        """序列化为 UTF-8 bytes（indent=True 时缩进 2 空格，default 处理不支持的类型）"""
+        if default is not None:
+            obj = _namedtuples_to_dicts(obj)
+        return json.dumps(
+            obj, ensure_ascii=False, indent=2 if indent else None, default=default
+        ).encode("utf-8")
+
+    loads = json.loads
+
+
+__all__ = ["dumps", "loads", "default_hook", "ORJSON_AVAILABLE"]
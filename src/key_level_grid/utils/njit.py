@@ -0,0 +1,25 @@
+"""
+Numba 可选依赖封装
+
+安装了 numba 时使用 njit 编译纯数值函数；未安装时退化为原样返回的装饰器，
+保证调用方代码无需区分两种环境。
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba.njit 的空实现：支持 @njit 与 @njit(cache=True) 两种写法"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def _decorator(func):
+            return func
+
+        return _decorator
+
+
+__all__ = ["njit", "NUMBA_AVAILABLE"]
@@ -0,0 +1,157 @@
+"""
+展示层水位构建与过滤单元测试
+"""
+
+import sys
+from types import SimpleNamespace
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# 添加 src 目录到 path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from key_level_grid.analysis.resistance import PriceLevel
+from key_level_grid.core.models import LevelView
+from key_level_grid.core.state import GridLevelState, GridState
+from key_level_grid.core.types import LevelType
+from key_level_grid.strategy.display import (
+    DisplayDataGenerator,
+    account_risk_scalars,
+    _levels_to_rows,
+    level_filter_mask,
+)
+
+
+class TestLevelFilterMask:
+    """测试 level_filter_mask"""
+
+    def test_matches_scalar_filter(self):
+        """与逐个判断的结果一致"""
+        prices = np.array([90.0, 95.0, 105.0, 120.0])
+        strengths = np.array([85.0, 60.0, 90.0, 99.0])
+        mask = level_filter_mask(prices, strengths, 80.0, 92.0, 110.0)
+        assert list(mask) == [False, False, True, False]
+
+    def test_zero_means_unbounded(self):
+        """参数为 0 时不过滤"""
+        prices = np.array([1.0, 1e6])
+        strengths = np.array([0.0, 100.0])
+        assert level_filter_mask(prices, strengths, 0.0, 0.0, 0.0).all()
+
+
+class TestLevelRows:
+    """测试水位行构建"""
+
+    def test_rows_from_dicts_and_objects(self):
+        """dict 与 PriceLevel 两种来源生成相同结构的行"""
+        dict_rows = _levels_to_rows([{"price": 100.0, "strength": 80}], "support")
+        obj_rows = _levels_to_rows(
+            [PriceLevel(price=100.0, level_type=LevelType.SWING_LOW, strength=80)], "support"
+        )
+        assert dict_rows[0].type == "support"
+        assert obj_rows[0].type == "swing_low"
+        assert dict_rows[0].price == obj_rows[0].price == 100.0
+
+    def test_level_view_dict_compat(self):
+        """LevelView 支持 dict 风格读取"""
+        row = LevelView(100.0, "support", strength=80)
+        assert row.get("strength") == 80
+        assert row.get("missing", 1) == 1
+        assert row.to_dict()["timeframe"] == "4h"
+
+
+class TestLevelArrays:
+    """测试 GridState.level_arrays 列式视图与网格底线"""
+
+    def test_level_arrays_and_grid_floor(self):
+        """列式数组与水位列表同序，底线取最低正支撑价"""
+        state = GridState(
+            symbol="BTCUSDT",
+            support_levels_state=[
+                GridLevelState(level_id=1, price=95.0, side="buy", fill_counter=2),
+                GridLevelState(level_id=2, price=90.0, side="buy"),
+            ],
+            resistance_levels_state=[
+                GridLevelState(level_id=3, price=110.0, side="sell", target_qty=1.5),
+            ],
+        )
+        arrays = state.level_arrays()
+        assert arrays.prices.tolist() == [95.0, 90.0, 110.0]
+        assert arrays.fill_counters.tolist() == [2, 0, 0]
+        assert arrays.level(2).target_qty == 1.5
+        assert state.level_arrays("resistance").target_qtys.tolist() == [1.5]
+        assert state.support_floor() == 0
+        state.support_levels = [{"price": 0}, {"price": 100.0}]
+        assert state.support_floor() == 100.0 * 0.995
+
+    def test_pending_orders_sorted_desc(self):
+        """本地网格挂单按价格降序，阻力位仅保留 target_qty > 0"""
+        state = GridState(
+            symbol="BTCUSDT",
+            support_levels_state=[
+                GridLevelState(level_id=1, price=90.0, side="buy"),
+                GridLevelState(level_id=2, price=95.0, side="buy"),
+            ],
+            resistance_levels_state=[
+                GridLevelState(level_id=3, price=110.0, side="sell", target_qty=1.0),
+                GridLevelState(level_id=4, price=120.0, side="sell", target_qty=2.0),
+                GridLevelState(level_id=5, price=130.0, side="sell"),
+            ],
+        )
+        pm = SimpleNamespace(state=state, grid_config=SimpleNamespace(base_amount_per_grid=0.5))
+        gen = DisplayDataGenerator(pm, config=None)
+        orders = gen.get_pending_orders_display(object())
+        assert [o["price"] for o in orders] == [95.0, 90.0, 120.0, 110.0]
+        assert orders[2]["contracts"] == 2.0
+
+    def test_gate_orders_bucketed(self):
+        """实盘挂单：卖单在前、买单在后，各自按价格降序"""
+        gen = DisplayDataGenerator(SimpleNamespace(state=None), config=None)
+        gen.update_context(gate_open_orders=[
+            {"side": "buy", "price": 90.0},
+            {"side": "sell", "price": 110.0},
+            {"side": "buy", "price": 95.0},
+            {"side": "sell", "price": 120.0},
+        ])
+        orders = gen.get_pending_orders_display(object(), dry_run=False)
+        assert [o["price"] for o in orders] == [120.0, 110.0, 95.0, 90.0]
+
+
+class TestAccountRiskScalars:
+    """测试 account_risk_scalars"""
+
+    def test_max_loss(self):
+        """止损价低于均价 10% 时亏损为最大仓位的 10%"""
+        max_position, max_loss, max_loss_pct = account_risk_scalars(1000.0, 5.0, 0.8, 100.0, 90.0)
+        assert max_position == 4000.0
+        assert abs(max_loss_pct - 10.0) < 1e-9
+        assert abs(max_loss - 400.0) < 1e-9
+
+    def test_invalid_prices(self):
+        """均价或止损价无效时亏损为 0"""
+        assert account_risk_scalars(1000.0, 1.0, 1.0, 0.0, 90.0)[1:] == (0.0, 0.0)
+
+
+class TestDisplayCache:
+    """测试展示数据缓存失效"""
+
+    def test_manual_range_change_invalidates(self):
+        """手动区间原地修改后立即重建展示数据，不等 TTL 过期"""
+        grid_config = SimpleNamespace(range_mode="manual", manual_lower=90.0, manual_upper=110.0)
+        pm = SimpleNamespace(state=None, grid_config=grid_config, revision=0)
+        gen = DisplayDataGenerator(pm, config=None)
+        builds = []
+
+        def build(self, *args):
+            builds.append(args)
+            return {"n": len(builds)}
+
+        with patch.object(DisplayDataGenerator, "_build_display_data", build):
+            assert gen.get_display_data(None, None, None)["n"] == 1
+            assert gen.get_display_data(None, None, None)["n"] == 1
+            grid_config.manual_upper = 120.0
+            assert gen.get_display_data(None, None, None)["n"] == 2
+            pm.revision += 1
+            assert gen.get_display_data(None, None, None)["n"] == 3
@@ -0,0 +1,143 @@
+"""
+ExchangeSyncManager 单元测试
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+# 添加 src 目录到 path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from key_level_grid.core.models import GatePositionView
+from key_level_grid.strategy.exchange_sync import (
+    ExchangeSyncManager,
+    _build_order,
+    _build_trade,
+    _safe_float,
+    format_trade_time,
+)
+
+
+def _make_manager(notifier):
+    config = SimpleNamespace(symbol="BTCUSDT", dry_run=True, market_type="futures")
+    return ExchangeSyncManager(None, config, position_manager=None, notifier=notifier)
+
+
+class TestPositionFluxDebounce:
+    """测试持仓变动通知合并"""
+
+    @pytest.mark.asyncio
+    async def test_burst_coalesced(self):
+        """短时间内的连续变动合并为一条净变动通知"""
+        notifier = SimpleNamespace(notify_position_flux=AsyncMock())
+        mgr = _make_manager(notifier)
+
+        for qty in (0.0, 0.1, 0.2, 0.3):
+            mgr.position_view = GatePositionView(contracts=qty, entry_price=100.0)
+            await mgr._check_position_change()
+
+        # 第一次变动立即发送，其余进入合并窗口
+        assert notifier.notify_position_flux.await_count == 1
+        await mgr._flux_flush_task
+        assert notifier.notify_position_flux.await_count == 2
+        kwargs = notifier.notify_position_flux.await_args.kwargs
+        assert kwargs["action"] == "买入"
+        assert kwargs["qty"] == pytest.approx(0.2)
+        assert kwargs["total_qty"] == pytest.approx(0.3)
+
+
+class TestRecordBuilders:
+    """测试挂单/成交字典构建"""
+
+    def test_build_order_and_trade(self):
+        """张数按合约大小换算，缺失字段取默认值"""
+        order = _build_order({"id": "1", "side": "sell", "price": "100", "remaining": 5}, 0.01)
+        assert order["base_amount"] == pytest.approx(0.05)
+        assert order["amount"] == pytest.approx(5.0)
+
+        trade = _build_trade({"id": "t", "amount": 3, "fee": None, "timestamp": None}, 0.01)
+        assert trade["amount"] == pytest.approx(0.03)
+        assert trade["fee"] == 0.0
+        assert trade["timestamp"] == 0
+        assert format_trade_time(trade["timestamp"]) == ""
+
+    def test_safe_float(self):
+        """None / 空串 / 缺失键取默认值，字符串数值正常转换"""
+        assert _safe_float({"a": None, "b": ""}, "a") == 0.0
+        assert _safe_float({"b": ""}, "b", 1.5) == 1.5
+        assert _safe_float({}, "c") == 0.0
+        assert _safe_float({"d": "2.5"}, "d") == 2.5
+
+
+class TestOpenOrdersReuse:
+    """测试挂单未变化时复用已构建的列表"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_orders_keep_list(self):
+        raw = [{"id": "1", "side": "buy", "price": 100.0, "remaining": 2, "filled": 0, "status": "open"}]
+        executor = SimpleNamespace(get_open_orders=AsyncMock(side_effect=lambda _s: [dict(o) for o in raw]))
+        config = SimpleNamespace(symbol="BTCUSDT", dry_run=False, market_type="futures")
+        mgr = ExchangeSyncManager(executor, config, position_manager=None)
+        mgr._contract_size_cache[mgr._gate_symbol] = (0.01, float("inf"))
+
+        first = await mgr.update_open_orders()
+        assert await mgr.update_open_orders() is first
+
+        raw[0]["remaining"] = 1
+        changed = await mgr.update_open_orders()
+        assert changed is not first
+        assert changed[0]["raw_contracts"] == 1.0
+
+
+
+class TestPositionMatch:
+    """测试持仓匹配"""
+
+    @pytest.mark.asyncio
+    async def test_first_matching_nonzero_position(self):
+        """跳过其他合约与零张数持仓，取第一条匹配的有效持仓"""
+        positions = [
+            {"symbol": "ETH/USDT:USDT", "contracts": 5, "entryPrice": 2000},
+            {"symbol": "BTC/USDT:USDT", "contracts": 0, "entryPrice": 0},
+            {"symbol": "BTC/USDT:USDT", "contracts": 3, "entryPrice": 100.0, "notional": None},
+        ]
+        executor = SimpleNamespace(get_positions=AsyncMock(return_value=positions))
+        config = SimpleNamespace(symbol="BTCUSDT", dry_run=False, market_type="futures")
+        mgr = ExchangeSyncManager(executor, config, position_manager=None)
+        mgr._contract_size_cache[mgr._gate_symbol] = (0.01, float("inf"))
+
+        position = await mgr.update_position()
+        assert position["raw_contracts"] == 3.0
+        assert position["contracts"] == pytest.approx(0.03)
+        assert position["notional"] == pytest.approx(3.0)
+
+class TestIncrementalTrades:
+    """测试成交记录增量同步"""
+
+    @pytest.mark.asyncio
+    async def test_merge_from_high_watermark(self):
+        """首次全量，之后从高水位拉取并按 id 去重合并"""
+        import time
+
+        now_ms = int(time.time() * 1000)
+        batches = [
+            [{"id": "a", "timestamp": now_ms - 5000, "amount": 1}],
+            [{"id": "a", "timestamp": now_ms - 5000, "amount": 1},
+             {"id": "b", "timestamp": now_ms - 1000, "amount": 2}],
+            [],
+        ]
+        executor = SimpleNamespace(get_trade_history=AsyncMock(side_effect=batches))
+        config = SimpleNamespace(symbol="BTCUSDT", dry_run=False, market_type="spot")
+        mgr = ExchangeSyncManager(executor, config, position_manager=None)
+
+        await mgr.update_trades()
+        await mgr.update_trades()
+        assert executor.get_trade_history.await_args.kwargs["since"] == now_ms - 5000 - 2000
+        assert [t["id"] for t in mgr.trades] == ["b", "a"]
+
+        merged = mgr.trades
+        await mgr.update_trades()
+        assert mgr.trades is merged
@@ -0,0 +1,43 @@
+"""
+fastjson 封装单元测试
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# 添加 src 目录到 path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from key_level_grid.core.models import LevelView
+from key_level_grid.utils import fastjson
+
+
+@dataclass
+class _Point:
+    price: float
+    qty: float
+
+
+class TestDefaultHook:
+    """测试 default_hook 序列化自定义对象"""
+
+    def test_roundtrip_custom_objects(self):
+        """NamedTuple 输出为对象，dataclass 与 numpy 标量可直接序列化"""
+        payload = {
+            "levels": [LevelView(100.0, "support", strength=80)],
+            "point": _Point(1.5, 2.0),
+            "n": np.float64(3.25),
+        }
+        data = fastjson.loads(fastjson.dumps(payload, default=fastjson.default_hook))
+        assert data["levels"][0]["strength"] == 80
+        assert data["point"] == {"price": 1.5, "qty": 2.0}
+        assert data["n"] == 3.25
+
+    def test_unknown_type_raises(self):
+        """无法识别的类型抛出 TypeError"""
+        with pytest.raises(TypeError):
+            fastjson.dumps({"x": object()}, default=fastjson.default_hook)
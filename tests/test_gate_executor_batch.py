@@ -0,0 +1,111 @@
+"""
+GateExecutor 批量下单单元测试
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import ccxt
+import pytest
+
+# 添加 src 目录到 path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from key_level_grid.executor.base import Order, OrderSide, OrderStatus
+from key_level_grid.executor.gate_executor import GateExecutor
+
+
+def _make_executor(create_orders):
+    executor = GateExecutor(paper_trading=True)
+    executor.paper_trading = False
+    executor._exchange = MagicMock()
+    executor._exchange.has = {"createOrders": True}
+    executor._exchange.create_orders.side_effect = create_orders
+    executor._pre_trade_safety_check = AsyncMock(return_value=(True, ""))
+    executor._build_real_order_request = AsyncMock(
+        side_effect=lambda o: ("limit", o.quantity, o.price, {"clientOrderId": o.order_id[:8]})
+    )
+    executor._notify_order_sync = AsyncMock()
+    executor.submit_order = AsyncMock(return_value=True)
+    return executor
+
+
+def _orders(n, reduce_only=False):
+    orders = []
+    for i in range(n):
+        order = Order.create(symbol="BTC/USDT:USDT", side=OrderSide.BUY, quantity=1, price=100.0 + i)
+        order.reduce_only = reduce_only
+        orders.append(order)
+    return orders
+
+
+class TestSubmitOrdersBatch:
+    """测试批量下单"""
+
+    @pytest.mark.asyncio
+    async def test_daily_limit_counts_batch(self):
+        """同一批内已放行的订单计入每日交易次数上限"""
+        executor = _make_executor(lambda reqs: [{"id": str(i)} for i in range(len(reqs))])
+        executor.daily_trades = executor.safety.max_daily_trades - 2
+
+        orders = _orders(3)
+        results = await executor.submit_orders_batch(orders)
+
+        assert results == [True, True, False]
+        assert orders[2].status == OrderStatus.REJECTED
+        assert executor.daily_trades == executor.safety.max_daily_trades
+
+    @pytest.mark.asyncio
+    async def test_timeout_confirms_without_resubmit(self):
+        """批量请求超时：按 clientOrderId 确认，不回退逐单重下"""
+        executor = _make_executor(ccxt.RequestTimeout("timeout"))
+        executor._exchange.fetch_order.side_effect = [{"id": "1"}, ccxt.OrderNotFound("missing")]
+
+        orders = _orders(2)
+        results = await executor.submit_orders_batch(orders)
+
+        assert results == [True, False]
+        assert orders[0].exchange_order_id == "1"
+        assert executor._exchange.fetch_order.call_args_list[0].args == (
+            f"t-{orders[0].order_id[:8]}", "BTC/USDT:USDT"
+        )
+        executor.submit_order.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_and_reduce_only_go_single(self):
+        """交易所明确拒绝整批时回退逐单；reduceOnly 订单始终逐单提交"""
+        executor = _make_executor(ccxt.BadRequest("rejected"))
+
+        orders = _orders(1) + _orders(1, reduce_only=True)
+        results = await executor.submit_orders_batch(orders)
+
+        assert results == [True, True]
+        assert executor.submit_order.await_count == 2
+        # reduceOnly 订单不进入批量请求
+        assert len(executor._exchange.create_orders.call_args.args[0]) == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_batch_not_fanned_out(self):
+        """批量请求被限频（429）：不回退逐单，本批及剩余批次记为失败"""
+        executor = _make_executor(ccxt.DDoSProtection("429 too many requests"))
+
+        orders = _orders(executor.BATCH_ORDER_LIMIT + 2)
+        results = await executor.submit_orders_batch(orders)
+
+        assert results == [False] * len(orders)
+        assert all(o.status == OrderStatus.FAILED for o in orders)
+        executor.submit_order.assert_not_called()
+        assert executor._exchange.create_orders.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_single_path_exception_recorded(self):
+        """逐单提交抛出异常时记录到 reject_reason，结果为 False"""
+        executor = GateExecutor(paper_trading=True)
+        executor.submit_order = AsyncMock(side_effect=[True, RuntimeError("boom")])
+
+        orders = _orders(2)
+        results = await executor.submit_orders_batch(orders)
+
+        assert results == [True, False]
+        assert orders[1].reject_reason == "boom"
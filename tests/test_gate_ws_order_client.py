@@ -0,0 +1,171 @@
+"""
+Gate WebSocket 下单通道单元测试（本地假 WS 服务端）
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import ccxt
+import pytest
+from aiohttp import web
+
+# 添加 src 目录到 path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from key_level_grid.executor.base import Order, OrderSide, OrderStatus
+from key_level_grid.executor.gate_executor import GateExecutor
+from key_level_grid.executor.gate_ws_order_client import (
+    GateWsNotSentError,
+    GateWsOrderClient,
+)
+
+
+async def _start_fake_server(login_ok: bool = True, reply_orders: bool = True):
+    """启动假 Gate WS 服务端，返回 (runner, url, 收到的请求列表)"""
+    received = []
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for msg in ws:
+            data = json.loads(msg.data)
+            received.append(data)
+            req_id = data["payload"]["req_id"]
+            if data["channel"] == GateWsOrderClient.LOGIN_CHANNEL:
+                if login_ok:
+                    await ws.send_str(json.dumps({
+                        "request_id": req_id,
+                        "header": {"status": "200"},
+                        "data": {"result": {}},
+                    }))
+                else:
+                    await ws.send_str(json.dumps({
+                        "request_id": req_id,
+                        "header": {"status": "401"},
+                        "data": {"errs": {"label": "INVALID_KEY", "message": "bad key"}},
+                    }))
+            elif reply_orders:
+                # 下单先回 ack，再回最终结果
+                await ws.send_str(json.dumps({"request_id": req_id, "ack": True}))
+                await ws.send_str(json.dumps({
+                    "request_id": req_id,
+                    "header": {"status": "200"},
+                    "data": {"result": {"id": 42, "size": 3, "left": 3, "status": "open"}},
+                }))
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/", received
+
+
+class TestGateWsOrderClient:
+    """测试 WS 下单客户端"""
+
+    @pytest.mark.asyncio
+    async def test_ack_then_result(self):
+        """ack 被跳过，返回最终结果"""
+        runner, url, received = await _start_fake_server()
+        client = GateWsOrderClient("k", "s", ws_url=url, timeout_sec=2.0)
+        try:
+            result = await client.place_order("BTC_USDT", 3, "100", text="t-abc")
+            assert result["id"] == 42
+            assert received[-1]["payload"]["req_param"]["text"] == "t-abc"
+        finally:
+            await client.close()
+            await runner.cleanup()
+        assert not client.connected
+
+    @pytest.mark.asyncio
+    async def test_login_failure_resets_connection(self):
+        """登录失败视为未发出，连接被关闭，下次下单重新登录"""
+        runner, url, received = await _start_fake_server(login_ok=False)
+        client = GateWsOrderClient("k", "s", ws_url=url, timeout_sec=2.0)
+        try:
+            with pytest.raises(GateWsNotSentError):
+                await client.place_order("BTC_USDT", 1, "100")
+            assert not client.connected
+            with pytest.raises(GateWsNotSentError):
+                await client.place_order("BTC_USDT", 1, "100")
+            channels = [r["channel"] for r in received]
+            assert channels == [GateWsOrderClient.LOGIN_CHANNEL] * 2
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_timeout_after_send(self):
+        """请求发出后超时不包装为 GateWsNotSentError（订单状态未知）"""
+        runner, url, _ = await _start_fake_server(reply_orders=False)
+        client = GateWsOrderClient("k", "s", ws_url=url, timeout_sec=0.2)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await client.place_order("BTC_USDT", 1, "100")
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+
+class TestGateExecutorWsFallback:
+    """测试执行器对 WS 下单结果的处理"""
+
+    def _make_executor(self, ws_error):
+        executor = GateExecutor(paper_trading=True)
+        executor._exchange = MagicMock()
+        executor._exchange.market.return_value = {"id": "BTC_USDT"}
+        executor._exchange.price_to_precision.return_value = "100"
+        executor._exchange.fetch_order.return_value = {"id": "9", "status": "open"}
+        executor._ws_orders = SimpleNamespace(place_order=AsyncMock(side_effect=ws_error))
+        return executor
+
+    @pytest.mark.asyncio
+    async def test_not_sent_falls_back(self):
+        """未发出时返回 None，由调用方回退 REST"""
+        executor = self._make_executor(GateWsNotSentError("login failed"))
+        response = await executor._submit_ws_order("BTC/USDT:USDT", "buy", 1, 100.0, {"clientOrderId": "abc"})
+        assert response is None
+        executor._exchange.fetch_order.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_timeout_queries_by_text(self):
+        """发出后超时按 text 查询，不回退 REST"""
+        executor = self._make_executor(asyncio.TimeoutError())
+        response = await executor._submit_ws_order("BTC/USDT:USDT", "buy", 1, 100.0, {"clientOrderId": "abc"})
+        assert response == {"id": "9", "status": "open"}
+        executor._exchange.fetch_order.assert_called_once_with("t-abc", "BTC/USDT:USDT")
+
+    @pytest.mark.asyncio
+    async def test_unknown_result_not_retried(self):
+        """WS 超时且按 text 查不到订单：只下单一次，不重试也不回退 REST"""
+        executor = self._make_executor(asyncio.TimeoutError())
+        executor.paper_trading = False
+        executor._exchange.fetch_order.side_effect = ccxt.OrderNotFound("missing")
+        executor._pre_trade_safety_check = AsyncMock(return_value=(True, ""))
+
+        order = Order.create(symbol="BTC/USDT:USDT", side=OrderSide.BUY, quantity=1, price=100.0)
+        assert await executor.submit_order(order) is False
+
+        assert executor._ws_orders.place_order.await_count == 1
+        executor._exchange.create_order.assert_not_called()
+        assert not order.is_retryable
+        assert order.status == OrderStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_client_order_id_reused(self):
+        """同一订单多次构建请求时 clientOrderId 不变"""
+        executor = self._make_executor(None)
+        executor._prepare_order_params = AsyncMock(side_effect=lambda *a: ("limit", 100.0, {}))
+
+        order = Order.create(symbol="BTC/USDT:USDT", side=OrderSide.BUY, quantity=1, price=100.0)
+        first = (await executor._build_real_order_request(order))[3]["clientOrderId"]
+        second = (await executor._build_real_order_request(order))[3]["clientOrderId"]
+        assert first == second == order.client_order_id
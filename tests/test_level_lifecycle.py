@@ -307,6 +307,29 @@ class TestCanDestroy:
         exchange_orders = [{"id": "order_001", "price": "94000.01"}]
         can, reason = can_destroy_level(level, exchange_orders, {}, price_tolerance=0.0001)
         assert can is False  # 在容差范围内，匹配
+    
+    def test_process_retired_levels(self):
+        """批量处理: 仅无挂单、无映射、无持仓的退役水位被销毁"""
+        state = GridState(symbol="BTCUSDT")
+        state.retired_levels = [
+            GridLevelState(level_id=1, price=90000, side="buy"),
+            GridLevelState(level_id=2, price=91000, side="buy"),
+            GridLevelState(level_id=3, price=92000, side="buy"),
+            GridLevelState(level_id=4, price=93000, side="buy", fill_counter=1),
+        ]
+        state.level_mapping = {4: 3}
+        exchange_orders = [
+            {"id": "far", "price": "95000"},
+            {"id": "near", "price": "91000.5"},
+            {"id": "bad", "price": 0},
+        ]
+        
+        destroyed = process_retired_levels(state, exchange_orders)
+        
+        assert [lvl.level_id for lvl in destroyed] == [1]
+        assert destroyed[0].lifecycle_status == LevelLifecycleStatus.DEAD
+        assert [lvl.level_id for lvl in state.retired_levels] == [2, 3, 4]
+        assert state.level_mapping == {4: 3}
 
 
 # ============================================
@@ -438,6 +461,36 @@ class TestApplyInheritance:
         assert state.active_inventory[0].level_index == 0
 
 
+
+# ============================================
+# 测试: 邻位映射
+# ============================================
+
+class TestRebuildLevelMapping:
+    """测试邻位映射重建"""
+    
+    def test_mapping_skips_near_equal_prices(self):
+        """有持仓的水位映射到第一个价格高出 0.01% 以上的水位，含有持仓的退役水位"""
+        state = GridState(symbol="BTCUSDT")
+        state.support_levels_state = [
+            GridLevelState(level_id=1, price=90000, side="buy", fill_counter=1),
+            GridLevelState(level_id=2, price=90005, side="buy", fill_counter=1),
+            GridLevelState(level_id=3, price=92000, side="buy"),
+        ]
+        state.resistance_levels_state = [
+            GridLevelState(level_id=4, price=95000, side="sell", fill_counter=2),
+        ]
+        state.retired_levels = [
+            GridLevelState(level_id=5, price=93000, side="buy", fill_counter=1),
+            GridLevelState(level_id=6, price=99000, side="buy", fill_counter=0),
+        ]
+        
+        mapping = rebuild_level_mapping(state)
+        
+        # 90005 与 90000 相差不足 0.01%，L_1 跳过 L_2 映射到 L_3；最高水位无邻位
+        assert mapping == {1: 3, 2: 3, 5: 4}
+        assert state.level_mapping is mapping
+
 # ============================================
 # 运行测试
 # ============================================
@@ -0,0 +1,57 @@
+"""
+Numba 编译路径单元测试
+
+安装了 numba（pip install .[numba]）时验证各 @njit 函数可编译，且结果与纯 Python 实现一致；
+未安装时跳过
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# 添加 src 目录到 path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("numba")
+
+from key_level_grid.strategy.display import account_risk_scalars, level_filter_mask
+from key_level_grid.strategy.tp_math import compute_tp_plan
+from key_level_grid.utils.njit import NUMBA_AVAILABLE
+
+
+def test_numba_enabled():
+    """numba 可导入时 njit 返回编译后的 dispatcher"""
+    assert NUMBA_AVAILABLE
+    for func in (level_filter_mask, account_risk_scalars, compute_tp_plan):
+        assert hasattr(func, "py_func")
+
+
+def test_level_filter_mask_matches_python():
+    """掩码按位与在编译路径下与纯 Python 一致"""
+    prices = np.array([90.0, 95.0, 105.0, 120.0])
+    strengths = np.array([85.0, 60.0, 90.0, 99.0])
+    for args in ((80.0, 92.0, 110.0), (0.0, 0.0, 0.0), (0.0, 100.0, 0.0)):
+        compiled = level_filter_mask(prices, strengths, *args)
+        expected = level_filter_mask.py_func(prices, strengths, *args)
+        assert compiled.dtype == np.bool_
+        assert compiled.tolist() == expected.tolist()
+
+
+def test_account_risk_scalars_matches_python():
+    """元组返回值在编译路径下与纯 Python 一致"""
+    for args in ((1000.0, 5.0, 0.8, 100.0, 90.0), (1000.0, 1.0, 1.0, 0.0, 90.0)):
+        assert account_risk_scalars(*args) == pytest.approx(account_risk_scalars.py_func(*args))
+
+
+def test_compute_tp_plan_matches_python():
+    """止盈计划在编译路径下与纯 Python 一致（持仓张数可为浮点）"""
+    prices = np.array([101.0, 102.0, 103.0])
+    for position_contracts in (3, 3.0, 50):
+        compiled = compute_tp_plan(1000.0, 100.0, 1.0, 5, position_contracts, prices)
+        expected = compute_tp_plan.py_func(1000.0, 100.0, 1.0, 5, position_contracts, prices)
+        assert compiled[:3] == expected[:3]
+        assert compiled[3].tolist() == expected[3].tolist()
+    empty = compute_tp_plan(1000.0, 100.0, 1.0, 5, 3, np.empty(0, dtype=np.float64))
+    assert empty[2] == 0
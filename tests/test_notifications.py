@@ -0,0 +1,75 @@
+"""
+通知助手单元测试
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# 添加 src 目录到 path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from key_level_grid.strategy.notifications import NotificationHelper
+
+
+def _make_helper():
+    return NotificationHelper(notifier=None, config=None, position_manager=None, get_display_data_func=None)
+
+
+class TestTgBotWatchdog:
+    """测试 Telegram Bot 看门狗"""
+
+    @pytest.mark.asyncio
+    async def test_recovered_bot_resets_backoff(self):
+        """重连失败后 Bot 自行恢复：退避状态被清除，看门狗按正常间隔检查"""
+        helper = _make_helper()
+        checks = 0
+
+        def is_running():
+            nonlocal checks
+            checks += 1
+            return True
+
+        helper._tg_bot = SimpleNamespace(is_running=is_running, get_last_update_ts=time.monotonic)
+        helper._tg_reconnect_attempt = 1
+        helper._tg_next_retry_at = time.monotonic() - 1.0
+
+        task = asyncio.create_task(helper._tg_bot_watchdog(interval_sec=0.05))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert helper._tg_reconnect_attempt == 0
+        assert checks <= 10
+
+
+class TestGridRebuildNotifyWorker:
+    """测试网格重建通知合并"""
+
+    @pytest.mark.asyncio
+    async def test_window_not_extended_by_steady_events(self):
+        """事件持续到达时合并窗口不被顺延，首批在窗口到期后发出"""
+        sent = []
+
+        async def notify_grid_rebuild(**kwargs):
+            sent.append((asyncio.get_running_loop().time(), kwargs["reason"]))
+
+        helper = NotificationHelper(
+            notifier=SimpleNamespace(notify_grid_rebuild=notify_grid_rebuild),
+            config=SimpleNamespace(symbol="BTCUSDT"),
+            position_manager=None,
+            get_display_data_func=None,
+        )
+        start = asyncio.get_running_loop().time()
+        for _ in range(8):
+            await helper.notify_grid_rebuild("drift", 100.0, 101.0, [])
+            await asyncio.sleep(0.2)
+        await helper.stop_notify_worker()
+
+        assert len(sent) >= 2
+        assert sent[0][0] - start < 1.0
@@ -0,0 +1,46 @@
+"""
+订单对象池单元测试
+"""
+
+import sys
+from pathlib import Path
+
+# 添加 src 目录到 path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from key_level_grid.executor.base import OrderSide, OrderStatus, OrderType
+from key_level_grid.executor.order_pool import OrderPool
+
+
+class TestOrderPool:
+    """测试 OrderPool"""
+
+    def test_reuse_resets_fields(self):
+        """复用的订单恢复默认值并生成新 order_id"""
+        pool = OrderPool()
+        order = pool.get("BTC_USDT", OrderSide.SELL, 3, price=101.0, reduce_only=True)
+        order.metadata["grid_id"] = 1
+        order.status = OrderStatus.FAILED
+        order.reject_reason = "x"
+        old_id = order.order_id
+        pool.put(order)
+
+        reused = pool.get("BTC_USDT", OrderSide.BUY, 2, OrderType.LIMIT, 99.0)
+        assert reused is order
+        assert reused.order_id != old_id
+        assert reused.side == OrderSide.BUY
+        assert reused.quantity == 2
+        assert reused.status == OrderStatus.PENDING
+        assert reused.reject_reason is None
+        assert reused.reduce_only is False
+        assert reused.metadata == {}
+        assert reused.created_at > 0
+
+    def test_max_size(self):
+        """超过容量的订单不再保留"""
+        pool = OrderPool(max_size=1)
+        first = pool.get("BTC_USDT", OrderSide.BUY, 1)
+        second = pool.get("BTC_USDT", OrderSide.BUY, 1)
+        pool.put(first)
+        pool.put(second)
+        assert len(pool) == 1
@@ -0,0 +1,118 @@
+"""
+止盈数值计算单元测试
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 添加 src 目录到 path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from key_level_grid.core.state import GridOrder, GridState
+from key_level_grid.strategy.tp_math import (
+    compute_tp_plan,
+    has_near_price,
+    near_price_mask,
+    price_to_cents,
+)
+
+
+class TestComputeTpPlan:
+    """测试 compute_tp_plan"""
+
+    def test_basic_plan(self):
+        """每档张数与已成交网格数"""
+        prices = np.array([101.0, 102.0, 103.0, 104.0])
+        # total = 1000 / (100 * 1) = 10 张, 5 格 → 每档 2 张
+        per_grid, filled, num_tp, selected = compute_tp_plan(1000.0, 100.0, 1.0, 5, 3, prices)
+        assert per_grid == 2
+        assert filled == 2
+        assert num_tp == 2
+        assert list(selected) == [101.0, 102.0]
+
+    def test_filled_capped_by_num_grids(self):
+        """已成交网格数不超过网格总数"""
+        prices = np.array([101.0, 102.0, 103.0])
+        _, filled, num_tp, _ = compute_tp_plan(1000.0, 100.0, 1.0, 2, 50, prices)
+        assert filled == 2
+        assert num_tp == 2
+
+    def test_limited_by_resistances(self):
+        """止盈档数受有效阻力位数量限制"""
+        prices = np.array([101.0])
+        _, filled, num_tp, selected = compute_tp_plan(1000.0, 100.0, 1.0, 5, 10, prices)
+        assert filled == 5
+        assert num_tp == 1
+        assert list(selected) == [101.0]
+
+    def test_invalid_contract_size(self):
+        """合约大小无效时每档至少 1 张"""
+        prices = np.array([101.0, 102.0])
+        per_grid, filled, _, _ = compute_tp_plan(1000.0, 100.0, 0.0, 5, 2, prices)
+        assert per_grid == 1
+        assert filled == 2
+
+
+class TestSellOrderIndex:
+    """测试 GridState 卖单价格视图"""
+
+    def test_valid_sell_indices(self):
+        """按价格升序筛选均价之上且未成交的卖单"""
+        state = GridState(
+            symbol="BTCUSDT",
+            sell_orders=[
+                GridOrder(grid_id=1, price=103.0, amount_usdt=0),
+                GridOrder(grid_id=2, price=99.0, amount_usdt=0),
+                GridOrder(grid_id=3, price=101.0, amount_usdt=0, is_filled=True),
+                GridOrder(grid_id=4, price=102.0, amount_usdt=0),
+            ],
+        )
+        idx = state.valid_sell_indices(100.0)
+        assert [state.sell_orders_sorted[i].grid_id for i in idx] == [4, 1]
+
+    def test_refresh_after_fill(self):
+        """成交标记变更后刷新视图"""
+        order = GridOrder(grid_id=1, price=101.0, amount_usdt=0)
+        state = GridState(symbol="BTCUSDT", sell_orders=[order])
+        order.is_filled = True
+        state.refresh_sell_order_index()
+        assert state.valid_sell_indices(100.0).size == 0
+
+
+class TestNearPriceMask:
+    """测试 near_price_mask"""
+
+    def test_matches_pairwise_tolerance(self):
+        """与逐对比较的结果一致"""
+        prices = np.array([100.0, 95.0, 90.0, 85.0])
+        existing = np.array([90.05, 100.2, 84.0])
+        expected = [
+            any(abs(p - e) / p < 0.001 for e in existing) for p in prices
+        ]
+        assert list(near_price_mask(prices, existing, 0.001)) == expected
+
+    def test_empty_existing(self):
+        """无已有挂单时全部为 False"""
+        mask = near_price_mask(np.array([100.0, 90.0]), np.array([], dtype=float))
+        assert not mask.any()
+
+
+class TestHasNearPrice:
+    """测试 has_near_price"""
+
+    def test_neighbors(self):
+        """左右邻居均参与比较"""
+        prices = [90.0, 100.05, 110.0]
+        assert has_near_price(prices, 100.0)
+        assert has_near_price(prices, 100.1)
+        assert not has_near_price(prices, 105.0)
+        assert not has_near_price([], 100.0)
+
+    def test_cents_keys(self):
+        """整数分键与浮点价格结果一致"""
+        cents = [price_to_cents(p) for p in (90.0, 100.05, 110.0)]
+        assert cents == [9000, 10005, 11000]
+        assert has_near_price(cents, price_to_cents(100.0))
+        assert not has_near_price(cents, price_to_cents(105.0))